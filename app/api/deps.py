@@ -1,42 +1,111 @@
+import logging
 import uuid
-from typing import AsyncGenerator
+from typing import Any, AsyncGenerator
 from fastapi import Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordBearer
 import jwt
 from pydantic import ValidationError
+from sqlalchemy import inspect, select
+from sqlalchemy.exc import DBAPIError
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy.future import select
+from sqlalchemy.orm import make_transient_to_detached
 
 from app.core.config import settings
-from app.database.session import AsyncSessionLocal
+from app.core.security import decode_token
+from app.core.singleflight import SingleFlight
+from app.core.timing import timed
+from app.database.lazy_session import LazySession
+from app.database.session import get_replica_router, get_sessionmaker
+from app.models.service_account import ServiceAccount
 from app.models.user import User
+from app.repositories.user import get_user_by_id
 from app.schemas.token import TokenPayload
 
-async def get_db() -> AsyncGenerator[AsyncSession, None]:
-    async with AsyncSessionLocal() as session:
-        try:
-            yield session
-        finally:
-            await session.close()
+logger = logging.getLogger(__name__)
 
-oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/auth/access-token")
+async def get_db() -> AsyncGenerator[LazySession, None]:
+    # Checks out a connection only when the handler first queries
+    session = LazySession([], fallback=get_sessionmaker)
+    try:
+        yield session
+    finally:
+        await session.close()
 
-async def get_current_user(
-    token: str = Depends(oauth2_scheme),
-    db: AsyncSession = Depends(get_db)
-) -> User:
+async def get_read_db() -> AsyncGenerator[LazySession, None]:
+    """
+    Session for read-only handlers. Uses a healthy read replica when any are
+    configured and falls back to the primary otherwise. Never write through
+    it, and never use it where the handler must see its own writes.
+    """
+    router = get_replica_router()
+    candidates = router.candidates()
+    # The primary's engine is only created if no replica connects
+    session = LazySession(
+        [router.sessionmakers[i] for i in candidates],
+        on_connect_error=lambda index: router.eject(candidates[index]),
+        fallback=get_sessionmaker,
+    )
     try:
-        payload = jwt.decode(
-            token,
-            settings.PUBLIC_KEY,
-            algorithms=[settings.ALGORITHM]
+        yield session
+    except DBAPIError as exc:
+        if exc.connection_invalidated and session.index < len(candidates):
+            router.eject(candidates[session.index])
+        raise
+    finally:
+        await session.close()
+
+def require_service_accounts() -> None:
+    # Secrets are keyed by CLIENT_SECRET_KEY; without it none can be issued or checked
+    if not settings.CLIENT_SECRET_KEY:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Service accounts are not configured",
         )
-        token_data = TokenPayload(**payload)
+
+oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/auth/access-token")
+
+# Concurrent requests for the same user share one SELECT
+user_loads = SingleFlight()
+
+async def _load_user(db: AsyncSession, user_id: uuid.UUID) -> User | None:
+    loaded: list[User] = []
+
+    async def load() -> dict[str, Any] | None:
+        user = await get_user_by_id(db, user_id)
+        if user is None:
+            return None
+        loaded.append(user)
+        # Snapshot now, before the loading request gets to modify its instance
+        return {attr.key: getattr(user, attr.key) for attr in inspect(User).column_attrs}
+
+    # Keyed by engine too: a replica read must not satisfy a primary read
+    snapshot, shared = await user_loads.do((db.bind, user_id), load)
+    if snapshot is None:
+        return None
+    if not shared:
+        return loaded[0]
+
+    # Rebuild the row in this request's own session, without a query
+    user = User(**snapshot)
+    make_transient_to_detached(user)
+    return await db.merge(user, load=False)
+
+async def _get_user_from_token(token: str, db: AsyncSession) -> User:
+    try:
+        with timed("auth"):
+            payload = decode_token(token)
+            token_data = TokenPayload(**payload)
     except (jwt.InvalidTokenError, ValidationError):
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
             detail="Could not validate credentials",
         )
+    # Refresh and email verification tokens do not authorize requests
+    if payload.get("type", "access") != "access":
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Could not validate credentials",
+        )
     
     # Convert string sub to UUID for database query
     try:
@@ -47,10 +116,67 @@ async def get_current_user(
             detail="Invalid user ID in token",
         )
 
-    result = await db.execute(select(User).where(User.id == user_id))
-    user = result.scalars().one_or_none()
+    with timed("user_fetch"):
+        user = await _load_user(db, user_id)
     
     if not user:
         raise HTTPException(status_code=404, detail="User not found")
     
-    return user
\ No newline at end of file
+    return user
+
+async def get_current_user(
+    token: str = Depends(oauth2_scheme),
+    db: AsyncSession = Depends(get_db)
+) -> User:
+    return await _get_user_from_token(token, db)
+
+async def get_current_user_read(
+    token: str = Depends(oauth2_scheme),
+    db: AsyncSession = Depends(get_read_db)
+) -> User:
+    """
+    Like get_current_user, but loaded through get_read_db. Only for handlers
+    that do not modify the user.
+    """
+    return await _get_user_from_token(token, db)
+
+async def get_introspection_caller(
+    token: str = Depends(oauth2_scheme),
+    db: AsyncSession = Depends(get_db)
+) -> str:
+    """
+    Authenticates callers of token introspection (RFC 7662 section 2.1): an
+    active service account with a client_credentials token, or a superuser.
+    Checked against the primary. Returns the caller's token subject.
+    """
+    invalid = HTTPException(
+        status_code=status.HTTP_401_UNAUTHORIZED,
+        detail="Could not validate credentials",
+        headers={"WWW-Authenticate": "Bearer"},
+    )
+    try:
+        with timed("auth"):
+            payload = decode_token(token)
+    except jwt.InvalidTokenError:
+        raise invalid
+    if payload.get("type", "access") != "access":
+        raise invalid
+
+    client_id = payload.get("client_id")
+    if client_id is not None:
+        result = await db.execute(select(ServiceAccount).where(ServiceAccount.client_id == client_id))
+        account = result.scalars().one_or_none()
+        if not account or not account.is_active:
+            raise invalid
+        return payload["sub"]
+
+    try:
+        user = await _get_user_from_token(token, db)
+    except HTTPException:
+        raise invalid
+    if not user.is_active or not user.is_superuser:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Not allowed to introspect tokens",
+        )
+    return str(user.id)
@@ -1,50 +1,113 @@
+import base64
+import binascii
+import json
+from collections import Counter
+from datetime import date, datetime, timedelta, timezone
 from typing import List
 import uuid
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from fastapi.responses import PlainTextResponse
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.future import select
 
-from app.api.deps import get_current_user, get_db
+from app.api.deps import get_current_user, get_current_user_read, get_db, get_read_db, require_service_accounts
+from app.core.client_tokens import client_token_cache
+from app.core.profiler import SamplingProfiler, profiler
+from app.core.security import generate_client_credentials, hash_client_secret
+from app.core.timing import timed
+from app.models.service_account import ServiceAccount
 from app.models.user import User
-from app.schemas.user import UserResponse, UserAdminUpdate
+from app.repositories.token_revocations import revoke_tokens
+from app.repositories.user import get_user_by_email, get_user_by_id, list_users, search_users
+from app.repositories.user_stats import apply_stat_changes, get_user_stats, reconcile_user_stats, user_stat_keys
+from app.schemas.service_account import ServiceAccountCreate, ServiceAccountCreated, ServiceAccountResponse
+from app.schemas.user import UserResponse, UserAdminUpdate, UserSearchResponse, UserStatsResponse
 
 router = APIRouter()
 
-async def get_current_superuser(
-    current_user: User = Depends(get_current_user),
-) -> User:
-    if not current_user.is_superuser:
+def _require_superuser(user: User) -> User:
+    if not user.is_superuser:
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
             detail="The user doesn't have enough privileges",
         )
-    return current_user
+    return user
+
+async def get_current_superuser(
+    current_user: User = Depends(get_current_user),
+) -> User:
+    return _require_superuser(current_user)
+
+async def get_current_superuser_read(
+    current_user: User = Depends(get_current_user_read),
+) -> User:
+    """
+    Superuser check for read-only endpoints, resolved through get_read_db.
+    """
+    return _require_superuser(current_user)
 
 @router.get("/users", response_model=List[UserResponse])
 async def read_users(
     skip: int = 0,
     limit: int = 100,
-    db: AsyncSession = Depends(get_db),
-    current_user: User = Depends(get_current_superuser),
+    db: AsyncSession = Depends(get_read_db),
+    current_user: User = Depends(get_current_superuser_read),
 ):
     """
     Retrieve users.
     """
-    result = await db.execute(select(User).offset(skip).limit(limit))
-    users = result.scalars().all()
-    return users
+    return await list_users(db, skip, limit)
+
+def _encode_cursor(rank: float, user_id: uuid.UUID) -> str:
+    raw = json.dumps([rank, str(user_id)]).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+def _decode_cursor(cursor: str) -> tuple[float, uuid.UUID]:
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        rank, user_id = json.loads(raw)
+        return float(rank), uuid.UUID(user_id)
+    except (binascii.Error, ValueError, TypeError):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Invalid cursor",
+        )
+
+@router.get("/users/search", response_model=UserSearchResponse)
+async def search_users_endpoint(
+    q: str = Query(..., min_length=3, max_length=100),
+    limit: int = Query(20, ge=1, le=100),
+    cursor: str | None = None,
+    db: AsyncSession = Depends(get_read_db),
+    current_user: User = Depends(get_current_superuser_read),
+):
+    """
+    Find users by partial email or name, best match first. Pass
+    `next_cursor` back as `cursor` for the next page.
+    """
+    after = _decode_cursor(cursor) if cursor else None
+    # One extra row tells whether there is a next page
+    rows = await search_users(db, q, limit + 1, after)
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        last_user, last_rank = rows[-1]
+        next_cursor = _encode_cursor(last_rank, last_user.id)
+    return UserSearchResponse(
+        items=[UserResponse.model_validate(user) for user, _ in rows],
+        next_cursor=next_cursor,
+    )
 
 @router.get("/users/{user_id}", response_model=UserResponse)
 async def read_user_by_id(
     user_id: uuid.UUID,
-    db: AsyncSession = Depends(get_db),
-    current_user: User = Depends(get_current_superuser),
+    db: AsyncSession = Depends(get_read_db),
+    current_user: User = Depends(get_current_superuser_read),
 ):
     """
     Get a specific user by id.
     """
-    result = await db.execute(select(User).where(User.id == user_id))
-    user = result.scalars().one_or_none()
+    user = await get_user_by_id(db, user_id)
     if not user:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -62,18 +125,17 @@ async def update_user(
     """
     Update a user.
     """
-    result = await db.execute(select(User).where(User.id == user_id))
-    user = result.scalars().one_or_none()
+    user = await get_user_by_id(db, user_id)
     if not user:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="User not found",
         )
     
+    stats_before = user_stat_keys(user)
     if user_in.email is not None:
         # Check if email exists
-        email_result = await db.execute(select(User).where(User.email == user_in.email))
-        existing_user = email_result.scalars().one_or_none()
+        existing_user = await get_user_by_email(db, user_in.email)
         if existing_user and existing_user.id != user_id:
              raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
@@ -81,6 +143,7 @@ async def update_user(
             )
         user.email = user_in.email
         
+    deactivated = user.is_active and user_in.is_active is False
     if user_in.is_active is not None:
         user.is_active = user_in.is_active
     if user_in.is_superuser is not None:
@@ -89,7 +152,11 @@ async def update_user(
         user.tier = user_in.tier
 
     db.add(user)
-    await db.commit()
+    await apply_stat_changes(db, stats_before, user_stat_keys(user))
+    if deactivated:
+        await revoke_tokens(db, str(user.id))
+    with timed("db_commit"):
+        await db.commit()
     await db.refresh(user)
     return user
 
@@ -102,8 +169,7 @@ async def delete_user(
     """
     Delete a user.
     """
-    result = await db.execute(select(User).where(User.id == user_id))
-    user = result.scalars().one_or_none()
+    user = await get_user_by_id(db, user_id)
     if not user:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -111,5 +177,163 @@ async def delete_user(
         )
     
     await db.delete(user)
-    await db.commit()
-    return user
\ No newline at end of file
+    await apply_stat_changes(db, user_stat_keys(user), Counter())
+    await revoke_tokens(db, str(user.id))
+    with timed("db_commit"):
+        await db.commit()
+    return user
+
+@router.get("/stats", response_model=UserStatsResponse)
+async def read_user_stats(
+    days: int = Query(30, ge=1, le=366),
+    db: AsyncSession = Depends(get_read_db),
+    current_user: User = Depends(get_current_superuser_read),
+):
+    """
+    User counts for the dashboard, read from the maintained counters rather
+    than counted from the users table.
+    """
+    since = datetime.now(timezone.utc).date() - timedelta(days=days - 1)
+    stats = UserStatsResponse()
+    for stat in await get_user_stats(db, signups_since=since):
+        if stat.metric == "users":
+            stats.total = stat.value
+        elif stat.metric in ("active", "inactive", "verified", "unverified"):
+            setattr(stats, stat.metric, stat.value)
+        elif stat.metric == "tier" and stat.value:
+            stats.by_tier[stat.key] = stat.value
+        elif stat.metric == "signups" and stat.value:
+            stats.signups_per_day[date.fromisoformat(stat.key)] = stat.value
+    stats.signups_per_day = dict(sorted(stats.signups_per_day.items()))
+    return stats
+
+@router.post("/stats/reconcile")
+async def reconcile_stats(
+    db: AsyncSession = Depends(get_db),
+    current_user: User = Depends(get_current_superuser),
+):
+    """
+    Recount the counters from the users table now (full scan).
+    """
+    drifted = await reconcile_user_stats(db)
+    return {"drifted": drifted}
+
+@router.post(
+    "/service-accounts",
+    response_model=ServiceAccountCreated,
+    status_code=status.HTTP_201_CREATED,
+    dependencies=[Depends(require_service_accounts)],
+)
+async def create_service_account(
+    account_in: ServiceAccountCreate,
+    db: AsyncSession = Depends(get_db),
+    current_user: User = Depends(get_current_superuser),
+):
+    """
+    Create a service account. The client secret is only returned here.
+    """
+    client_id, client_secret = generate_client_credentials()
+    account = ServiceAccount(
+        client_id=client_id,
+        hashed_secret=hash_client_secret(client_secret),
+        name=account_in.name,
+    )
+    db.add(account)
+    with timed("db_commit"):
+        await db.commit()
+    await db.refresh(account)
+    return ServiceAccountCreated(
+        **ServiceAccountResponse.model_validate(account).model_dump(),
+        client_secret=client_secret,
+    )
+
+@router.get("/service-accounts", response_model=List[ServiceAccountResponse])
+async def read_service_accounts(
+    db: AsyncSession = Depends(get_read_db),
+    current_user: User = Depends(get_current_superuser_read),
+):
+    """
+    Retrieve service accounts.
+    """
+    result = await db.execute(select(ServiceAccount).order_by(ServiceAccount.created_at))
+    return result.scalars().all()
+
+@router.delete("/service-accounts/{account_id}", response_model=ServiceAccountResponse)
+async def deactivate_service_account(
+    account_id: uuid.UUID,
+    db: AsyncSession = Depends(get_db),
+    current_user: User = Depends(get_current_superuser),
+):
+    """
+    Deactivate a service account and drop its cached token. Tokens already
+    handed out are revoked through /auth/revocations; verifiers that do not
+    follow the feed accept them until they expire.
+    """
+    result = await db.execute(select(ServiceAccount).where(ServiceAccount.id == account_id))
+    account = result.scalars().one_or_none()
+    if not account:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Service account not found",
+        )
+
+    account.is_active = False
+    db.add(account)
+    await revoke_tokens(db, f"client:{account.client_id}")
+    with timed("db_commit"):
+        await db.commit()
+    client_token_cache.evict(account.client_id)
+    return account
+
+def get_profiler() -> SamplingProfiler:
+    if not profiler.enabled:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Profiler is not enabled",
+        )
+    return profiler
+
+@router.post("/profiler/capture")
+async def start_profile_capture(
+    seconds: float = Query(10.0, gt=0, le=300),
+    current_user: User = Depends(get_current_superuser_read),
+    active_profiler: SamplingProfiler = Depends(get_profiler),
+):
+    """
+    Profile every request for the next `seconds`.
+    """
+    active_profiler.capture(seconds)
+    return {"msg": f"Profiling all requests for {seconds:g} seconds"}
+
+@router.get("/profiler/routes", response_model=List[str])
+async def read_profiled_routes(
+    current_user: User = Depends(get_current_superuser_read),
+    active_profiler: SamplingProfiler = Depends(get_profiler),
+):
+    """
+    List routes that have collected samples.
+    """
+    return active_profiler.routes()
+
+@router.get("/profiler/flamegraph", response_class=PlainTextResponse)
+async def read_flamegraph(
+    route: str | None = None,
+    current_user: User = Depends(get_current_superuser_read),
+    active_profiler: SamplingProfiler = Depends(get_profiler),
+):
+    """
+    Collected samples in collapsed-stack format, optionally for a single route
+    (e.g. `POST /auth/login`).
+    """
+    return active_profiler.collapsed(route)
+
+@router.delete("/profiler")
+async def reset_profiler(
+    current_user: User = Depends(get_current_superuser_read),
+    active_profiler: SamplingProfiler = Depends(get_profiler),
+):
+    """
+    Discard collected samples.
+    """
+    active_profiler.reset()
+    return {"msg": "Profiler samples cleared"}
@@ -1,21 +1,37 @@
-from fastapi import APIRouter, HTTPException, status, Depends, Request
+import hashlib
+import hmac
+import time
+import uuid
+from collections import Counter
+from fastapi import APIRouter, HTTPException, status, Depends, Form, Request
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.future import select
-from fastapi.security import OAuth2PasswordRequestForm
+from fastapi.security import HTTPBasic, HTTPBasicCredentials, OAuth2PasswordRequestForm
 from app.core.config import settings
 import jwt
-from app.schemas.token import TokenPayload, RefreshTokenRequest
+from app.schemas.token import TokenPayload, RefreshTokenRequest, EmailVerificationRequest, IntrospectionRequest, IntrospectionResponse, IntrospectionResult, RevocationListResponse
 from pydantic import ValidationError
 
+from app.models.service_account import ServiceAccount
 from app.models.user import User
-from app.api.deps import get_db
+from app.api.deps import get_current_user, get_db, get_introspection_caller, get_read_db, require_service_accounts
+from app.repositories.token_revocations import get_revocation_cutoffs, get_revocations
+from app.repositories.user import get_active_user_emails, get_user_by_email, get_user_by_id
+from app.repositories.user_stats import apply_stat_changes, user_stat_keys
 from app.schemas.user import UserCreate, UserResponse, UserLogin
 from app.schemas.token import Token
-from app.core.security import get_password_hash, verify_password, create_access_token, create_refresh_token
+from app.schemas.service_account import ClientCredentialsToken
+from app.core.security import get_password_hash, verify_password, create_access_token, create_refresh_token, decode_token, hash_client_secret
+from app.core.client_tokens import client_token_cache
 from app.core.limiter import limiter
+from app.core.mailer import send_verification_email
+from app.core.singleflight import SingleFlight
+from app.core.timing import timed
 
 auth_router = APIRouter()
 
+client_basic_auth = HTTPBasic(auto_error=False)
+
 @auth_router.post("/register", response_model=UserResponse, status_code=status.HTTP_201_CREATED)
 @limiter.limit("5/minute")
 async def register_user(
@@ -24,8 +40,7 @@ async def register_user(
     db: AsyncSession = Depends(get_db)
 ):
     #check if mail already exists
-    result = await db.execute(select(User).where(User.email == user_in.email))
-    existing_user = result.scalars().one_or_none()
+    existing_user = await get_user_by_email(db, user_in.email)
     
     if existing_user:
         raise HTTPException(
@@ -42,11 +57,70 @@ async def register_user(
     )
     
     db.add(new_user)
-    await db.commit()
+    # Flush first so column defaults (is_active, created_at, ...) are set
+    await db.flush()
+    await apply_stat_changes(db, Counter(), user_stat_keys(new_user))
+    with timed("db_commit"):
+        await db.commit()
     await db.refresh(new_user)
 
+    send_verification_email(new_user.id, new_user.email)
     return new_user
 
+@auth_router.post("/verify-email")
+@limiter.limit("10/minute")
+async def verify_email(
+    request: Request,
+    verification: EmailVerificationRequest,
+    db: AsyncSession = Depends(get_db),
+):
+    """
+    Mark the email address as verified using the token from the
+    verification mail.
+    """
+    invalid = HTTPException(
+        status_code=status.HTTP_400_BAD_REQUEST,
+        detail="Invalid or expired verification token",
+    )
+    try:
+        payload = decode_token(verification.token)
+        user_id = uuid.UUID(payload["sub"])
+    except (jwt.InvalidTokenError, KeyError, TypeError, ValueError):
+        raise invalid
+    if payload.get("type") != "email_verification":
+        raise invalid
+
+    user = await get_user_by_id(db, user_id)
+    # Tokens for a previous address stop working once the email changes
+    if not user or user.email.lower() != payload.get("email"):
+        raise invalid
+
+    if not user.email_verified:
+        stats_before = user_stat_keys(user)
+        user.email_verified = True
+        db.add(user)
+        await apply_stat_changes(db, stats_before, user_stat_keys(user))
+        with timed("db_commit"):
+            await db.commit()
+    return {"msg": "Email verified successfully"}
+
+@auth_router.post("/resend-verification", status_code=status.HTTP_202_ACCEPTED)
+@limiter.limit("3/minute")
+async def resend_verification(
+    request: Request,
+    current_user: User = Depends(get_current_user),
+):
+    """
+    Queue a new verification mail for the current user.
+    """
+    if current_user.email_verified:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Email already verified",
+        )
+    send_verification_email(current_user.id, current_user.email)
+    return {"msg": "Verification email queued"}
+
 @auth_router.post("/login", response_model=Token)
 @limiter.limit("5/minute")
 async def login(
@@ -54,8 +128,8 @@ async def login(
     login_data: UserLogin,
     db: AsyncSession = Depends(get_db),
 ):
-    result = await db.execute(select(User).where(User.email == login_data.email))
-    user = result.scalars().one_or_none()
+    with timed("user_fetch"):
+        user = await get_user_by_email(db, login_data.email)
 
     if not user or not verify_password(login_data.password, user.hashed_password):
         raise HTTPException(
@@ -79,7 +153,8 @@ async def login(
     refresh_token, hashed_refresh_token = create_refresh_token(subject=user.id)
     user.hashed_refresh_token = hashed_refresh_token
     db.add(user)
-    await db.commit()
+    with timed("db_commit"):
+        await db.commit()
 
     return Token(
         access_token=access_token,
@@ -98,8 +173,8 @@ async def login_access_token(
     OAuth2 compatible token login, get an access token for future requests.
     Used by Swagger UI "Authorize" button.
     """
-    result = await db.execute(select(User).where(User.email == form_data.username))
-    user = result.scalars().one_or_none()
+    with timed("user_fetch"):
+        user = await get_user_by_email(db, form_data.username)
 
     if not user or not verify_password(form_data.password, user.hashed_password):
         raise HTTPException(
@@ -123,7 +198,8 @@ async def login_access_token(
     refresh_token, hashed_refresh_token = create_refresh_token(subject=user.id)
     user.hashed_refresh_token = hashed_refresh_token
     db.add(user)
-    await db.commit()
+    with timed("db_commit"):
+        await db.commit()
 
     return Token(
         access_token=access_token,
@@ -131,38 +207,30 @@ async def login_access_token(
         token_type="bearer"
     )
 
-@auth_router.post("/refresh", response_model=Token)
-@limiter.limit("10/minute")
-async def refresh_token(
-    request: Request,
-    refresh_req: RefreshTokenRequest,
-    db: AsyncSession = Depends(get_db)
-):
-    """
-    Get a new access token using a refresh token.
-    """
+# Concurrent (and, within the grace window, repeated) refreshes with the same
+# token share one rotation instead of racing on hashed_refresh_token
+refresh_rotations = SingleFlight(grace=settings.REFRESH_REUSE_GRACE_SECONDS)
+
+async def _rotate_refresh_token(refresh_token: str, db: AsyncSession) -> Token:
     try:
-        payload = jwt.decode(
-            refresh_req.refresh_token,
-            settings.PUBLIC_KEY,
-            algorithms=[settings.ALGORITHM]
-        )
+        payload = decode_token(refresh_token)
         token_data = TokenPayload(**payload)
-    except (jwt.InvalidTokenError, ValidationError):
+        user_id = uuid.UUID(token_data.sub)
+    except (jwt.InvalidTokenError, ValidationError, TypeError, ValueError):
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
             detail="Invalid refresh token",
         )
         
     # 2. Fetch User
-    result = await db.execute(select(User).where(User.id == token_data.sub))
-    user = result.scalars().one_or_none()
+    with timed("user_fetch"):
+        user = await get_user_by_id(db, user_id)
     
     if not user:
         raise HTTPException(status_code=404, detail="User not found")
         
     # 3. Verify Hash (Revocation Check)
-    if not user.hashed_refresh_token or not verify_password(refresh_req.refresh_token, user.hashed_refresh_token):
+    if not user.hashed_refresh_token or not verify_password(refresh_token, user.hashed_refresh_token):
         raise HTTPException(status_code=401, detail="Invalid or revoked refresh token")
 
     # 4. Issue New Tokens
@@ -178,7 +246,8 @@ async def refresh_token(
     new_refresh_token, new_hashed_refresh_token = create_refresh_token(subject=user.id)
     user.hashed_refresh_token = new_hashed_refresh_token
     db.add(user)
-    await db.commit()
+    with timed("db_commit"):
+        await db.commit()
     
     return Token(
         access_token=access_token,
@@ -186,4 +255,168 @@ async def refresh_token(
         token_type="bearer"
     )
 
+@auth_router.post("/refresh", response_model=Token)
+@limiter.limit("10/minute")
+async def refresh_token(
+    request: Request,
+    refresh_req: RefreshTokenRequest,
+    db: AsyncSession = Depends(get_db)
+):
+    """
+    Get a new access token using a refresh token.
+
+    Duplicate requests with the same refresh token, concurrent or within
+    REFRESH_REUSE_GRACE_SECONDS, receive the same new token pair.
+    """
+    key = hashlib.sha256(refresh_req.refresh_token.encode()).hexdigest()
+    tokens, _ = await refresh_rotations.do(
+        key, lambda: _rotate_refresh_token(refresh_req.refresh_token, db)
+    )
+    return tokens
+
+@auth_router.post("/token", response_model=ClientCredentialsToken, dependencies=[Depends(require_service_accounts)])
+@limiter.limit("120/minute")
+async def client_credentials_token(
+    request: Request,
+    grant_type: str = Form(...),
+    client_id: str | None = Form(None),
+    client_secret: str | None = Form(None),
+    basic: HTTPBasicCredentials | None = Depends(client_basic_auth),
+    db: AsyncSession = Depends(get_db),
+):
+    """
+    OAuth2 client_credentials grant for service accounts. Credentials may be
+    sent as form fields or with HTTP Basic auth. A still-valid token is
+    reused from memory when the same client asks again and its account is
+    still active. Credentials are checked against the primary, never a
+    lagging replica.
+    """
+    if grant_type != "client_credentials":
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Unsupported grant type",
+        )
+
+    if basic is not None:
+        client_id, client_secret = basic.username, basic.password
+    if not client_id or not client_secret:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Invalid client credentials",
+            headers={"WWW-Authenticate": "Basic"},
+        )
+
+    secret_digest = hash_client_secret(client_secret)
+    cached = client_token_cache.get(client_id, secret_digest)
+    if cached is not None:
+        # The cache is per worker; deactivation in another worker only evicts there
+        with timed("user_fetch"):
+            is_active = await db.scalar(
+                select(ServiceAccount.is_active).where(ServiceAccount.client_id == client_id)
+            )
+        if is_active:
+            access_token, expires_in = cached
+            return ClientCredentialsToken(access_token=access_token, token_type="bearer", expires_in=expires_in)
+        client_token_cache.evict(client_id)
+
+    with timed("user_fetch"):
+        result = await db.execute(select(ServiceAccount).where(ServiceAccount.client_id == client_id))
+        account = result.scalars().one_or_none()
+
+    if not account or not account.is_active or not hmac.compare_digest(account.hashed_secret, secret_digest):
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Invalid client credentials",
+            headers={"WWW-Authenticate": "Basic"},
+        )
+
+    expires_in = settings.ACCESS_TOKEN_EXPIRE_MINUTES * 60
+    expires_at = time.time() + expires_in
+    # 'sub' is deliberately not a user UUID, so get_current_user rejects it
+    access_token = create_access_token(
+        subject=f"client:{account.client_id}",
+        claims={"client_id": account.client_id}
+    )
+    client_token_cache.put(client_id, secret_digest, access_token, expires_at)
+
+    return ClientCredentialsToken(access_token=access_token, token_type="bearer", expires_in=expires_in)
+
+@auth_router.post("/introspect", response_model=IntrospectionResponse, response_model_exclude_none=True)
+@limiter.limit("60/minute")
+async def introspect_tokens(
+    request: Request,
+    introspect_req: IntrospectionRequest,
+    caller: str = Depends(get_introspection_caller),
+    db: AsyncSession = Depends(get_read_db)
+):
+    """
+    Batch token introspection for internal services (RFC 7662 semantics).
+    Callers authenticate with a service account token or as a superuser.
+
+    Verifies every token, loads all referenced users and their revocations
+    with one query each and returns one result per token, in request order.
+    A token is active when it is a valid, unexpired access token of an
+    existing, active user that was not revoked (password change, account
+    deactivation) after it was issued. Inactive results carry no other fields.
+    """
+    # 1. Verify signatures
+    claims_by_index: dict[int, dict] = {}
+    with timed("auth"):
+        for index, token in enumerate(introspect_req.tokens):
+            try:
+                payload = decode_token(token)
+                user_id = uuid.UUID(TokenPayload(**payload).sub)
+            except (jwt.InvalidTokenError, ValidationError, TypeError, ValueError):
+                continue
+            # Refresh tokens are only meaningful to this service
+            if payload.get("type", "access") != "access":
+                continue
+            claims_by_index[index] = {**payload, "user_id": user_id}
+
+    # 2. Resolve all referenced active users and their revocations at once
+    user_ids = {claims["user_id"] for claims in claims_by_index.values()}
+    subs = {claims["sub"] for claims in claims_by_index.values()}
+    emails: dict[uuid.UUID, str] = {}
+    cutoffs: dict[str, int] = {}
+    if user_ids:
+        with timed("user_fetch"):
+            emails = await get_active_user_emails(db, user_ids)
+            cutoffs = await get_revocation_cutoffs(db, subs)
+
+    # 3. Per-token results
+    results = []
+    for index in range(len(introspect_req.tokens)):
+        claims = claims_by_index.get(index)
+        email = emails.get(claims["user_id"]) if claims else None
+        revoked = claims is not None and claims.get("iat", 0) < cutoffs.get(claims["sub"], 0)
+        if claims is None or email is None or revoked:
+            results.append(IntrospectionResult(active=False))
+            continue
+        results.append(IntrospectionResult(
+            active=True,
+            sub=claims["sub"],
+            username=email,
+            tier=claims.get("tier"),
+            token_type="bearer",
+            exp=claims.get("exp"),
+            iat=claims.get("iat"),
+        ))
 
+    return IntrospectionResponse(results=results)
+
+@auth_router.get("/revocations", response_model=RevocationListResponse)
+@limiter.limit("60/minute")
+async def read_revocations(
+    request: Request,
+    caller: str = Depends(get_introspection_caller),
+    db: AsyncSession = Depends(get_read_db)
+):
+    """
+    Subjects whose earlier tokens are revoked, as {sub: issued_before}, for
+    downstream verifiers polling with RevocationFeed. Only revocations that
+    can still affect an unexpired token are listed. Same callers as
+    introspection.
+    """
+    with timed("user_fetch"):
+        revoked = await get_revocations(db)
+    return RevocationListResponse(revoked=revoked)
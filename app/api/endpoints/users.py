@@ -1,11 +1,15 @@
 from fastapi import APIRouter, Depends, HTTPException, status, Request
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy.future import select
 from app.schemas.user import UserResponse, UserUpdate, UserPasswordUpdate
 from app.models.user import User
-from app.api.deps import get_current_user, get_db
+from app.api.deps import get_current_user, get_current_user_read, get_db
+from app.repositories.token_revocations import revoke_tokens
+from app.repositories.user import get_user_by_email
+from app.repositories.user_stats import apply_stat_changes, user_stat_keys
 from app.core.security import verify_password, get_password_hash
 from app.core.limiter import limiter
+from app.core.mailer import send_verification_email
+from app.core.timing import timed
 
 router = APIRouter()
 
@@ -13,7 +17,7 @@ router = APIRouter()
 @limiter.limit("20/minute")
 async def read_users_me(
     request: Request,
-    current_user: User = Depends(get_current_user)
+    current_user: User = Depends(get_current_user_read)
 ):
     """
     Get current user.
@@ -31,20 +35,29 @@ async def update_user_me(
     """
     Update current user details.
     """
+    stats_before = user_stat_keys(current_user)
+    email_changed = False
     if user_in.email and user_in.email != current_user.email:
-        # Check if email is already taken
-        result = await db.execute(select(User).where(User.email == user_in.email))
-        existing_user = result.scalars().one_or_none()
-        if existing_user:
+        # Check if email is already taken (a case-only change is not)
+        existing_user = await get_user_by_email(db, user_in.email)
+        if existing_user and existing_user.id != current_user.id:
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
                 detail="Email already registered"
             )
+        # A new address has to be verified again
+        email_changed = user_in.email.lower() != current_user.email.lower()
+        if email_changed:
+            current_user.email_verified = False
         current_user.email = user_in.email
     
     db.add(current_user)
-    await db.commit()
+    await apply_stat_changes(db, stats_before, user_stat_keys(current_user))
+    with timed("db_commit"):
+        await db.commit()
     await db.refresh(current_user)
+    if email_changed:
+        send_verification_email(current_user.id, current_user.email)
     return current_user
 
 @router.post("/me/password")
@@ -72,7 +85,10 @@ async def change_password(
 
     current_user.hashed_password = get_password_hash(password_in.new_password)
     db.add(current_user)
-    await db.commit()
+    # Downstream verifiers drop tokens issued under the old password
+    await revoke_tokens(db, str(current_user.id))
+    with timed("db_commit"):
+        await db.commit()
     return {"msg": "Password updated successfully"}
 
 @router.delete("/me")
@@ -85,7 +101,11 @@ async def delete_user_me(
     """
     Soft delete current user (deactivate account).
     """
+    stats_before = user_stat_keys(current_user)
     current_user.is_active = False
     db.add(current_user)
-    await db.commit()
+    await apply_stat_changes(db, stats_before, user_stat_keys(current_user))
+    await revoke_tokens(db, str(current_user.id))
+    with timed("db_commit"):
+        await db.commit()
     return {"msg": "User account deactivated successfully"}
\ No newline at end of file
@@ -0,0 +1,57 @@
+import hmac
+import threading
+import time
+from dataclasses import dataclass
+
+
+@dataclass
+class _CachedToken:
+    access_token: str
+    expires_at: float
+    secret_digest: str
+
+
+class ClientTokenCache:
+    """
+    Issued client_credentials tokens by client_id. A client asking again is
+    handed its still-valid token instead of a fresh one, as long as at least
+    `min_remaining` seconds of lifetime are left and it presents the same
+    secret.
+    """
+
+    def __init__(self, min_remaining: float = 60.0) -> None:
+        self.min_remaining = min_remaining
+        self._tokens: dict[str, _CachedToken] = {}
+        self._lock = threading.Lock()
+
+    def get(self, client_id: str, secret_digest: str) -> tuple[str, int] | None:
+        """
+        Returns (access_token, seconds_left) or None.
+        """
+        with self._lock:
+            entry = self._tokens.get(client_id)
+        if entry is None or not hmac.compare_digest(entry.secret_digest, secret_digest):
+            return None
+        remaining = entry.expires_at - time.time()
+        if remaining < self.min_remaining:
+            return None
+        return entry.access_token, int(remaining)
+
+    def put(self, client_id: str, secret_digest: str, access_token: str, expires_at: float) -> None:
+        now = time.time()
+        with self._lock:
+            # Drop expired entries so the cache stays bounded by live clients
+            for stale in [cid for cid, e in self._tokens.items() if e.expires_at <= now]:
+                del self._tokens[stale]
+            self._tokens[client_id] = _CachedToken(access_token, expires_at, secret_digest)
+
+    def evict(self, client_id: str) -> None:
+        with self._lock:
+            self._tokens.pop(client_id, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._tokens.clear()
+
+
+client_token_cache = ClientTokenCache()
@@ -1,18 +1,74 @@
-from pydantic_settings import BaseSettings
+from typing import Annotated
+from pydantic_settings import BaseSettings, NoDecode
 from pydantic import Field, field_validator
 
 class Settings(BaseSettings):
     PROJECT_NAME: str = "Inwren Auth"
     
     DATABASE_URL: str = Field(default="sqlite:///./default.db", description="Database connection URL")
+    DATABASE_ECHO: bool = False  # Log every SQL statement (debugging only)
+    DATABASE_POOL_SIZE: int = 5
+    DATABASE_MAX_OVERFLOW: int = 10
+    # Per-connection asyncpg prepared statements; ignored when DATABASE_PGBOUNCER is set
+    DATABASE_PREPARED_STATEMENT_CACHE_SIZE: int = 500
+    # Behind pgbouncer in transaction pooling mode: no statement caches, unique statement names
+    DATABASE_PGBOUNCER: bool = False
+    # Read replicas for read-only dependencies, comma separated; empty means primary only
+    DATABASE_REPLICA_URLS: Annotated[list[str], NoDecode] = Field(default_factory=list)
+    REPLICA_EJECT_SECONDS: float = 30.0  # How long a failing replica is skipped
 
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 30
     REFRESH_TOKEN_EXPIRE_DAYS: int = 7  # Refresh tokens last 7 days
+    REFRESH_REUSE_GRACE_SECONDS: float = 10.0  # Duplicate refreshes within this window get the same tokens
     ALGORITHM: str = "EdDSA"
+    TOKEN_LEEWAY_SECONDS: int = 0  # Clock skew tolerated when verifying expiry
+    TOKEN_CACHE_SIZE: int = 10000  # Verified tokens kept in the in-process LRU
     
     # Keys loaded from environment variables
     PRIVATE_KEY: str
     PUBLIC_KEY: str
+    # HMAC key for service-account client secrets; service accounts are disabled while empty
+    CLIENT_SECRET_KEY: str = ""
+
+    LOG_LEVEL: str = "INFO"
+    # Per-phase timings in a Server-Timing response header; off by default, since
+    # they expose e.g. the Argon2 timing of /auth/login to anonymous clients
+    SERVER_TIMING_ENABLED: bool = False
+
+    # Background readiness checks served by /ready
+    READINESS_INTERVAL_SECONDS: float = 10.0
+    READINESS_TIMEOUT_SECONDS: float = 2.0
+
+    # Production launcher (python -m app.server)
+    SERVER_HOST: str = "0.0.0.0"
+    SERVER_PORT: int = 8000
+    WEB_CONCURRENCY: int = 0  # Worker processes; 0 sizes to the available cores and memory
+    SERVER_BACKLOG: int = 2048
+    GRACEFUL_SHUTDOWN_SECONDS: float = 30.0  # In-flight requests get this long after SIGTERM
+
+    # Email verification and outbound mail; mail is disabled while SMTP_HOST is empty
+    EMAIL_VERIFICATION_EXPIRE_HOURS: int = 24
+    EMAIL_VERIFICATION_URL: str = ""  # Link template with a {token} placeholder, e.g. https://app.example.com/verify?token={token}
+    MAIL_FROM: str = "no-reply@localhost"
+    SMTP_HOST: str = ""
+    SMTP_PORT: int = 587
+    SMTP_USERNAME: str = ""
+    SMTP_PASSWORD: str = ""
+    SMTP_STARTTLS: bool = True
+    SMTP_TIMEOUT_SECONDS: float = 10.0
+    MAIL_QUEUE_SIZE: int = 1000  # Messages beyond this are dropped, never awaited by requests
+    MAIL_WORKERS: int = 2  # Concurrent batches, one pooled SMTP connection each
+    MAIL_BATCH_SIZE: int = 50
+    MAIL_BATCH_WAIT_MS: float = 100.0  # How long a worker waits to fill a batch
+    MAIL_SHUTDOWN_TIMEOUT_SECONDS: float = 10.0  # Time to flush queued mail on shutdown
+
+    # Recount of the admin dashboard counters from the users table; 0 disables
+    USER_STATS_RECONCILE_SECONDS: float = 3600.0
+
+    # Sampling profiler (opt-in, see app/core/profiler.py)
+    PROFILER_ENABLED: bool = False
+    PROFILER_SAMPLE_RATE: float = 0.0  # Fraction of requests profiled outside capture windows
+    PROFILER_INTERVAL_MS: float = 5.0
 
     @field_validator("PRIVATE_KEY", "PUBLIC_KEY", mode="before")
     @classmethod
@@ -20,6 +76,13 @@ class Settings(BaseSettings):
         # Replace escaped newlines with actual newlines
         return v.replace("\\n", "\n")
 
+    @field_validator("DATABASE_REPLICA_URLS", mode="before")
+    @classmethod
+    def split_urls(cls, v: str | list[str]) -> list[str]:
+        if isinstance(v, str):
+            return [url.strip() for url in v.split(",") if url.strip()]
+        return v
+
     class Config:
         env_file = ".env"
         case_sensitive = True
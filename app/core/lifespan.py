@@ -0,0 +1,69 @@
+import asyncio
+import logging
+import time
+from contextlib import asynccontextmanager, suppress
+from typing import AsyncIterator
+
+from fastapi import FastAPI
+from sqlalchemy import text
+from starlette.concurrency import run_in_threadpool
+
+from app.core.config import settings
+from app.core.mailer import mail_queue
+from app.core.readiness import readiness
+from app.core.security import get_private_key, get_pwd_context, get_token_verifier
+from app.core.user_stats import stats_reconciler
+from app.database.session import dispose_engine, get_engine
+
+logger = logging.getLogger(__name__)
+
+
+def _warm_crypto() -> None:
+    get_private_key()
+    get_token_verifier()
+    # Loads passlib and the argon2 backend; the first hash pays for both
+    get_pwd_context().hash("warm-up")
+
+
+async def warm_up() -> None:
+    """
+    Pay one-off startup costs (key parsing, Argon2 backend, DB driver and the
+    first pooled connection) before the pod reports ready. Failures are left
+    for the readiness checks to report.
+    """
+    start = time.perf_counter()
+    try:
+        await run_in_threadpool(_warm_crypto)
+        async with get_engine().connect() as conn:
+            await conn.execute(text("SELECT 1"))
+    except Exception as exc:
+        logger.error("Warm-up failed: %s", exc, exc_info=True)
+    readiness.warmup_ms = round((time.perf_counter() - start) * 1000, 2)
+    readiness.warmed_up = True
+    logger.info("Warm-up finished", extra={"warmup_ms": readiness.warmup_ms})
+
+
+async def _warm_up_then_check() -> None:
+    await warm_up()
+    readiness.start()
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI) -> AsyncIterator[None]:
+    # Warm up in the background so the server starts accepting (liveness)
+    # requests immediately
+    warmup_task = asyncio.create_task(_warm_up_then_check())
+    stats_reconciler.start()
+    mail_queue.start()
+    try:
+        yield
+    finally:
+        # Shutdown may come while warm-up is still running; let it unwind
+        # before the engines it uses are disposed
+        warmup_task.cancel()
+        with suppress(asyncio.CancelledError):
+            await warmup_task
+        await mail_queue.stop(timeout=settings.MAIL_SHUTDOWN_TIMEOUT_SECONDS)
+        await stats_reconciler.stop()
+        await readiness.stop()
+        await dispose_engine()
@@ -0,0 +1,105 @@
+import atexit
+import json
+import logging
+import os
+import queue
+from datetime import datetime, timezone
+from logging.handlers import QueueHandler, QueueListener
+
+# Attributes every LogRecord has; anything else came in through `extra=`
+_RESERVED_ATTRS = set(logging.LogRecord("", 0, "", 0, "", None, None).__dict__) | {"message"}
+
+_listener: QueueListener | None = None
+
+
+class JsonFormatter(logging.Formatter):
+    """
+    One JSON object per line, with `extra=` fields merged in at the top level.
+    """
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            "ts": datetime.fromtimestamp(record.created, timezone.utc).isoformat(),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+        }
+        for key, value in record.__dict__.items():
+            if key not in _RESERVED_ATTRS:
+                entry[key] = value
+        if record.exc_info:
+            entry["exc_info"] = self.formatException(record.exc_info)
+        elif record.exc_text:
+            entry["exc_info"] = record.exc_text
+        return json.dumps(entry, default=str)
+
+
+class _StructuredQueueHandler(QueueHandler):
+    """
+    QueueHandler.prepare() flattens the record into a formatted string; keep
+    the `extra=` fields and only resolve what cannot cross the queue.
+    """
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        record = logging.makeLogRecord(record.__dict__)
+        record.msg = record.getMessage()
+        record.args = None
+        if record.exc_info:
+            record.exc_text = logging.Formatter().formatException(record.exc_info)
+            record.exc_info = None
+        return record
+
+
+def setup_logging(level: int | str = logging.INFO) -> None:
+    """
+    Route all logging through a queue drained by a background thread, so
+    handlers never block the event loop on I/O.
+    """
+    global _listener
+    if _listener is not None:
+        return
+
+    log_queue: queue.SimpleQueue = queue.SimpleQueue()
+    stream_handler = logging.StreamHandler()
+    stream_handler.setFormatter(JsonFormatter())
+
+    _listener = QueueListener(log_queue, stream_handler, respect_handler_level=True)
+    _listener.start()
+    atexit.register(_listener.stop)
+
+    root = logging.getLogger()
+    root.addHandler(_StructuredQueueHandler(log_queue))
+    root.setLevel(level)
+
+
+def stop_logging() -> None:
+    """
+    Flush queued records and stop the listener thread. Call before
+    os._exit(), which skips the atexit hook that would otherwise do it.
+    """
+    global _listener
+    if _listener is None:
+        return
+    atexit.unregister(_listener.stop)
+    _listener.stop()
+    _listener = None
+
+
+def _restart_listener_in_child() -> None:
+    """
+    The listener thread does not survive fork(); give a forked worker its
+    own queue and thread so its logs are not silently queued forever.
+    """
+    global _listener
+    if _listener is None:
+        return
+    log_queue: queue.SimpleQueue = queue.SimpleQueue()
+    for handler in logging.getLogger().handlers:
+        if isinstance(handler, _StructuredQueueHandler):
+            handler.queue = log_queue
+    _listener = QueueListener(log_queue, *_listener.handlers, respect_handler_level=True)
+    _listener.start()
+    atexit.register(_listener.stop)
+
+
+os.register_at_fork(after_in_child=_restart_listener_in_child)
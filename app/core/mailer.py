@@ -0,0 +1,252 @@
+import asyncio
+import logging
+import smtplib
+import ssl
+import threading
+from email.message import EmailMessage
+from typing import Any
+
+from starlette.concurrency import run_in_threadpool
+
+from app.core.config import settings
+from app.core.security import create_email_verification_token
+
+logger = logging.getLogger(__name__)
+
+
+class SMTPPool:
+    """
+    Keeps up to `size` SMTP connections open between batches, so a batch
+    pays for connect, STARTTLS and AUTH at most once. Blocking; used from
+    worker threads.
+    """
+
+    def __init__(
+        self,
+        host: str,
+        port: int,
+        username: str = "",
+        password: str = "",
+        starttls: bool = False,
+        timeout: float = 10.0,
+        size: int = 2,
+    ) -> None:
+        self.host = host
+        self.port = port
+        self.username = username
+        self.password = password
+        self.starttls = starttls
+        self.timeout = timeout
+        self.size = size
+        self._idle: list[smtplib.SMTP] = []
+        self._lock = threading.Lock()
+
+    def _connect(self) -> smtplib.SMTP:
+        smtp = smtplib.SMTP(self.host, self.port, timeout=self.timeout)
+        try:
+            if self.starttls:
+                smtp.starttls(context=ssl.create_default_context())
+            if self.username:
+                smtp.login(self.username, self.password)
+        except Exception:
+            smtp.close()
+            raise
+        return smtp
+
+    def _acquire(self) -> smtplib.SMTP:
+        with self._lock:
+            if self._idle:
+                return self._idle.pop()
+        return self._connect()
+
+    def _release(self, smtp: smtplib.SMTP) -> None:
+        with self._lock:
+            if len(self._idle) < self.size:
+                self._idle.append(smtp)
+                return
+        self._quit(smtp)
+
+    @staticmethod
+    def _quit(smtp: smtplib.SMTP) -> None:
+        try:
+            smtp.quit()
+        except (smtplib.SMTPException, OSError):
+            smtp.close()
+
+    def send_batch(self, messages: list[EmailMessage]) -> int:
+        """
+        Send `messages` over one connection and return how many the server
+        accepted. A connection the server dropped while idle is replaced
+        once; rejected recipients are logged and skipped.
+        """
+        smtp = self._acquire()
+        sent = 0
+        try:
+            for message in messages:
+                try:
+                    try:
+                        smtp.send_message(message)
+                    except smtplib.SMTPServerDisconnected:
+                        smtp.close()
+                        smtp = self._connect()
+                        smtp.send_message(message)
+                except (smtplib.SMTPRecipientsRefused, smtplib.SMTPSenderRefused, smtplib.SMTPDataError) as exc:
+                    logger.warning("Mail rejected: %s", exc, extra={"to": message["To"]})
+                    continue
+                sent += 1
+        except Exception:
+            smtp.close()
+            raise
+        self._release(smtp)
+        return sent
+
+    def close(self) -> None:
+        with self._lock:
+            idle, self._idle = self._idle, []
+        for smtp in idle:
+            self._quit(smtp)
+
+
+class MailQueue:
+    """
+    Bounded in-process outbox. Requests only `enqueue()`, which never
+    blocks or touches the network; `workers` background tasks take up to
+    `batch_size` messages at a time (waiting at most `batch_wait` seconds
+    for a batch to fill) and send them through the SMTP pool on the
+    threadpool. When the queue is full, new mail is dropped and logged
+    rather than slowing requests down.
+    """
+
+    def __init__(
+        self,
+        pool: SMTPPool | None,
+        maxsize: int,
+        batch_size: int,
+        batch_wait: float,
+        workers: int,
+    ) -> None:
+        self.pool = pool
+        self.maxsize = maxsize
+        self.batch_size = batch_size
+        self.batch_wait = batch_wait
+        self.workers = workers
+        self.sent = 0
+        self.failed = 0
+        self.dropped = 0
+        self._queue: asyncio.Queue[EmailMessage] | None = None
+        self._tasks: list[asyncio.Task] = []
+
+    @property
+    def running(self) -> bool:
+        return self._queue is not None
+
+    def enqueue(self, message: EmailMessage) -> bool:
+        if self._queue is None:
+            # Reported once by start(); recipients stay out of the logs
+            self.dropped += 1
+            logger.debug("Mail disabled, message dropped")
+            return False
+        try:
+            self._queue.put_nowait(message)
+        except asyncio.QueueFull:
+            self.dropped += 1
+            logger.error("Mail queue full, message dropped", extra={"queued": self.maxsize})
+            return False
+        return True
+
+    async def _next_batch(self, queue: asyncio.Queue[EmailMessage]) -> list[EmailMessage]:
+        batch = [await queue.get()]
+        while len(batch) < self.batch_size:
+            if queue.empty():
+                if len(batch) > 1 or self.batch_wait <= 0:
+                    break
+                # Give a burst a moment to arrive so it shares a connection
+                await asyncio.sleep(self.batch_wait)
+                if queue.empty():
+                    break
+            batch.append(queue.get_nowait())
+        return batch
+
+    async def _work(self, queue: asyncio.Queue[EmailMessage]) -> None:
+        assert self.pool is not None
+        while True:
+            batch = await self._next_batch(queue)
+            try:
+                sent = await run_in_threadpool(self.pool.send_batch, batch)
+                self.sent += sent
+                self.failed += len(batch) - sent
+            except Exception as exc:
+                self.failed += len(batch)
+                logger.error("Sending %d emails failed: %s", len(batch), exc, exc_info=True)
+            finally:
+                for _ in batch:
+                    queue.task_done()
+
+    def start(self) -> None:
+        if self.pool is None:
+            logger.warning("Mail disabled (SMTP_HOST is not set), outgoing mail will be dropped")
+            return
+        if self._queue is not None:
+            return
+        self._queue = asyncio.Queue(maxsize=self.maxsize)
+        self._tasks = [asyncio.create_task(self._work(self._queue)) for _ in range(self.workers)]
+
+    async def stop(self, timeout: float = 0.0) -> None:
+        """
+        Stop accepting mail, give the workers up to `timeout` seconds to
+        send what is queued, then shut them down.
+        """
+        queue, self._queue = self._queue, None
+        if queue is None:
+            return
+        try:
+            await asyncio.wait_for(queue.join(), timeout)
+        except asyncio.TimeoutError:
+            logger.warning("Mail queue not flushed on shutdown", extra={"unsent": queue.qsize()})
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+        if self.pool is not None:
+            await run_in_threadpool(self.pool.close)
+
+
+def verification_email(to: str, token: str) -> EmailMessage:
+    link = settings.EMAIL_VERIFICATION_URL.format(token=token) if settings.EMAIL_VERIFICATION_URL else None
+    message = EmailMessage()
+    message["From"] = settings.MAIL_FROM
+    message["To"] = to
+    message["Subject"] = f"Verify your email for {settings.PROJECT_NAME}"
+    if link:
+        body = f"Confirm your email address by opening this link:\n\n{link}\n"
+    else:
+        body = f"Confirm your email address with this verification code:\n\n{token}\n"
+    hours = settings.EMAIL_VERIFICATION_EXPIRE_HOURS
+    message.set_content(body + f"\nIt expires in {hours} hours. If you did not sign up, ignore this email.\n")
+    return message
+
+
+mail_queue = MailQueue(
+    pool=SMTPPool(
+        settings.SMTP_HOST,
+        settings.SMTP_PORT,
+        username=settings.SMTP_USERNAME,
+        password=settings.SMTP_PASSWORD,
+        starttls=settings.SMTP_STARTTLS,
+        timeout=settings.SMTP_TIMEOUT_SECONDS,
+        size=settings.MAIL_WORKERS,
+    ) if settings.SMTP_HOST else None,
+    maxsize=settings.MAIL_QUEUE_SIZE,
+    batch_size=settings.MAIL_BATCH_SIZE,
+    batch_wait=settings.MAIL_BATCH_WAIT_MS / 1000,
+    workers=settings.MAIL_WORKERS,
+)
+
+
+def send_verification_email(user_id: Any, email: str) -> bool:
+    """
+    Queue the verification mail for `email`; delivery happens in the
+    background and never delays the request.
+    """
+    token = create_email_verification_token(user_id, email)
+    return mail_queue.enqueue(verification_email(email, token))
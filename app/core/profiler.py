@@ -0,0 +1,191 @@
+import asyncio
+import random
+import sys
+import threading
+import time
+from collections import Counter, defaultdict
+from types import FrameType
+from typing import Any
+
+from starlette.types import ASGIApp, Receive, Scope, Send
+
+from app.core.config import settings
+
+
+def _frame_label(frame: FrameType) -> str:
+    module = frame.f_globals.get("__name__", "?")
+    return f"{module}:{frame.f_code.co_qualname}"
+
+
+def _thread_stack(frame: FrameType | None) -> list[str]:
+    """
+    Root-first labels for a live thread stack.
+    """
+    stack = []
+    while frame is not None:
+        stack.append(_frame_label(frame))
+        frame = frame.f_back
+    stack.reverse()
+    return stack
+
+
+def _await_stack(coro: Any) -> list[str]:
+    """
+    Root-first labels for a suspended coroutine chain (where a task is waiting).
+    """
+    stack = []
+    while coro is not None:
+        frame = (
+            getattr(coro, "cr_frame", None)
+            or getattr(coro, "gi_frame", None)
+            or getattr(coro, "ag_frame", None)
+        )
+        if frame is None:
+            break
+        stack.append(_frame_label(frame))
+        coro = (
+            getattr(coro, "cr_await", None)
+            or getattr(coro, "gi_yieldfrom", None)
+            or getattr(coro, "ag_await", None)
+        )
+    stack.append("[await]")
+    return stack
+
+
+class SamplingProfiler:
+    """
+    Statistical wall-clock profiler for selected requests.
+
+    A daemon thread wakes every `interval` seconds while at least one request
+    is being profiled. Running tasks contribute their live stack, suspended
+    tasks contribute their await chain, so time spent in Argon2 and time spent
+    waiting on the database both show up. Samples are folded into collapsed
+    stacks keyed by route once the request finishes.
+    """
+
+    def __init__(self, sample_rate: float = 0.0, interval: float = 0.005, enabled: bool = False):
+        self.enabled = enabled
+        self.sample_rate = sample_rate
+        self.interval = interval
+        self.capture_until = 0.0
+
+        self._lock = threading.Lock()
+        self._wakeup = threading.Event()
+        self._thread: threading.Thread | None = None
+        # task -> (event loop, loop thread id, per-request samples)
+        self._active: dict[asyncio.Task, tuple[asyncio.AbstractEventLoop, int, Counter]] = {}
+        self._profiles: dict[str, Counter] = defaultdict(Counter)
+
+    def should_profile(self) -> bool:
+        if time.monotonic() < self.capture_until:
+            return True
+        return self.sample_rate > 0 and random.random() < self.sample_rate
+
+    def capture(self, seconds: float) -> None:
+        """
+        Profile every request for the next `seconds`.
+        """
+        self.capture_until = time.monotonic() + seconds
+
+    def begin(self, task: asyncio.Task) -> None:
+        # The wakeup event is only set or cleared together with `_active`,
+        # under the lock, so it is set exactly while tasks are being profiled
+        with self._lock:
+            self._active[task] = (task.get_loop(), threading.get_ident(), Counter())
+            self._wakeup.set()
+            if self._thread is None:
+                self._thread = threading.Thread(
+                    target=self._run, name="request-profiler", daemon=True
+                )
+                self._thread.start()
+
+    def end(self, task: asyncio.Task, route: str) -> None:
+        with self._lock:
+            _, _, samples = self._active.pop(task, (None, 0, Counter()))
+            if not self._active:
+                self._wakeup.clear()
+            profile = self._profiles[route]
+            for stack, count in samples.items():
+                profile[stack] += count
+
+    def reset(self) -> None:
+        with self._lock:
+            self._profiles.clear()
+
+    def routes(self) -> list[str]:
+        with self._lock:
+            return sorted(self._profiles)
+
+    def collapsed(self, route: str | None = None) -> str:
+        """
+        Render samples in collapsed-stack format (`frame;frame;frame count`),
+        with the route as the root frame. Feed the output to flamegraph.pl,
+        speedscope or inferno.
+        """
+        with self._lock:
+            lines = []
+            for name, profile in sorted(self._profiles.items()):
+                if route is not None and name != route:
+                    continue
+                for stack, count in profile.most_common():
+                    lines.append(f"{name};{stack} {count}")
+        return "\n".join(lines) + ("\n" if lines else "")
+
+    def _run(self) -> None:
+        while True:
+            self._wakeup.wait()
+            if self._sample():
+                time.sleep(self.interval)
+
+    def _sample(self) -> bool:
+        """
+        Take one sample of every active task. Returns False, and goes back
+        to sleep, when there is nothing to profile.
+        """
+        frames = sys._current_frames()
+        with self._lock:
+            if not self._active:
+                self._wakeup.clear()
+                return False
+            for task, (loop, thread_id, samples) in self._active.items():
+                if task.done():
+                    continue
+                if asyncio.current_task(loop) is task and thread_id in frames:
+                    stack = _thread_stack(frames[thread_id])
+                else:
+                    stack = _await_stack(task.get_coro())
+                samples[";".join(stack)] += 1
+        return True
+
+
+class ProfilerMiddleware:
+    """
+    Pure ASGI middleware so the endpoint runs in the server's task and the
+    sampler can attribute stacks to it.
+    """
+
+    def __init__(self, app: ASGIApp, profiler: SamplingProfiler) -> None:
+        self.app = app
+        self.profiler = profiler
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or not self.profiler.should_profile():
+            await self.app(scope, receive, send)
+            return
+
+        task = asyncio.current_task()
+        assert task is not None
+        self.profiler.begin(task)
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            route = scope.get("route")
+            path = getattr(route, "path", None) or "<unmatched>"
+            self.profiler.end(task, f"{scope['method']} {path}")
+
+
+profiler = SamplingProfiler(
+    sample_rate=settings.PROFILER_SAMPLE_RATE,
+    interval=settings.PROFILER_INTERVAL_MS / 1000,
+    enabled=settings.PROFILER_ENABLED,
+)
@@ -0,0 +1,136 @@
+import asyncio
+import logging
+import time
+from typing import Any, Awaitable, Callable
+
+from sqlalchemy import text
+from starlette.concurrency import run_in_threadpool
+
+from app.core.config import settings
+from app.core.security import create_access_token, decode_token, get_pwd_context
+from app.database.session import get_engine
+
+logger = logging.getLogger(__name__)
+
+_PROBE_SECRET = "readiness-probe"
+
+
+async def check_database() -> None:
+    """
+    Round trip through the connection pool.
+    """
+    async with get_engine().connect() as conn:
+        await conn.execute(text("SELECT 1"))
+
+
+async def check_keys() -> None:
+    """
+    Sign with the private key and verify with the public key, which catches
+    unparsable or mismatched key pairs.
+    """
+    token = create_access_token(subject="readiness-probe")
+    if decode_token(token)["sub"] != "readiness-probe":
+        raise ValueError("Key self-test returned the wrong subject")
+
+
+class ReadinessChecker:
+    """
+    Runs the readiness checks in the background every `interval` seconds and
+    caches the outcome, so `/ready` never touches the database itself and
+    probe frequency adds no backend load.
+    """
+
+    def __init__(self, interval: float, timeout: float) -> None:
+        self.interval = interval
+        self.timeout = timeout
+        self.warmed_up = False
+        self.warmup_ms: float | None = None
+        self.checks: dict[str, str] = {}
+        self.checked_at: float | None = None
+        self._probe_hash: str | None = None
+        self._task: asyncio.Task | None = None
+
+    async def check_hash_pool(self) -> None:
+        """
+        Argon2 verify on the worker threadpool; fails if the threads are
+        wedged or saturated beyond the timeout.
+        """
+        pwd_context = get_pwd_context()
+        if self._probe_hash is None:
+            self._probe_hash = await run_in_threadpool(pwd_context.hash, _PROBE_SECRET)
+        if not await run_in_threadpool(pwd_context.verify, _PROBE_SECRET, self._probe_hash):
+            raise ValueError("Argon2 self-test failed")
+
+    @property
+    def ready(self) -> bool:
+        if not self.warmed_up or self.checked_at is None:
+            return False
+        # A stuck checker must not keep reporting a stale "ok"
+        if time.monotonic() - self.checked_at > 3 * self.interval:
+            return False
+        return all(result == "ok" for result in self.checks.values())
+
+    def report(self) -> dict[str, Any]:
+        if self.ready:
+            status = "ready"
+        elif not self.warmed_up:
+            status = "starting"
+        else:
+            status = "unavailable"
+        age = None if self.checked_at is None else round(time.monotonic() - self.checked_at, 2)
+        return {
+            "status": status,
+            "checks": self.checks,
+            "checked_seconds_ago": age,
+            "warmup_ms": self.warmup_ms,
+        }
+
+    async def _run_check(self, name: str, check: Callable[[], Awaitable[None]]) -> str:
+        # /ready is unauthenticated; the details only go to the log
+        try:
+            await asyncio.wait_for(check(), self.timeout)
+        except asyncio.TimeoutError:
+            return "timeout"
+        except Exception as exc:
+            if self.checks.get(name) != "error":
+                logger.warning("Readiness check %s failed: %s", name, exc, exc_info=True)
+            return "error"
+        return "ok"
+
+    async def check_once(self) -> None:
+        names = ("database", "keys", "hash_pool")
+        results = await asyncio.gather(
+            self._run_check("database", check_database),
+            self._run_check("keys", check_keys),
+            self._run_check("hash_pool", self.check_hash_pool),
+        )
+        checks = dict(zip(names, results))
+        if checks != self.checks:
+            log = logger.info if all(r == "ok" for r in results) else logger.warning
+            log("Readiness changed", extra={"checks": checks})
+        self.checks = checks
+        self.checked_at = time.monotonic()
+
+    async def run(self) -> None:
+        while True:
+            await self.check_once()
+            await asyncio.sleep(self.interval)
+
+    def start(self) -> None:
+        if self._task is None:
+            self._task = asyncio.create_task(self.run())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+
+readiness = ReadinessChecker(
+    interval=settings.READINESS_INTERVAL_SECONDS,
+    timeout=settings.READINESS_TIMEOUT_SECONDS,
+)
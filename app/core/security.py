@@ -1,23 +1,106 @@
+import hashlib
+import hmac
+import secrets
 from datetime import datetime, timedelta, timezone
-from typing import Any, Union, Dict
+from functools import lru_cache
+from typing import TYPE_CHECKING, Any, Union, Dict
 import jwt
-from passlib.context import CryptContext
+from cryptography.hazmat.primitives.asymmetric.types import PrivateKeyTypes, PublicKeyTypes
+from cryptography.hazmat.primitives.serialization import load_pem_private_key, load_pem_public_key
 from app.core.config import settings
+from app.core.timing import timed
+from app.verifier import StaticKeys, TokenVerifier, public_jwk
 
-pwd_context = CryptContext(schemes=["argon2"])
+if TYPE_CHECKING:
+    from passlib.context import CryptContext
+
+@lru_cache
+def get_pwd_context() -> "CryptContext":
+    """
+    The Argon2 context, built on first use so passlib and its backend are
+    only imported when a password is actually hashed or verified.
+    """
+    from passlib.context import CryptContext
+    return CryptContext(schemes=["argon2"])
+
+@lru_cache
+def get_private_key() -> PrivateKeyTypes:
+    """
+    Signing key parsed once from settings instead of on every jwt.encode.
+    """
+    return load_pem_private_key(settings.PRIVATE_KEY.encode(), password=None)
+
+@lru_cache
+def get_public_key() -> PublicKeyTypes:
+    """
+    Verification key parsed once from settings instead of on every jwt.decode.
+    """
+    return load_pem_public_key(settings.PUBLIC_KEY.encode())
+
+@lru_cache
+def get_public_jwk() -> Dict[str, Any]:
+    """
+    The verification key as a JWK; its `kid` goes into every token header.
+    """
+    return public_jwk(get_public_key(), settings.ALGORITHM)
+
+@lru_cache
+def get_token_verifier() -> TokenVerifier:
+    """
+    The same verifier downstream services embed (app.verifier), backed by
+    our own public key instead of a fetched JWKS.
+    """
+    return TokenVerifier(
+        StaticKeys({get_public_jwk()["kid"]: get_public_key()}),
+        algorithms=[settings.ALGORITHM],
+        leeway=settings.TOKEN_LEEWAY_SECONDS,
+        cache_size=settings.TOKEN_CACHE_SIZE,
+    )
+
+def decode_token(token: str) -> Dict[str, Any]:
+    """
+    Verifies a token's signature and expiry and returns its claims.
+    Raises jwt.InvalidTokenError on failure.
+    """
+    return get_token_verifier().verify(token)
 
 def verify_password(plain_password: str, hashed_password: str) -> bool:
     """
     Verifies a plain password against the hashed version.
     """
-    return pwd_context.verify(plain_password, hashed_password)
+    with timed("kdf"):
+        return get_pwd_context().verify(plain_password, hashed_password)
 
 
 def get_password_hash(password: str) -> str:
     """
     Hashes a password using Argon2.
     """
-    return pwd_context.hash(password)
+    with timed("kdf"):
+        return get_pwd_context().hash(password)
+
+@lru_cache
+def get_client_secret_key() -> bytes:
+    """
+    HMAC key for client secrets. Deliberately independent of the signing
+    key, so rotating PRIVATE_KEY does not invalidate issued secrets.
+    """
+    if not settings.CLIENT_SECRET_KEY:
+        raise RuntimeError("CLIENT_SECRET_KEY is not set")
+    return settings.CLIENT_SECRET_KEY.encode()
+
+def generate_client_credentials() -> tuple[str, str]:
+    """
+    Returns a new (client_id, client_secret) pair.
+    """
+    return f"svc_{secrets.token_hex(12)}", secrets.token_urlsafe(32)
+
+def hash_client_secret(client_secret: str) -> str:
+    """
+    Keyed digest of a client secret. Generated secrets carry 256 bits of
+    entropy, so a fast HMAC is safe here and Argon2 is not needed.
+    """
+    return hmac.new(get_client_secret_key(), client_secret.encode(), hashlib.sha256).hexdigest()
 
 def create_refresh_token(subject: Union[str, Any]) -> tuple[str, str]:
     """
@@ -37,13 +120,34 @@ def create_refresh_token(subject: Union[str, Any]) -> tuple[str, str]:
     
     encoded_jwt = jwt.encode(
         to_encode, 
-        settings.PRIVATE_KEY, 
-        algorithm=settings.ALGORITHM
+        get_private_key(), 
+        algorithm=settings.ALGORITHM,
+        headers={"kid": get_public_jwk()["kid"]}
     )
     
     hashed_token = get_password_hash(encoded_jwt)
     return encoded_jwt, hashed_token
 
+def create_email_verification_token(subject: Union[str, Any], email: str) -> str:
+    """
+    Signed, expiring proof of access to `email`. Bound to the address, so it
+    stops working once the user changes their email.
+    """
+    now = datetime.now(timezone.utc)
+    to_encode = {
+        "exp": now + timedelta(hours=settings.EMAIL_VERIFICATION_EXPIRE_HOURS),
+        "iat": now,
+        "sub": str(subject),
+        "email": email.lower(),
+        "type": "email_verification",
+    }
+    return jwt.encode(
+        to_encode,
+        get_private_key(),
+        algorithm=settings.ALGORITHM,
+        headers={"kid": get_public_jwk()["kid"]}
+    )
+
 def create_access_token(subject: Union[str, Any], claims: Dict[str, Any] | None = None) -> str:
     """
     Generates a JWT using the RS256 algorithm and the Private Key.
@@ -76,8 +180,9 @@ def create_access_token(subject: Union[str, Any], claims: Dict[str, Any] | None
     # Sign with PRIVATE KEY using RS256
     encoded_jwt = jwt.encode(
         to_encode, 
-        settings.PRIVATE_KEY, 
-        algorithm=settings.ALGORITHM
+        get_private_key(), 
+        algorithm=settings.ALGORITHM,
+        headers={"kid": get_public_jwk()["kid"]}
     )
     
     return encoded_jwt
\ No newline at end of file
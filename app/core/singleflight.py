@@ -0,0 +1,82 @@
+import asyncio
+import time
+from collections import deque
+from typing import Any, Awaitable, Callable, Hashable, TypeVar
+
+T = TypeVar("T")
+
+
+class SingleFlight:
+    """
+    Coalesces concurrent calls that share a key into one in-flight
+    computation; every caller gets its result (or its exception).
+
+    With `grace` > 0 a successful result is also handed to callers arriving
+    up to `grace` seconds after it completed. Coalescing is per process.
+    """
+
+    def __init__(self, grace: float = 0.0) -> None:
+        self.grace = grace
+        self._inflight: dict[Hashable, asyncio.Future] = {}
+        self._recent: dict[Hashable, tuple[float, Any]] = {}
+        self._recent_order: deque[tuple[float, Hashable]] = deque()
+
+    async def do(self, key: Hashable, fn: Callable[[], Awaitable[T]]) -> tuple[T, bool]:
+        """
+        Returns (result, shared); `shared` is False for the caller that
+        actually ran `fn`.
+        """
+        while True:
+            recent = self._recent_result(key)
+            if recent is not None:
+                return recent[0], True
+
+            future = self._inflight.get(key)
+            if future is None:
+                return await self._lead(key, fn), False
+            try:
+                return await asyncio.shield(future), True
+            except asyncio.CancelledError:
+                # The leader was cancelled (e.g. client went away); take over
+                if future.cancelled():
+                    continue
+                raise
+
+    async def _lead(self, key: Hashable, fn: Callable[[], Awaitable[T]]) -> T:
+        future = asyncio.get_running_loop().create_future()
+        # Avoid "exception was never retrieved" when nobody else waited
+        future.add_done_callback(lambda f: f.cancelled() or f.exception())
+        self._inflight[key] = future
+        try:
+            result = await fn()
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except BaseException as exc:
+            future.set_exception(exc)
+            raise
+        else:
+            future.set_result(result)
+            self._remember(key, result)
+            return result
+        finally:
+            del self._inflight[key]
+
+    def _recent_result(self, key: Hashable) -> tuple[Any] | None:
+        if not self.grace:
+            return None
+        now = time.monotonic()
+        while self._recent_order and self._recent_order[0][0] <= now:
+            _, stale = self._recent_order.popleft()
+            entry = self._recent.get(stale)
+            if entry is not None and entry[0] <= now:
+                del self._recent[stale]
+        entry = self._recent.get(key)
+        return (entry[1],) if entry is not None else None
+
+    def _remember(self, key: Hashable, result: Any) -> None:
+        if not self.grace:
+            return
+        expires_at = time.monotonic() + self.grace
+        self._recent[key] = (expires_at, result)
+        self._recent_order.append((expires_at, key))
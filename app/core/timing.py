@@ -0,0 +1,113 @@
+import logging
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Iterator
+
+from fastapi.responses import JSONResponse
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.core.config import settings
+
+access_logger = logging.getLogger("app.access")
+
+
+class RequestTimer:
+    """
+    Accumulates the duration of named phases (auth, kdf, db_commit, ...) for
+    a single request. Repeated phases add up.
+    """
+
+    def __init__(self) -> None:
+        self.start = time.perf_counter()
+        self.phases: dict[str, float] = {}
+
+    def add(self, phase: str, seconds: float) -> None:
+        self.phases[phase] = self.phases.get(phase, 0.0) + seconds
+
+    def elapsed(self) -> float:
+        return time.perf_counter() - self.start
+
+    def server_timing(self) -> str:
+        metrics = [f"{name};dur={seconds * 1000:.2f}" for name, seconds in self.phases.items()]
+        metrics.append(f"total;dur={self.elapsed() * 1000:.2f}")
+        return ", ".join(metrics)
+
+
+_current_timer: ContextVar[RequestTimer | None] = ContextVar("request_timer", default=None)
+
+
+@contextmanager
+def timed(phase: str) -> Iterator[None]:
+    """
+    Record the wrapped block as `phase` on the current request's timer.
+    No-op outside a request.
+    """
+    timer = _current_timer.get()
+    if timer is None:
+        yield
+        return
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        timer.add(phase, time.perf_counter() - start)
+
+
+class TimedJSONResponse(JSONResponse):
+    """
+    Default response class; records JSON rendering as the `serialize` phase.
+    """
+
+    def render(self, content: Any) -> bytes:
+        with timed("serialize"):
+            return super().render(content)
+
+
+class TimingMiddleware:
+    """
+    Writes one structured access log line per request and, with
+    SERVER_TIMING_ENABLED, attaches the same breakdown to every HTTP
+    response as a `Server-Timing` header.
+    """
+
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        timer = RequestTimer()
+        token = _current_timer.set(timer)
+        status_code = 500
+
+        async def send_with_timing(message: Message) -> None:
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+                if settings.SERVER_TIMING_ENABLED:
+                    headers = list(message.get("headers", []))
+                    headers.append((b"server-timing", timer.server_timing().encode("latin-1")))
+                    message = {**message, "headers": headers}
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_timing)
+        finally:
+            _current_timer.reset(token)
+            route = scope.get("route")
+            access_logger.info(
+                "request",
+                extra={
+                    "method": scope["method"],
+                    "path": scope["path"],
+                    "route": getattr(route, "path", None),
+                    "status": status_code,
+                    "duration_ms": round(timer.elapsed() * 1000, 2),
+                    "phases_ms": {
+                        name: round(seconds * 1000, 2) for name, seconds in timer.phases.items()
+                    },
+                },
+            )
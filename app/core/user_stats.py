@@ -0,0 +1,64 @@
+import asyncio
+import logging
+import time
+
+from app.core.config import settings
+from app.database.session import get_sessionmaker
+from app.repositories.user_stats import reconcile_user_stats, try_claim_reconcile
+
+logger = logging.getLogger(__name__)
+
+
+class StatsReconciler:
+    """
+    Recomputes the user counters from the users table every `interval`
+    seconds, correcting any drift (manual SQL, restored backups, bugs).
+    Requests never pay for the recount. Every worker runs the timer, but on
+    PostgreSQL only the one that claims the advisory lock recounts.
+    """
+
+    def __init__(self, interval: float) -> None:
+        self.interval = interval
+        self.reconciled_at: float | None = None
+        self.drifted = 0
+        self._task: asyncio.Task | None = None
+
+    async def reconcile_once(self) -> int | None:
+        """
+        Returns the number of drifted counters, or None when another worker
+        is already running the recount.
+        """
+        async with get_sessionmaker()() as session:
+            if not await try_claim_reconcile(session):
+                logger.debug("User stats reconciliation skipped, another worker holds the lock")
+                return None
+            drifted = await reconcile_user_stats(session)
+        self.reconciled_at = time.time()
+        self.drifted = drifted
+        if drifted:
+            logger.warning("User stats drifted", extra={"counters": drifted})
+        return drifted
+
+    async def run(self) -> None:
+        while True:
+            await asyncio.sleep(self.interval)
+            try:
+                await self.reconcile_once()
+            except Exception as exc:
+                logger.error("User stats reconciliation failed: %s", exc, exc_info=True)
+
+    def start(self) -> None:
+        if self._task is None and self.interval > 0:
+            self._task = asyncio.create_task(self.run())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+
+stats_reconciler = StatsReconciler(interval=settings.USER_STATS_RECONCILE_SECONDS)
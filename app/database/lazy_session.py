@@ -0,0 +1,179 @@
+from typing import Any, Callable, Iterator
+
+from sqlalchemy.exc import DBAPIError
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+# AsyncSession attributes that never touch the database and are passed
+# through as-is; everything that may need a connection is a method below
+_PASSTHROUGH = frozenset({
+    "add", "add_all", "expunge", "expunge_all", "expire", "expire_all",
+    "in_transaction", "in_nested_transaction", "is_active", "is_modified",
+    "new", "dirty", "deleted", "identity_map", "info", "no_autoflush", "sync_session",
+})
+
+
+class LazySession:
+    """
+    Stand-in for the AsyncSession handed out by get_db / get_read_db.
+
+    The real session, and with it a pooled connection, is only created on
+    first use, so requests that never query never touch the pool. A read
+    that opens its own transaction (nothing pending, no transaction yet) is
+    committed as soon as it returns, which gives the connection back
+    straight away instead of holding it through Argon2, serialization and
+    dependency teardown. Writes are unaffected; commit() already releases
+    the connection, and this also covers the post-commit refresh().
+
+    With several sessionmakers (read replicas) the first one that connects
+    is used; `on_connect_error(index)` is told about the ones that did not.
+    `fallback` is only called, and its engine only created, once all of
+    them have failed. Every operation that may need a connection goes
+    through the same failover; other AsyncSession APIs are not available.
+    """
+
+    def __init__(
+        self,
+        sessionmakers: list[async_sessionmaker[AsyncSession]],
+        on_connect_error: Callable[[int], None] | None = None,
+        fallback: Callable[[], async_sessionmaker[AsyncSession]] | None = None,
+    ) -> None:
+        self._sessionmakers = sessionmakers
+        self._on_connect_error = on_connect_error
+        self._fallback = fallback
+        self._session: AsyncSession | None = None
+        self._index = 0
+        self._connected = False
+
+    @property
+    def _candidates(self) -> int:
+        return len(self._sessionmakers) + (self._fallback is not None)
+
+    @property
+    def session(self) -> AsyncSession:
+        if self._session is None:
+            if self._index < len(self._sessionmakers):
+                self._session = self._sessionmakers[self._index]()
+            else:
+                assert self._fallback is not None
+                self._session = self._fallback()()
+        return self._session
+
+    @property
+    def bind(self) -> Any:
+        return self.session.bind
+
+    @property
+    def started(self) -> bool:
+        return self._session is not None
+
+    @property
+    def index(self) -> int:
+        """
+        Position of the sessionmaker in use; `len(sessionmakers)` is the fallback.
+        """
+        return self._index
+
+    def __getattr__(self, name: str) -> Any:
+        if name not in _PASSTHROUGH:
+            raise AttributeError(f"{type(self).__name__} does not support {name!r}")
+        return getattr(self.session, name)
+
+    def __contains__(self, instance: object) -> bool:
+        return instance in self.session
+
+    def __iter__(self) -> Iterator[Any]:
+        return iter(self.session)
+
+    async def _connect(self) -> None:
+        # Only probe when there is somewhere to fail over to; the last
+        # candidate simply connects on its first statement
+        while not self._connected and self._index < self._candidates - 1:
+            try:
+                await self.session.connection()
+            except (DBAPIError, OSError, TimeoutError):
+                await self.session.close()
+                self._session = None
+                if self._on_connect_error is not None:
+                    self._on_connect_error(self._index)
+                self._index += 1
+                continue
+            break
+        self._connected = True
+
+    async def _run(self, method: str, *args: Any, read: bool = True, **kwargs: Any) -> Any:
+        # Decided before _connect(): its failover probe begins the transaction
+        # this read then runs in, which still has to be released afterwards
+        session = self._session
+        release = read and (
+            session is None
+            or (
+                not session.in_transaction()
+                and not (session.new or session.dirty or session.deleted)
+            )
+        )
+        await self._connect()
+        session = self.session
+        result = await getattr(session, method)(*args, **kwargs)
+        if release:
+            # Read-only transaction; results are already buffered
+            await session.commit()
+        return result
+
+    # Core DML and text() keep the transaction open for the caller to commit
+    async def execute(self, statement: Any, *args: Any, **kwargs: Any) -> Any:
+        return await self._run("execute", statement, *args, read=statement.is_select, **kwargs)
+
+    async def scalar(self, statement: Any, *args: Any, **kwargs: Any) -> Any:
+        return await self._run("scalar", statement, *args, read=statement.is_select, **kwargs)
+
+    async def scalars(self, statement: Any, *args: Any, **kwargs: Any) -> Any:
+        return await self._run("scalars", statement, *args, read=statement.is_select, **kwargs)
+
+    async def get(self, *args: Any, **kwargs: Any) -> Any:
+        return await self._run("get", *args, **kwargs)
+
+    async def get_one(self, *args: Any, **kwargs: Any) -> Any:
+        return await self._run("get_one", *args, **kwargs)
+
+    async def refresh(self, *args: Any, **kwargs: Any) -> Any:
+        return await self._run("refresh", *args, **kwargs)
+
+    # Unbuffered results and writes hold the transaction open
+    async def stream(self, *args: Any, **kwargs: Any) -> Any:
+        return await self._run("stream", *args, read=False, **kwargs)
+
+    async def stream_scalars(self, *args: Any, **kwargs: Any) -> Any:
+        return await self._run("stream_scalars", *args, read=False, **kwargs)
+
+    async def merge(self, *args: Any, **kwargs: Any) -> Any:
+        return await self._run("merge", *args, read=False, **kwargs)
+
+    async def delete(self, *args: Any, **kwargs: Any) -> None:
+        await self._run("delete", *args, read=False, **kwargs)
+
+    async def flush(self, *args: Any, **kwargs: Any) -> None:
+        await self._run("flush", *args, read=False, **kwargs)
+
+    async def run_sync(self, *args: Any, **kwargs: Any) -> Any:
+        return await self._run("run_sync", *args, read=False, **kwargs)
+
+    async def connection(self, *args: Any, **kwargs: Any) -> Any:
+        return await self._run("connection", *args, read=False, **kwargs)
+
+    async def commit(self) -> None:
+        if self._session is not None:
+            await self._connect()
+            await self._session.commit()
+
+    # Nothing to undo or release before the session exists
+    async def rollback(self) -> None:
+        if self._session is not None:
+            await self._session.rollback()
+
+    async def invalidate(self) -> None:
+        if self._session is not None:
+            await self._session.invalidate()
+
+    async def close(self) -> None:
+        if self._session is not None:
+            await self._session.close()
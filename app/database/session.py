@@ -1,16 +1,113 @@
-from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession, async_sessionmaker
+import itertools
+import logging
+import time
+import uuid
+from functools import lru_cache
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import AsyncEngine, create_async_engine, AsyncSession, async_sessionmaker
+from sqlalchemy.pool import QueuePool
 from app.core.config import settings
 
-engine = create_async_engine(
-    settings.DATABASE_URL,
-    echo=True,
-    future=True,
-    connect_args={'ssl': True}
-)
+logger = logging.getLogger(__name__)
 
-AsyncSessionLocal = async_sessionmaker(
-    bind=engine,
-    class_=AsyncSession,
-    expire_on_commit=False,
-)
+# Engines (and with them the DB driver) are created on first use rather than
+# at import, so importing the app stays cheap; the lifespan warms them up.
 
+def _create_engine(url: str) -> AsyncEngine:
+    parsed = make_url(url)
+    connect_args = {}
+    # asyncpg-only options; other drivers (aiosqlite for local runs) reject them
+    if parsed.get_driver_name() == 'asyncpg':
+        connect_args = {
+            'ssl': True,
+            'prepared_statement_cache_size': settings.DATABASE_PREPARED_STATEMENT_CACHE_SIZE,
+        }
+        if settings.DATABASE_PGBOUNCER:
+            # Consecutive statements may land on different server connections:
+            # cache nothing (SQLAlchemy's adapter cache and asyncpg's own), and
+            # name each prepared statement uniquely so names never collide
+            connect_args.update({
+                'prepared_statement_cache_size': 0,
+                'statement_cache_size': 0,
+                'prepared_statement_name_func': lambda: f'__asyncpg_{uuid.uuid4()}__',
+            })
+    pool_args = {}
+    # Only queue pools are sized; in-memory SQLite gets a StaticPool, which rejects these
+    if issubclass(parsed.get_dialect().get_pool_class(parsed), QueuePool):
+        pool_args = {
+            'pool_size': settings.DATABASE_POOL_SIZE,
+            'max_overflow': settings.DATABASE_MAX_OVERFLOW,
+        }
+    return create_async_engine(
+        url,
+        echo=settings.DATABASE_ECHO,
+        future=True,
+        connect_args=connect_args,
+        **pool_args,
+    )
+
+def _create_sessionmaker(engine: AsyncEngine) -> async_sessionmaker[AsyncSession]:
+    return async_sessionmaker(
+        bind=engine,
+        class_=AsyncSession,
+        expire_on_commit=False,
+    )
+
+@lru_cache
+def get_engine() -> AsyncEngine:
+    return _create_engine(settings.DATABASE_URL)
+
+@lru_cache
+def get_sessionmaker() -> async_sessionmaker[AsyncSession]:
+    return _create_sessionmaker(get_engine())
+
+
+class ReplicaRouter:
+    """
+    Hands out read replicas round-robin. A replica that fails to connect is
+    ejected for `eject_seconds` and then retried.
+    """
+
+    def __init__(self, sessionmakers: list[async_sessionmaker[AsyncSession]], eject_seconds: float):
+        self.sessionmakers = sessionmakers
+        self.eject_seconds = eject_seconds
+        self._ejected_until = [0.0] * len(sessionmakers)
+        self._counter = itertools.count()
+
+    def candidates(self) -> list[int]:
+        """
+        Healthy replica indexes, starting at the next one in rotation.
+        """
+        if not self.sessionmakers:
+            return []
+        now = time.monotonic()
+        start = next(self._counter) % len(self.sessionmakers)
+        order = self._rotate(start)
+        return [i for i in order if self._ejected_until[i] <= now]
+
+    def eject(self, index: int) -> None:
+        self._ejected_until[index] = time.monotonic() + self.eject_seconds
+        logger.warning("Ejected read replica", extra={"replica": index, "seconds": self.eject_seconds})
+
+    def _rotate(self, start: int) -> list[int]:
+        count = len(self.sessionmakers)
+        return [(start + offset) % count for offset in range(count)]
+
+
+@lru_cache
+def get_replica_router() -> ReplicaRouter:
+    return ReplicaRouter(
+        [_create_sessionmaker(_create_engine(url)) for url in settings.DATABASE_REPLICA_URLS],
+        eject_seconds=settings.REPLICA_EJECT_SECONDS,
+    )
+
+
+async def dispose_engine() -> None:
+    """
+    Closes pooled connections of every engine that was ever created.
+    """
+    if get_engine.cache_info().currsize:
+        await get_engine().dispose()
+    if get_replica_router.cache_info().currsize:
+        for sessionmaker in get_replica_router().sessionmakers:
+            await sessionmaker.kw["bind"].dispose()
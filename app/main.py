@@ -8,17 +8,29 @@ import logging
 from app.api.endpoints.auth import auth_router
 from app.api.endpoints.users import router as users_router
 from app.api.endpoints.admin import router as admin_router
+from app.core.config import settings
+from app.core.lifespan import lifespan
 from app.core.limiter import limiter
+from app.core.logging_config import setup_logging
+from app.core.profiler import ProfilerMiddleware, profiler
+from app.core.readiness import readiness
+from app.core.security import get_public_jwk
+from app.core.timing import TimedJSONResponse, TimingMiddleware
 
-# Configure logging
-logging.basicConfig(level=logging.INFO)
+# Configure logging (JSON lines, written from a background thread)
+setup_logging(settings.LOG_LEVEL)
 logger = logging.getLogger(__name__)
 
-app = FastAPI()
+app = FastAPI(lifespan=lifespan, default_response_class=TimedJSONResponse)
 
 @app.exception_handler(Exception)
 async def global_exception_handler(request: Request, exc: Exception):
-    logger.error(f"Global exception occurred: {exc}", exc_info=True)
+    logger.error(
+        "Global exception occurred: %s",
+        exc,
+        exc_info=True,
+        extra={"method": request.method, "path": request.url.path},
+    )
     return JSONResponse(
         status_code=500,
         content={"detail": "Internal Server Error. Please try again later."},
@@ -39,6 +51,13 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Server-Timing header and one access log line per request
+app.add_middleware(TimingMiddleware)
+
+# Opt-in sampling profiler; when disabled the middleware is not installed at all
+if profiler.enabled:
+    app.add_middleware(ProfilerMiddleware, profiler=profiler)
+
 app.state.limiter = limiter
 app.add_exception_handler(RateLimitExceeded, _rate_limit_exceeded_handler) # type: ignore
 
@@ -55,3 +74,21 @@ async def read_root():
 @app.get("/health")
 async def health_check():
     return {"status": "healthy"}
+
+@app.get("/ready")
+async def readiness_check():
+    # Served from the background checker's cached result; never hits the DB
+    report = readiness.report()
+    if report["status"] != "ready":
+        return JSONResponse(status_code=503, content=report)
+    return report
+
+@app.get("/.well-known/jwks.json")
+async def jwks():
+    """
+    Public signing keys for in-process verification (see app.verifier).
+    """
+    return JSONResponse(
+        content={"keys": [get_public_jwk()]},
+        headers={"Cache-Control": "public, max-age=300"},
+    )
@@ -0,0 +1,40 @@
+import uuid
+from datetime import datetime, timezone
+from sqlalchemy import String, Boolean, DateTime
+from sqlalchemy.orm import Mapped, mapped_column
+from sqlalchemy.dialects.postgresql import UUID
+from app.database.base import Base
+
+class ServiceAccount(Base):
+    """
+    Machine client authenticating with the OAuth2 client_credentials grant.
+    """
+    __tablename__ = "service_accounts"
+
+    id: Mapped[uuid.UUID] = mapped_column(
+        UUID(as_uuid=True),
+        primary_key=True,
+        default=uuid.uuid4,
+        nullable=False
+    )
+
+    client_id: Mapped[str] = mapped_column(
+        String,
+        unique=True,
+        index=True,
+        nullable=False
+    )
+
+    # HMAC-SHA256 of the (high-entropy, generated) client secret
+    hashed_secret: Mapped[str] = mapped_column(String, nullable=False)
+
+    name: Mapped[str] = mapped_column(String, nullable=False)
+    is_active: Mapped[bool] = mapped_column(Boolean, default=True)
+
+    created_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True),
+        default=lambda: datetime.now(timezone.utc)
+    )
+
+    def __repr__(self):
+        return f"<ServiceAccount client_id={self.client_id} name={self.name}>"
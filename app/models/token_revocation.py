@@ -0,0 +1,17 @@
+from sqlalchemy import BigInteger, String
+from sqlalchemy.orm import Mapped, mapped_column
+from app.database.base import Base
+
+class TokenRevocation(Base):
+    """
+    Tokens of `sub` issued before `issued_before` (unix seconds) must be
+    rejected. Published to downstream verifiers through /auth/revocations.
+    """
+    __tablename__ = "token_revocations"
+
+    # A user UUID, or client:<client_id> for service accounts
+    sub: Mapped[str] = mapped_column(String, primary_key=True)
+    issued_before: Mapped[int] = mapped_column(BigInteger, nullable=False, index=True)
+
+    def __repr__(self):
+        return f"<TokenRevocation sub={self.sub} issued_before={self.issued_before}>"
@@ -1,25 +1,44 @@
 import uuid
 from datetime import datetime, timezone
-from sqlalchemy import String, Boolean, DateTime, Enum as SQLEnum
+from sqlalchemy import Index, String, Boolean, DateTime, Enum as SQLEnum, func, text
 from sqlalchemy.orm import Mapped, mapped_column
 from sqlalchemy.dialects.postgresql import UUID
 from app.database.base import Base
 
 class User(Base):
     __tablename__ = "users"
+    __table_args__ = (
+        # All email lookups compare lower(email), so uniqueness is
+        # case-insensitive and the lookups can use this index
+        Index("ix_users_email_lower", func.lower(text("email")), unique=True),
+        # Covers the active-user lookups of token introspection (index-only
+        # scan on PostgreSQL)
+        Index(
+            "ix_users_active_id", "id",
+            postgresql_include=["email"],
+            postgresql_where=text("is_active"),
+            sqlite_where=text("is_active = 1"),
+        ),
+        # Trigram indexes behind the admin search (pg_trgm, PostgreSQL only)
+        Index(
+            "ix_users_email_trgm", "email",
+            postgresql_using="gin", postgresql_ops={"email": "gin_trgm_ops"},
+        ).ddl_if(dialect="postgresql"),
+        Index(
+            "ix_users_full_name_trgm", "full_name",
+            postgresql_using="gin", postgresql_ops={"full_name": "gin_trgm_ops"},
+        ).ddl_if(dialect="postgresql"),
+    )
     
     id: Mapped[uuid.UUID] = mapped_column(
         UUID(as_uuid=True), 
         primary_key=True, 
         default=uuid.uuid4,
-        index=True,
         nullable=False
     )
     
     email: Mapped[str] = mapped_column(
         String, 
-        unique=True, 
-        index=True, 
         nullable=False
     )
 
@@ -32,7 +51,7 @@ class User(Base):
 
     full_name: Mapped[str | None] = mapped_column(String, nullable=True)
     avatar_url: Mapped[str | None] = mapped_column(String, nullable=True)
-    email_verified: Mapped[bool] = mapped_column(Boolean, default=False, index=True) #TODO:need to setup email verification
+    email_verified: Mapped[bool] = mapped_column(Boolean, default=False)  # Set by /auth/verify-email
     last_login_at: Mapped[datetime | None] = mapped_column(DateTime(timezone=True), nullable=True)
 
     hashed_refresh_token: Mapped[str | None] = mapped_column(String, nullable=True)
@@ -0,0 +1,18 @@
+from sqlalchemy import BigInteger, String
+from sqlalchemy.orm import Mapped, mapped_column
+from app.database.base import Base
+
+class UserStat(Base):
+    """
+    One counter of the admin dashboard statistics, e.g. ("tier", "pro") or
+    ("signups", "2026-10-19"). Kept up to date in the same transactions that
+    change users, and recomputed from `users` periodically.
+    """
+    __tablename__ = "user_stats"
+
+    metric: Mapped[str] = mapped_column(String, primary_key=True)
+    key: Mapped[str] = mapped_column(String, primary_key=True, default="")
+    value: Mapped[int] = mapped_column(BigInteger, nullable=False, default=0)
+
+    def __repr__(self):
+        return f"<UserStat {self.metric}:{self.key}={self.value}>"
@@ -0,0 +1,62 @@
+import time
+
+from sqlalchemy import delete, select
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.models.token_revocation import TokenRevocation
+
+# Extra time a revocation stays published after the tokens it covers expire,
+# for verifiers that accept slightly expired tokens (clock-skew leeway)
+_LEEWAY_SECONDS = 300
+
+
+def revocation_window() -> int:
+    """
+    Seconds a revocation matters: after that every token it covers has expired.
+    """
+    return settings.ACCESS_TOKEN_EXPIRE_MINUTES * 60 + _LEEWAY_SECONDS
+
+
+async def revoke_tokens(db: AsyncSession, sub: str) -> None:
+    """
+    Revoke every token of `sub` issued so far, inside the caller's
+    transaction. Tokens issued within the same second stay valid, so a
+    login right after a password change is not caught by its own revocation.
+    """
+    now = int(time.time())
+    insert = postgresql.insert if db.bind.dialect.name == "postgresql" else sqlite.insert
+    stmt = insert(TokenRevocation).values(sub=sub, issued_before=now)
+    stmt = stmt.on_conflict_do_update(
+        index_elements=[TokenRevocation.sub],
+        set_={"issued_before": stmt.excluded.issued_before},
+    )
+    await db.execute(stmt)
+    # Revocations are rare; pruning here keeps the published list small
+    await db.execute(
+        delete(TokenRevocation).where(TokenRevocation.issued_before < now - revocation_window())
+    )
+
+
+async def get_revocations(db: AsyncSession) -> dict[str, int]:
+    """
+    Revocations that can still affect an unexpired token, as {sub: issued_before}.
+    """
+    since = int(time.time()) - revocation_window()
+    result = await db.execute(
+        select(TokenRevocation.sub, TokenRevocation.issued_before)
+        .where(TokenRevocation.issued_before >= since)
+    )
+    return {sub: issued_before for sub, issued_before in result.all()}
+
+
+async def get_revocation_cutoffs(db: AsyncSession, subs: set[str]) -> dict[str, int]:
+    """
+    issued_before for those of `subs` that have a revocation, in one query.
+    """
+    result = await db.execute(
+        select(TokenRevocation.sub, TokenRevocation.issued_before)
+        .where(TokenRevocation.sub.in_(subs))
+    )
+    return {sub: issued_before for sub, issued_before in result.all()}
@@ -0,0 +1,145 @@
+import uuid
+from typing import Collection, Sequence
+
+from sqlalchemy import Float, and_, case, cast, func, lambda_stmt, literal, or_, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.ext.compiler import compiles
+from sqlalchemy.sql.lambdas import StatementLambdaElement
+from sqlalchemy.sql.functions import FunctionElement
+
+from app.models.user import User
+
+# The hot user lookups, built as lambda statements: the lambda's code
+# location is the cache key, so the SELECT is constructed and compiled once
+# per process and later calls only bind new parameter values. On asyncpg the
+# rendered SQL string then also hits the per-connection prepared statement
+# cache (see `_create_engine`).
+
+
+def _user_by_id(user_id: uuid.UUID) -> StatementLambdaElement:
+    return lambda_stmt(lambda: select(User).where(User.id == user_id))
+
+
+def _user_by_email(email: str) -> StatementLambdaElement:
+    return lambda_stmt(lambda: select(User).where(func.lower(User.email) == email))
+
+
+def _active_user_emails(ids: list[uuid.UUID]) -> StatementLambdaElement:
+    return lambda_stmt(
+        lambda: select(User.id, User.email).where(User.id.in_(ids), User.is_active == True)  # noqa: E712
+    )
+
+
+def _users_page(skip: int, limit: int) -> StatementLambdaElement:
+    return lambda_stmt(lambda: select(User).offset(skip).limit(limit))
+
+
+def warm_statements() -> None:
+    """
+    Build every cached statement once, so the lambda analysis is done
+    before the server forks its workers and is shared by all of them.
+    """
+    placeholder = uuid.UUID(int=0)
+    for stmt in (
+        _user_by_id(placeholder),
+        _user_by_email(""),
+        _active_user_emails([placeholder]),
+        _users_page(0, 1),
+    ):
+        stmt._generate_cache_key()
+
+
+async def get_user_by_id(db: AsyncSession, user_id: uuid.UUID) -> User | None:
+    result = await db.execute(_user_by_id(user_id))
+    return result.scalars().one_or_none()
+
+
+async def get_user_by_email(db: AsyncSession, email: str) -> User | None:
+    """
+    Case-insensitive; served by the unique `lower(email)` index.
+    """
+    result = await db.execute(_user_by_email(email.lower()))
+    return result.scalars().one_or_none()
+
+
+async def get_active_user_emails(db: AsyncSession, user_ids: Collection[uuid.UUID]) -> dict[uuid.UUID, str]:
+    """
+    Emails of the given users that are active. Reads only the partial
+    `ix_users_active_id` index on PostgreSQL.
+    """
+    result = await db.execute(_active_user_emails(list(user_ids)))
+    return {user_id: email for user_id, email in result.all()}
+
+
+async def list_users(db: AsyncSession, skip: int, limit: int) -> Sequence[User]:
+    result = await db.execute(_users_page(skip, limit))
+    return result.scalars().all()
+
+
+class _similarity(FunctionElement):
+    """
+    Best pg_trgm `similarity()` of the search term against any of the given
+    columns. SQLite (tests) gets a rough stand-in: the share of a column
+    covered by the term when the term occurs in it.
+    """
+    type = Float()
+    inherit_cache = True
+
+
+@compiles(_similarity, "postgresql")
+def _similarity_postgresql(element, compiler, **kw):
+    term, *columns = element.clauses
+    scores = [func.similarity(column, term) for column in columns]
+    return compiler.process(func.greatest(*scores), **kw)
+
+
+@compiles(_similarity, "sqlite")
+def _similarity_sqlite(element, compiler, **kw):
+    term, *columns = element.clauses
+    scores = [
+        case(
+            (func.instr(func.lower(column), func.lower(term)) > 0,
+             cast(func.length(term), Float) / func.length(column)),
+            else_=0.0,
+        )
+        for column in columns
+    ]
+    return compiler.process(func.max(*scores), **kw)
+
+
+def _search_rank(q: str):
+    """
+    Exact email match first, then email prefixes, then by trigram similarity
+    of email or name.
+    """
+    boost = case(
+        (func.lower(User.email) == q.lower(), 2.0),
+        (User.email.istartswith(q, autoescape=True), 1.0),
+        else_=0.0,
+    )
+    return cast(boost, Float) + _similarity(literal(q), User.email, func.coalesce(User.full_name, ""))
+
+
+async def search_users(
+    db: AsyncSession,
+    q: str,
+    limit: int,
+    after: tuple[float, uuid.UUID] | None = None,
+) -> list[tuple[User, float]]:
+    """
+    Users whose email or name contains `q`, best match first, with their
+    rank. The substring filter is what the trigram GIN indexes serve; pass
+    the last (rank, id) of a page as `after` to get the next one.
+    """
+    rank = _search_rank(q)
+    stmt = (
+        select(User, rank.label("rank"))
+        .where(or_(User.email.icontains(q, autoescape=True), User.full_name.icontains(q, autoescape=True)))
+        .order_by(rank.desc(), User.id)
+        .limit(limit)
+    )
+    if after is not None:
+        after_rank, after_id = after
+        stmt = stmt.where(or_(rank < after_rank, and_(rank == after_rank, User.id > after_id)))
+    result = await db.execute(stmt)
+    return [(user, user_rank) for user, user_rank in result.all()]
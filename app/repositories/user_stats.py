@@ -0,0 +1,141 @@
+from collections import Counter
+from datetime import date, datetime, timezone
+
+from sqlalchemy import delete, func, select, text
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.user import User
+from app.models.user_stat import UserStat
+
+StatKey = tuple[str, str]
+
+# Advisory lock key of the periodic reconciler; any constant unique to this app
+_RECONCILE_LOCK_KEY = 0x75736572
+
+
+def user_stat_keys(user: User) -> Counter[StatKey]:
+    """
+    The counters one user contributes to. Diff the result from before and
+    after a change to get the deltas for `apply_stat_changes`.
+    """
+    created = user.created_at or datetime.now(timezone.utc)
+    return Counter({
+        ("users", ""): 1,
+        ("active" if user.is_active else "inactive", ""): 1,
+        ("verified" if user.email_verified else "unverified", ""): 1,
+        ("tier", user.tier or "free"): 1,
+        ("signups", created.astimezone(timezone.utc).date().isoformat()): 1,
+    })
+
+
+def _insert(db: AsyncSession):
+    return postgresql.insert if db.bind.dialect.name == "postgresql" else sqlite.insert
+
+
+async def apply_stat_changes(
+    db: AsyncSession,
+    before: Counter[StatKey],
+    after: Counter[StatKey],
+) -> None:
+    """
+    Add `after - before` to the counters inside the caller's transaction, so
+    they commit or roll back together with the user change. Call it after
+    the user row has been added or changed (autoflush writes the row first).
+    """
+    deltas = Counter(after)
+    deltas.subtract(before)
+    # Sorted, so concurrent transactions lock counter rows in the same order
+    rows = [
+        {"metric": metric, "key": key, "value": delta}
+        for (metric, key), delta in sorted(deltas.items())
+        if delta
+    ]
+    if not rows:
+        return
+    insert = _insert(db)
+    stmt = insert(UserStat).values(rows)
+    stmt = stmt.on_conflict_do_update(
+        index_elements=[UserStat.metric, UserStat.key],
+        set_={"value": UserStat.value + stmt.excluded.value},
+    )
+    await db.execute(stmt)
+
+
+async def get_user_stats(db: AsyncSession, signups_since: date) -> list[UserStat]:
+    """
+    All counters except signups before `signups_since`. Reads a handful of
+    rows regardless of how many users there are.
+    """
+    result = await db.execute(
+        select(UserStat).where(
+            (UserStat.metric != "signups") | (UserStat.key >= signups_since.isoformat())
+        )
+    )
+    return list(result.scalars().all())
+
+
+async def try_claim_reconcile(db: AsyncSession) -> bool:
+    """
+    Elect one periodic reconciler across workers and hosts: on PostgreSQL a
+    transaction-level advisory lock, held until the recount commits. False
+    when another session already holds it. SQLite has no advisory locks.
+    """
+    if db.bind.dialect.name != "postgresql":
+        return True
+    return bool(await db.scalar(
+        text("SELECT pg_try_advisory_xact_lock(:key)"), {"key": _RECONCILE_LOCK_KEY}
+    ))
+
+
+async def reconcile_user_stats(db: AsyncSession) -> int:
+    """
+    Recompute every counter from `users` and replace the stored ones. Full
+    table scan; meant for the periodic reconciler, not for requests. Returns
+    the number of counters that had drifted.
+    """
+    if db.bind.dialect.name == "postgresql":
+        # Blocks counter updates (which follow the user write in the same
+        # transaction) until the recount commits, so none are lost or doubled
+        await db.execute(text("LOCK TABLE user_stats IN EXCLUSIVE MODE"))
+
+    actual: Counter[StatKey] = Counter()
+    total = await db.scalar(select(func.count()).select_from(User))
+    actual[("users", "")] = total or 0
+    for column, when_true, when_false in (
+        (User.is_active, "active", "inactive"),
+        (User.email_verified, "verified", "unverified"),
+    ):
+        result = await db.execute(select(column, func.count()).group_by(column))
+        for flag, count in result.all():
+            actual[(when_true if flag else when_false, "")] += count
+    result = await db.execute(select(User.tier, func.count()).group_by(User.tier))
+    for tier, count in result.all():
+        actual[("tier", tier)] += count
+    if db.bind.dialect.name == "postgresql":
+        signup_day = func.date(func.timezone("UTC", User.created_at))
+    else:
+        # SQLite stores the UTC timestamp as text
+        signup_day = func.date(User.created_at)
+    result = await db.execute(select(signup_day, func.count()).group_by(signup_day))
+    for day, count in result.all():
+        if day is not None:
+            actual[("signups", str(day))] += count
+
+    result = await db.execute(select(UserStat))
+    stored = {(stat.metric, stat.key): stat.value for stat in result.scalars().all()}
+    drifted = sum(
+        1 for stat_key in stored.keys() | actual.keys()
+        if stored.get(stat_key, 0) != actual.get(stat_key, 0)
+    )
+
+    await db.execute(delete(UserStat))
+    if actual:
+        await db.execute(
+            _insert(db)(UserStat).values([
+                {"metric": metric, "key": key, "value": value}
+                for (metric, key), value in sorted(actual.items())
+            ])
+        )
+    await db.commit()
+    return drifted
@@ -0,0 +1,24 @@
+import uuid
+from datetime import datetime
+from pydantic import BaseModel, ConfigDict, Field
+
+class ServiceAccountCreate(BaseModel):
+    name: str = Field(..., min_length=1)
+
+class ServiceAccountResponse(BaseModel):
+    id: uuid.UUID
+    client_id: str
+    name: str
+    is_active: bool
+    created_at: datetime
+
+    model_config = ConfigDict(from_attributes=True)
+
+# Returned once, on creation; the secret is not stored in plain text
+class ServiceAccountCreated(ServiceAccountResponse):
+    client_secret: str
+
+class ClientCredentialsToken(BaseModel):
+    access_token: str
+    token_type: str
+    expires_in: int
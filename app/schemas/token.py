@@ -1,4 +1,4 @@
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
 
 # Schema for the response body of the login endpoint
 class Token(BaseModel):
@@ -12,4 +12,27 @@ class TokenPayload(BaseModel):
     tier: str | None = None
     
 class RefreshTokenRequest(BaseModel):
-    refresh_token: str
\ No newline at end of file
+    refresh_token: str
+
+class EmailVerificationRequest(BaseModel):
+    token: str
+
+# Batch introspection (RFC 7662 style) for internal services
+class IntrospectionRequest(BaseModel):
+    tokens: list[str] = Field(..., min_length=1, max_length=100)
+
+class IntrospectionResult(BaseModel):
+    active: bool
+    sub: str | None = None
+    username: str | None = None
+    tier: str | None = None
+    token_type: str | None = None
+    exp: int | None = None
+    iat: int | None = None
+
+class IntrospectionResponse(BaseModel):
+    results: list[IntrospectionResult]
+
+# Published to downstream verifiers (app.verifier.RevocationFeed)
+class RevocationListResponse(BaseModel):
+    revoked: dict[str, int]
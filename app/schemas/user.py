@@ -1,5 +1,5 @@
 import uuid
-from datetime import datetime
+from datetime import date, datetime
 from pydantic import BaseModel, EmailStr, ConfigDict, Field
 from typing import Optional
 
@@ -38,6 +38,19 @@ class UserResponse(UserBase):
     
     model_config = ConfigDict(from_attributes=True)
 
+class UserSearchResponse(BaseModel):
+    items: list[UserResponse]
+    next_cursor: str | None = None
+
+class UserStatsResponse(BaseModel):
+    total: int = 0
+    active: int = 0
+    inactive: int = 0
+    verified: int = 0
+    unverified: int = 0
+    by_tier: dict[str, int] = {}
+    signups_per_day: dict[date, int] = {}
+
 class UserAdminUpdate(BaseModel):
     email: EmailStr | None = None
     is_active: bool | None = None
@@ -0,0 +1,245 @@
+"""
+Production launcher: a small pre-fork supervisor around uvicorn.
+
+    python -m app.server [--workers N] [--host 0.0.0.0] [--port 8000]
+
+The parent binds the listening socket, imports the app and preloads shared
+immutable state (parsed keys, the Argon2 backend, mapper configuration,
+cached statement analysis, the OpenAPI schema), then forks the workers, so
+that work is done once and its memory pages are shared copy-on-write.
+Workers run uvicorn on uvloop and httptools when available. Nothing that
+owns sockets, threads or an event loop (DB engines, the mail queue, the
+readiness checker) is created before the fork; each worker's lifespan sets
+those up and tears them down.
+
+On SIGTERM or SIGINT the parent forwards SIGTERM to every worker. Uvicorn
+then stops accepting, lets in-flight requests finish for up to
+GRACEFUL_SHUTDOWN_SECONDS and runs the lifespan shutdown, which flushes the
+mail queue and disposes the engines. Workers still alive after that are
+killed. A worker that dies on its own is replaced.
+"""
+import argparse
+import logging
+import math
+import os
+import signal
+import socket
+import sys
+import time
+from pathlib import Path
+
+from app.core.config import settings
+from app.core.logging_config import stop_logging
+
+logger = logging.getLogger("app.server")
+
+# Private memory of one forked worker on top of the shared preloaded pages
+_WORKER_OVERHEAD_BYTES = 96 * 1024 * 1024
+
+# Extra time on top of the graceful window for lifespan shutdown to finish
+_SHUTDOWN_MARGIN_SECONDS = 5.0
+
+
+def available_cores() -> int:
+    """
+    CPUs this process may actually use: the cgroup v2 CPU quota when the
+    container has one, otherwise the scheduler affinity mask.
+    """
+    try:
+        quota, period = Path("/sys/fs/cgroup/cpu.max").read_text().split()
+        if quota != "max":
+            return max(1, math.ceil(int(quota) / int(period)))
+    except (OSError, ValueError):
+        pass
+    try:
+        return len(os.sched_getaffinity(0))
+    except AttributeError:
+        return os.cpu_count() or 1
+
+
+def memory_limit() -> int | None:
+    try:
+        value = Path("/sys/fs/cgroup/memory.max").read_text().strip()
+    except OSError:
+        return None
+    return None if value == "max" else int(value)
+
+
+def default_workers(cores: int, argon2_memory_bytes: int, memory_bytes: int | None) -> int:
+    """
+    One worker per core. Argon2 runs on each worker's event loop thread, so
+    a worker hashes one password at a time and the workers together form
+    the hashing pool: more workers than cores only adds contention, fewer
+    leaves cores idle during login bursts. Each worker may hold one
+    Argon2 buffer (`memory_cost`) at a time, so the count is also capped
+    to what fits in the container's memory limit.
+    """
+    workers = cores
+    if memory_bytes is not None:
+        per_worker = _WORKER_OVERHEAD_BYTES + argon2_memory_bytes
+        workers = min(workers, memory_bytes // per_worker)
+    return max(1, workers)
+
+
+def preload() -> object:
+    """
+    Import the app and build the state every worker would otherwise build
+    on its own. Must not create engines, tasks, threads or event loops.
+    """
+    from sqlalchemy.orm import configure_mappers
+
+    from app.core.security import get_private_key, get_public_jwk, get_pwd_context, get_token_verifier
+    from app.main import app
+    from app.repositories.user import warm_statements
+
+    get_private_key()
+    get_token_verifier()  # Parses the public key
+    get_public_jwk()
+    get_pwd_context().hash("preload")  # Imports passlib and loads the argon2 backend
+    configure_mappers()
+    warm_statements()
+    app.openapi()
+    return app
+
+
+def _bind(host: str, port: int, backlog: int) -> socket.socket:
+    family = socket.AF_INET6 if ":" in host else socket.AF_INET
+    sock = socket.socket(family, socket.SOCK_STREAM)
+    sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+    sock.bind((host, port))
+    sock.listen(backlog)
+    sock.set_inheritable(True)
+    return sock
+
+
+def _serve(app: object, sock: socket.socket, graceful_timeout: float) -> None:
+    import uvicorn
+
+    config = uvicorn.Config(
+        app,
+        loop="auto",  # uvloop when installed
+        http="auto",  # httptools when installed
+        lifespan="on",
+        timeout_graceful_shutdown=graceful_timeout,
+        log_config=None,  # Logging is already routed through app.core.logging_config
+        access_log=False,  # TimingMiddleware writes the access log
+        server_header=False,
+    )
+    uvicorn.Server(config).run(sockets=[sock])
+
+
+class Supervisor:
+    """
+    Forks `workers` copies of the preloaded app onto one shared socket and
+    keeps that many running until told to stop.
+    """
+
+    def __init__(self, app: object, sock: socket.socket, workers: int, graceful_timeout: float) -> None:
+        self.app = app
+        self.sock = sock
+        self.workers = workers
+        self.graceful_timeout = graceful_timeout
+        self.children: set[int] = set()
+        self.stopping = False
+
+    def spawn(self) -> None:
+        pid = os.fork()
+        if pid == 0:
+            code = 0
+            try:
+                signal.signal(signal.SIGTERM, signal.SIG_DFL)
+                signal.signal(signal.SIGINT, signal.SIG_DFL)
+                _serve(self.app, self.sock, self.graceful_timeout)
+            except BaseException:
+                logger.exception("Worker crashed")
+                code = 1
+            finally:
+                stop_logging()
+                logging.shutdown()
+            os._exit(code)
+        self.children.add(pid)
+
+    def _stop(self, signum: int, frame: object) -> None:
+        if not self.stopping:
+            logger.info("Shutting down workers", extra={"signal": signal.Signals(signum).name})
+        self.stopping = True
+
+    def _reap(self) -> list[int]:
+        exited = []
+        while self.children:
+            try:
+                pid, status = os.waitpid(-1, os.WNOHANG)
+            except ChildProcessError:
+                self.children.clear()
+                break
+            if pid == 0:
+                break
+            self.children.discard(pid)
+            exited.append(os.waitstatus_to_exitcode(status))
+        return exited
+
+    def run(self) -> int:
+        signal.signal(signal.SIGTERM, self._stop)
+        signal.signal(signal.SIGINT, self._stop)
+        for _ in range(self.workers):
+            self.spawn()
+        logger.info("Workers started", extra={"workers": self.workers, "pids": sorted(self.children)})
+
+        while not self.stopping:
+            for code in self._reap():
+                if not self.stopping:
+                    logger.error("Worker exited unexpectedly, replacing it", extra={"exit_code": code})
+                    time.sleep(1)  # Do not spin if workers die at startup
+                    self.spawn()
+            time.sleep(0.2)
+
+        for pid in self.children:
+            try:
+                os.kill(pid, signal.SIGTERM)
+            except ProcessLookupError:
+                pass
+        deadline = time.monotonic() + self.graceful_timeout + _SHUTDOWN_MARGIN_SECONDS
+        while self.children and time.monotonic() < deadline:
+            self._reap()
+            time.sleep(0.1)
+        for pid in self.children:
+            logger.warning("Worker did not stop in time, killing it", extra={"pid": pid})
+            try:
+                os.kill(pid, signal.SIGKILL)
+            except ProcessLookupError:
+                pass
+        while self.children:
+            self._reap()
+            time.sleep(0.05)
+        self.sock.close()
+        logger.info("All workers stopped")
+        return 0
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.strip().split("\n")[0])
+    parser.add_argument("--host", default=settings.SERVER_HOST)
+    parser.add_argument("--port", type=int, default=settings.SERVER_PORT)
+    parser.add_argument("--workers", type=int, default=settings.WEB_CONCURRENCY,
+                        help="worker processes (0: one per available core, capped by memory)")
+    parser.add_argument("--backlog", type=int, default=settings.SERVER_BACKLOG)
+    parser.add_argument("--graceful-timeout", type=float, default=settings.GRACEFUL_SHUTDOWN_SECONDS)
+    args = parser.parse_args(argv)
+
+    sock = _bind(args.host, args.port, args.backlog)
+    app = preload()
+
+    workers = args.workers
+    if workers <= 0:
+        from app.core.security import get_pwd_context
+        argon2_kib = get_pwd_context().handler().memory_cost
+        workers = default_workers(available_cores(), argon2_kib * 1024, memory_limit())
+    logger.info(
+        "Listening",
+        extra={"host": args.host, "port": args.port, "workers": workers},
+    )
+    return Supervisor(app, sock, workers, args.graceful_timeout).run()
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,34 @@
+"""
+In-process verification of tokens issued by the auth service.
+
+Downstream services verify tokens locally against a cached copy of the
+service's JWKS (`/.well-known/jwks.json`) instead of calling back:
+
+    from app.verifier import JWKSCache, TokenVerifier, VerifiedToken
+
+    keys = JWKSCache("https://auth.internal/.well-known/jwks.json")
+    verifier = TokenVerifier(keys, leeway=10)
+    verify_token = VerifiedToken(verifier)
+
+    # in the app's lifespan
+    await keys.start()
+
+This package only depends on PyJWT, httpx and FastAPI; it does not import
+the auth service's settings.
+"""
+from app.verifier.dependencies import VerifiedToken
+from app.verifier.keys import JWKSCache, KeySet, StaticKeys, public_jwk
+from app.verifier.revocation import RevocationFeed, RevocationList
+from app.verifier.verifier import TokenVerificationError, TokenVerifier
+
+__all__ = [
+    "JWKSCache",
+    "KeySet",
+    "RevocationFeed",
+    "RevocationList",
+    "StaticKeys",
+    "TokenVerificationError",
+    "TokenVerifier",
+    "VerifiedToken",
+    "public_jwk",
+]
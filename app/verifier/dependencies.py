@@ -0,0 +1,42 @@
+from typing import Any
+
+from fastapi import HTTPException, Request, status
+from fastapi.security import HTTPBearer
+
+from app.verifier.verifier import TokenVerificationError, TokenVerifier
+
+
+class VerifiedToken:
+    """
+    FastAPI dependency that verifies the bearer token with `verifier` and
+    returns its claims:
+
+        verify_token = VerifiedToken(verifier)
+
+        @app.get("/orders")
+        async def orders(claims: dict = Depends(verify_token)): ...
+
+    Refresh tokens are rejected; only access tokens authorize requests.
+    """
+
+    def __init__(self, verifier: TokenVerifier, auto_error: bool = True) -> None:
+        self.verifier = verifier
+        self.bearer = HTTPBearer(auto_error=auto_error)
+
+    async def __call__(self, request: Request) -> dict[str, Any] | None:
+        credentials = await self.bearer(request)
+        if credentials is None:
+            return None
+        try:
+            claims = self.verifier.verify(credentials.credentials)
+        except TokenVerificationError:
+            raise HTTPException(
+                status_code=status.HTTP_403_FORBIDDEN,
+                detail="Could not validate credentials",
+            )
+        if claims.get("type", "access") != "access":
+            raise HTTPException(
+                status_code=status.HTTP_403_FORBIDDEN,
+                detail="Could not validate credentials",
+            )
+        return claims
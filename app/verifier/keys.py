@@ -0,0 +1,142 @@
+import asyncio
+import base64
+import hashlib
+import json
+import logging
+from typing import TYPE_CHECKING, Any, Protocol
+
+import jwt
+
+if TYPE_CHECKING:
+    import httpx
+
+logger = logging.getLogger(__name__)
+
+
+class KeySet(Protocol):
+    def get(self, kid: str | None) -> Any | None:
+        """
+        Return the verification key for `kid`, or None if unknown.
+        """
+        ...
+
+
+# Members that make up the RFC 7638 thumbprint, per key type
+_THUMBPRINT_MEMBERS = {
+    "OKP": ("crv", "kty", "x"),
+    "EC": ("crv", "kty", "x", "y"),
+    "RSA": ("e", "kty", "n"),
+}
+
+
+def public_jwk(public_key: Any, algorithm: str = "EdDSA") -> dict[str, Any]:
+    """
+    Public key as a JWK, with its RFC 7638 thumbprint as `kid`.
+    """
+    jwk = json.loads(jwt.get_algorithm_by_name(algorithm).to_jwk(public_key))
+    canonical = json.dumps(
+        {member: jwk[member] for member in _THUMBPRINT_MEMBERS[jwk["kty"]]},
+        separators=(",", ":"),
+        sort_keys=True,
+    )
+    digest = hashlib.sha256(canonical.encode()).digest()
+    jwk["kid"] = base64.urlsafe_b64encode(digest).rstrip(b"=").decode()
+    jwk["alg"] = algorithm
+    jwk["use"] = "sig"
+    return jwk
+
+
+def _keys_from_jwks(jwks: dict[str, Any]) -> dict[str, Any]:
+    keys = {}
+    for jwk in jwks.get("keys", []):
+        if jwk.get("use", "sig") != "sig" or "kid" not in jwk:
+            continue
+        keys[jwk["kid"]] = jwt.PyJWK(jwk).key
+    return keys
+
+
+class StaticKeys:
+    """
+    Fixed key set, e.g. the issuer's own public key.
+    """
+
+    def __init__(self, keys: dict[str, Any]) -> None:
+        self.keys = keys
+
+    def get(self, kid: str | None) -> Any | None:
+        if kid is None and len(self.keys) == 1:
+            return next(iter(self.keys.values()))
+        return self.keys.get(kid) if kid is not None else None
+
+
+class JWKSCache:
+    """
+    Local copy of the issuer's JWKS, refreshed in the background every
+    `refresh_interval` seconds. An unknown `kid` (key rotation) triggers an
+    early refresh, at most once per `min_refresh_interval`. Lookups never do
+    network I/O.
+    """
+
+    def __init__(
+        self,
+        url: str,
+        refresh_interval: float = 300.0,
+        min_refresh_interval: float = 30.0,
+        client: "httpx.AsyncClient | None" = None,
+    ) -> None:
+        self.url = url
+        self.refresh_interval = refresh_interval
+        self.min_refresh_interval = min_refresh_interval
+        self.keys: dict[str, Any] = {}
+        self._client = client
+        self._refresh_requested = asyncio.Event()
+        self._task: asyncio.Task | None = None
+
+    def get(self, kid: str | None) -> Any | None:
+        if kid is None and len(self.keys) == 1:
+            return next(iter(self.keys.values()))
+        key = self.keys.get(kid) if kid is not None else None
+        if key is None:
+            self._refresh_requested.set()
+        return key
+
+    async def refresh(self) -> None:
+        if self._client is not None:
+            response = await self._client.get(self.url)
+        else:
+            import httpx  # Only needed once a refresh actually runs
+
+            async with httpx.AsyncClient(timeout=5.0) as client:
+                response = await client.get(self.url)
+        response.raise_for_status()
+        self.keys = _keys_from_jwks(response.json())
+
+    async def run(self) -> None:
+        while True:
+            try:
+                await asyncio.wait_for(self._refresh_requested.wait(), self.refresh_interval)
+            except asyncio.TimeoutError:
+                pass
+            try:
+                await self.refresh()
+            except Exception as exc:
+                # Keep serving the last known keys
+                logger.warning("JWKS refresh failed: %s", exc)
+            self._refresh_requested.clear()
+            await asyncio.sleep(self.min_refresh_interval)
+
+    async def start(self) -> None:
+        """
+        Fetch the key set once, then keep it fresh in the background.
+        """
+        await self.refresh()
+        self._task = asyncio.create_task(self.run())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
@@ -0,0 +1,114 @@
+import asyncio
+import logging
+import time
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    import httpx
+
+logger = logging.getLogger(__name__)
+
+
+class RevocationList:
+    """
+    Subjects whose tokens issued before a given time are no longer valid
+    (deactivation, password change, logout everywhere).
+    """
+
+    def __init__(self) -> None:
+        self.revoked: dict[str, float] = {}
+
+    def revoke(self, sub: str, issued_before: float) -> None:
+        self.revoked[sub] = max(issued_before, self.revoked.get(sub, 0.0))
+
+    def is_revoked(self, claims: dict[str, Any]) -> bool:
+        cutoff = self.revoked.get(str(claims.get("sub")))
+        return cutoff is not None and claims.get("iat", 0) < cutoff
+
+
+class RevocationFeed(RevocationList):
+    """
+    RevocationList kept in sync by polling the auth service's
+    `/auth/revocations` every `interval` seconds. The feed is JSON of the
+    form `{"revoked": {"<sub>": <unix time>, ...}}`.
+
+    The endpoint only serves service accounts: pass the account's
+    `client_id`/`client_secret` and the service's `token_url`
+    (`/auth/token`), and a client_credentials token is fetched and renewed
+    as needed.
+    """
+
+    def __init__(
+        self,
+        url: str,
+        interval: float = 30.0,
+        client: "httpx.AsyncClient | None" = None,
+        client_id: str | None = None,
+        client_secret: str | None = None,
+        token_url: str | None = None,
+    ) -> None:
+        super().__init__()
+        self.url = url
+        self.interval = interval
+        self.client_id = client_id
+        self.client_secret = client_secret
+        self.token_url = token_url
+        self._client = client
+        self._task: asyncio.Task | None = None
+        self._token: str | None = None
+        self._token_expires = 0.0
+
+    async def _headers(self, client: "httpx.AsyncClient") -> dict[str, str]:
+        if self.client_id is None or self.token_url is None:
+            return {}
+        # Renew a minute early so a poll never races the expiry
+        if self._token is None or self._token_expires - 60 < time.time():
+            response = await client.post(
+                self.token_url,
+                data={"grant_type": "client_credentials"},
+                auth=(self.client_id, self.client_secret or ""),
+            )
+            response.raise_for_status()
+            grant = response.json()
+            self._token = grant["access_token"]
+            self._token_expires = time.time() + grant["expires_in"]
+        return {"Authorization": f"Bearer {self._token}"}
+
+    async def _fetch(self, client: "httpx.AsyncClient") -> None:
+        response = await client.get(self.url, headers=await self._headers(client))
+        if response.status_code == 401 and self._token is not None:
+            # Token revoked or keys rotated; get a new one and retry once
+            self._token = None
+            response = await client.get(self.url, headers=await self._headers(client))
+        response.raise_for_status()
+        self.revoked = {sub: float(ts) for sub, ts in response.json().get("revoked", {}).items()}
+
+    async def refresh(self) -> None:
+        if self._client is not None:
+            await self._fetch(self._client)
+        else:
+            import httpx  # Only needed once a refresh actually runs
+
+            async with httpx.AsyncClient(timeout=5.0) as client:
+                await self._fetch(client)
+
+    async def run(self) -> None:
+        while True:
+            await asyncio.sleep(self.interval)
+            try:
+                await self.refresh()
+            except Exception as exc:
+                logger.warning("Revocation feed refresh failed: %s", exc)
+
+    async def start(self) -> None:
+        await self.refresh()
+        self._task = asyncio.create_task(self.run())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
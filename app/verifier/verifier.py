@@ -0,0 +1,102 @@
+import copy
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Sequence
+
+import jwt
+
+from app.verifier.keys import KeySet
+from app.verifier.revocation import RevocationList
+
+
+class TokenVerificationError(jwt.InvalidTokenError):
+    """
+    Raised for any token that must not be accepted.
+    """
+
+
+class TokenVerifier:
+    """
+    Verifies tokens issued by the auth service entirely in-process.
+
+    Successfully verified tokens are kept in an LRU of `cache_size` entries,
+    so repeated requests with the same token skip the signature check; a
+    cached token is still rejected once it expires or is revoked. `leeway`
+    tolerates clock skew between issuer and verifier, in seconds.
+    """
+
+    def __init__(
+        self,
+        keys: KeySet,
+        algorithms: Sequence[str] = ("EdDSA",),
+        leeway: float = 10.0,
+        cache_size: int = 1024,
+        revocation: RevocationList | None = None,
+    ) -> None:
+        self.keys = keys
+        self.algorithms = list(algorithms)
+        self.leeway = leeway
+        self.cache_size = cache_size
+        self.revocation = revocation
+        self._cache: OrderedDict[str, dict[str, Any]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def verify(self, token: str) -> dict[str, Any]:
+        """
+        Returns the token's claims, or raises TokenVerificationError. Each
+        call gets its own copy, so callers cannot alter what the LRU holds.
+        """
+        claims = self._cached(token)
+        if claims is None:
+            claims = self._decode(token)
+            self._store(token, claims)
+
+        if self.revocation is not None and self.revocation.is_revoked(claims):
+            raise TokenVerificationError("Token has been revoked")
+        return copy.deepcopy(claims)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._cache.clear()
+
+    def _decode(self, token: str) -> dict[str, Any]:
+        try:
+            kid = jwt.get_unverified_header(token).get("kid")
+        except jwt.InvalidTokenError as exc:
+            raise TokenVerificationError(str(exc)) from exc
+
+        key = self.keys.get(kid)
+        if key is None:
+            raise TokenVerificationError(f"Unknown signing key: {kid}")
+
+        try:
+            return jwt.decode(
+                token,
+                key,
+                algorithms=self.algorithms,
+                leeway=self.leeway,
+                options={"require": ["exp", "sub"]},
+            )
+        except jwt.InvalidTokenError as exc:
+            raise TokenVerificationError(str(exc)) from exc
+
+    def _cached(self, token: str) -> dict[str, Any] | None:
+        with self._lock:
+            claims = self._cache.get(token)
+            if claims is None:
+                return None
+            if claims["exp"] + self.leeway < time.time():
+                del self._cache[token]
+                raise TokenVerificationError("Signature has expired")
+            self._cache.move_to_end(token)
+            return claims
+
+    def _store(self, token: str, claims: dict[str, Any]) -> None:
+        if self.cache_size <= 0:
+            return
+        with self._lock:
+            self._cache[token] = claims
+            self._cache.move_to_end(token)
+            while len(self._cache) > self.cache_size:
+                self._cache.popitem(last=False)
@@ -0,0 +1,127 @@
+"""
+Query overhead benchmark: compares the per-call cost of the hot user lookups
+built inline (`select(User).where(...)` per request, as before) against the
+cached lambda statements in `app.repositories.user`.
+
+    python benchmarks/queries.py [--iterations 5000]
+
+Runs against in-memory SQLite so the database round trip is as small as
+possible and the remaining time is mostly SQLAlchemy's Python work. Two
+numbers per path:
+
+- build: constructing the statement and its cache key, the part the
+  repository avoids re-doing;
+- execute: a full `AsyncSession.execute` + `scalars().one_or_none()`.
+
+On PostgreSQL the repository path additionally reuses asyncpg prepared
+statements, which this benchmark does not measure.
+"""
+import argparse
+import asyncio
+import sys
+import time
+import uuid
+from pathlib import Path
+from typing import Awaitable, Callable
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+from sqlalchemy import lambda_stmt, select  # noqa: E402
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine  # noqa: E402
+from sqlalchemy.pool import StaticPool  # noqa: E402
+
+from app.database.base import Base  # noqa: E402
+from app.models.user import User  # noqa: E402
+from app.repositories.user import get_user_by_email, get_user_by_id  # noqa: E402
+
+
+async def inline_by_email(db: AsyncSession, email: str) -> User | None:
+    result = await db.execute(select(User).where(User.email == email))
+    return result.scalars().one_or_none()
+
+
+async def inline_by_id(db: AsyncSession, user_id: uuid.UUID) -> User | None:
+    result = await db.execute(select(User).where(User.id == user_id))
+    return result.scalars().one_or_none()
+
+
+def per_call_us(fn: Callable[[], object], iterations: int) -> float:
+    start = time.perf_counter()
+    for _ in range(iterations):
+        fn()
+    return (time.perf_counter() - start) / iterations * 1e6
+
+
+async def per_call_us_async(fn: Callable[[], Awaitable[object]], iterations: int) -> float:
+    start = time.perf_counter()
+    for _ in range(iterations):
+        await fn()
+    return (time.perf_counter() - start) / iterations * 1e6
+
+
+async def run(iterations: int) -> None:
+    engine = create_async_engine("sqlite+aiosqlite:///:memory:", poolclass=StaticPool)
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    sessionmaker = async_sessionmaker(bind=engine, expire_on_commit=False)
+
+    async with sessionmaker() as db:
+        user = User(email="bench@example.com", hashed_password="x")
+        db.add(user)
+        await db.commit()
+        email, user_id = user.email, user.id
+
+        build = {
+            "login (by email)": (
+                lambda: select(User).where(User.email == email)._generate_cache_key(),
+                lambda: lambda_stmt(lambda: select(User).where(User.email == email))._generate_cache_key(),
+            ),
+            "auth check (by id)": (
+                lambda: select(User).where(User.id == user_id)._generate_cache_key(),
+                lambda: lambda_stmt(lambda: select(User).where(User.id == user_id))._generate_cache_key(),
+            ),
+        }
+        execute = {
+            "login (by email)": (
+                lambda: inline_by_email(db, email),
+                lambda: get_user_by_email(db, email),
+            ),
+            "auth check (by id)": (
+                lambda: inline_by_id(db, user_id),
+                lambda: get_user_by_id(db, user_id),
+            ),
+        }
+
+        print(f"{'path':<20} {'phase':<8} {'inline us':>10} {'cached us':>10} {'saved':>7}")
+        for name in build:
+            inline_build, cached_build = build[name]
+            inline_exec, cached_exec = execute[name]
+            # Warm both compiled caches before timing
+            for _ in range(50):
+                inline_build(), cached_build()
+                await inline_exec()
+                await cached_exec()
+            rows = [
+                ("build", per_call_us(inline_build, iterations), per_call_us(cached_build, iterations)),
+                ("execute",
+                 await per_call_us_async(inline_exec, iterations),
+                 await per_call_us_async(cached_exec, iterations)),
+            ]
+            for phase, inline_us, cached_us in rows:
+                saved = (inline_us - cached_us) / inline_us * 100
+                print(f"{name:<20} {phase:<8} {inline_us:>10.1f} {cached_us:>10.1f} {saved:>6.1f}%")
+
+    await engine.dispose()
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--iterations", type=int, default=5000)
+    args = parser.parse_args()
+    asyncio.run(run(args.iterations))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,82 @@
+"""
+Startup benchmark: measures the cost of `import app.main` in fresh
+interpreters and checks it against an import-time budget.
+
+    python benchmarks/startup.py [--runs 10] [--budget-ms 1000]
+
+Requires the same environment as the app (PRIVATE_KEY, PUBLIC_KEY, ...).
+Exits non-zero if the median import time exceeds the budget or if any
+module that should load lazily was imported eagerly.
+"""
+import argparse
+import json
+import statistics
+import subprocess
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+
+# Loaded on first use / during lifespan warm-up, never by `import app.main`
+DEFERRED_MODULES = [
+    "asyncpg",
+    "passlib.context",
+    "passlib.handlers.argon2",
+    "argon2",
+    "httpx",
+]
+
+PROBE = """
+import json, sys, time
+start = time.perf_counter()
+import app.main
+elapsed = time.perf_counter() - start
+from app.database.session import get_engine
+print(json.dumps({
+    "import_ms": elapsed * 1000,
+    "eager": [m for m in %r if m in sys.modules],
+    "engine_created": bool(get_engine.cache_info().currsize),
+}))
+""" % (DEFERRED_MODULES,)
+
+
+def probe() -> dict:
+    out = subprocess.run(
+        [sys.executable, "-c", PROBE],
+        cwd=ROOT,
+        check=True,
+        capture_output=True,
+        text=True,
+    ).stdout
+    return json.loads(out.strip().splitlines()[-1])
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--runs", type=int, default=10)
+    parser.add_argument("--budget-ms", type=float, default=1000.0)
+    args = parser.parse_args()
+
+    probe()  # Warm the bytecode cache so the runs measure imports, not compilation
+    results = [probe() for _ in range(args.runs)]
+    times = sorted(r["import_ms"] for r in results)
+    median = statistics.median(times)
+
+    print(f"import app.main over {args.runs} runs")
+    print(f"  min    {times[0]:8.1f} ms")
+    print(f"  median {median:8.1f} ms   (budget {args.budget_ms:.0f} ms)")
+    print(f"  max    {times[-1]:8.1f} ms")
+
+    failed = median > args.budget_ms
+    eager = sorted({m for r in results for m in r["eager"]})
+    if eager:
+        print(f"  eagerly imported: {', '.join(eager)}")
+        failed = True
+    if any(r["engine_created"] for r in results):
+        print("  database engine created at import")
+        failed = True
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
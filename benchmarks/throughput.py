@@ -0,0 +1,168 @@
+"""
+Throughput benchmark: the single-process default (`uvicorn app.main:app`)
+against the pre-fork launcher (`python -m app.server`) on the same machine.
+
+    python benchmarks/throughput.py [--workers N] [--duration 10] [--concurrency 32]
+
+Each server is started on a fresh SQLite file database with rate limiting
+off, one user is registered, and two paths are driven for `--duration`
+seconds each by `--concurrency` keep-alive clients:
+
+- GET /users/me: token verification plus one indexed lookup, mostly
+  Python work on the event loop;
+- POST /auth/login with a wrong password: one Argon2 verification and no
+  writes, the CPU-bound path that pins a whole worker.
+
+The load generator runs on the same host and competes with the servers for
+CPU, so compare the two rows rather than reading the absolute numbers as
+capacity. With one core the launcher cannot beat the single process.
+"""
+import argparse
+import asyncio
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import httpx
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+from sqlalchemy.ext.asyncio import create_async_engine  # noqa: E402
+
+from app.database.base import Base  # noqa: E402
+import app.models.user  # noqa: E402,F401
+import app.models.service_account  # noqa: E402,F401
+import app.models.user_stat  # noqa: E402,F401
+
+EMAIL = "bench@example.com"
+PASSWORD = "bench-Password-1"
+
+
+async def create_schema(url: str) -> None:
+    engine = create_async_engine(url)
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    await engine.dispose()
+
+
+async def wait_ready(base: str, timeout: float = 30.0) -> None:
+    deadline = time.monotonic() + timeout
+    async with httpx.AsyncClient(base_url=base) as client:
+        while time.monotonic() < deadline:
+            try:
+                if (await client.get("/ready")).status_code == 200:
+                    return
+            except httpx.TransportError:
+                pass
+            await asyncio.sleep(0.2)
+    raise RuntimeError(f"server at {base} did not become ready")
+
+
+async def drive(base: str, request: dict, duration: float, concurrency: int) -> tuple[float, float, float]:
+    """
+    Returns (requests/s, p50 ms, p99 ms) over successful-or-expected responses.
+    """
+    latencies: list[float] = []
+    errors = 0
+    stop_at = time.monotonic() + duration
+
+    async def client_loop(client: httpx.AsyncClient) -> None:
+        nonlocal errors
+        while time.monotonic() < stop_at:
+            start = time.perf_counter()
+            try:
+                response = await client.request(**request)
+            except httpx.TransportError:
+                errors += 1
+                continue
+            if response.status_code >= 500:
+                errors += 1
+                continue
+            latencies.append(time.perf_counter() - start)
+
+    limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+    async with httpx.AsyncClient(base_url=base, limits=limits, timeout=60) as client:
+        started = time.monotonic()
+        await asyncio.gather(*(client_loop(client) for _ in range(concurrency)))
+        elapsed = time.monotonic() - started
+    if errors:
+        print(f"  ({errors} errors)")
+    if not latencies:
+        return 0.0, 0.0, 0.0
+    quantiles = statistics.quantiles(latencies, n=100)
+    return len(latencies) / elapsed, quantiles[49] * 1000, quantiles[98] * 1000
+
+
+async def measure(label: str, command: list[str], port: int, args: argparse.Namespace) -> list[tuple]:
+    workdir = tempfile.mkdtemp(prefix="throughput-")
+    url = f"sqlite+aiosqlite:///{workdir}/bench.db"
+    await create_schema(url)
+    env = {**os.environ, "DATABASE_URL": url, "RATELIMIT_ENABLED": "false", "LOG_LEVEL": "WARNING"}
+    base = f"http://127.0.0.1:{port}"
+    server = subprocess.Popen(command, cwd=ROOT, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    try:
+        await wait_ready(base)
+        async with httpx.AsyncClient(base_url=base) as client:
+            register = await client.post(
+                "/auth/register", json={"email": EMAIL, "password": PASSWORD, "full_name": "Bench"}
+            )
+            register.raise_for_status()
+            login = await client.post("/auth/login", json={"email": EMAIL, "password": PASSWORD})
+            login.raise_for_status()
+            token = login.json()["access_token"]
+        paths = {
+            "GET /users/me": {
+                "method": "GET", "url": "/users/me",
+                "headers": {"Authorization": f"Bearer {token}"},
+            },
+            "POST /auth/login (401)": {
+                "method": "POST", "url": "/auth/login",
+                "json": {"email": EMAIL, "password": "wrong-password"},
+            },
+        }
+        rows = []
+        for name, request in paths.items():
+            rps, p50, p99 = await drive(base, request, args.duration, args.concurrency)
+            rows.append((label, name, rps, p50, p99))
+        return rows
+    finally:
+        server.terminate()
+        server.wait(timeout=60)
+
+
+async def run(args: argparse.Namespace) -> None:
+    python = sys.executable
+    rows = await measure(
+        "uvicorn (1 process)",
+        [python, "-m", "uvicorn", "app.main:app", "--port", str(args.port), "--log-level", "warning"],
+        args.port,
+        args,
+    )
+    launcher = [python, "-m", "app.server", "--host", "127.0.0.1", "--port", str(args.port + 1)]
+    if args.workers:
+        launcher += ["--workers", str(args.workers)]
+    rows += await measure(f"app.server ({args.workers or 'auto'} workers)", launcher, args.port + 1, args)
+
+    print(f"{'server':<26} {'path':<24} {'req/s':>8} {'p50 ms':>8} {'p99 ms':>8}")
+    for label, name, rps, p50, p99 in rows:
+        print(f"{label:<26} {name:<24} {rps:>8.1f} {p50:>8.1f} {p99:>8.1f}")
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--workers", type=int, default=0, help="launcher workers (0: auto)")
+    parser.add_argument("--duration", type=float, default=10.0)
+    parser.add_argument("--concurrency", type=int, default=32)
+    parser.add_argument("--port", type=int, default=8150)
+    args = parser.parse_args()
+    asyncio.run(run(args))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
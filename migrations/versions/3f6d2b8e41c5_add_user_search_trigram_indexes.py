@@ -0,0 +1,41 @@
+"""add user search trigram indexes
+
+Revision ID: 3f6d2b8e41c5
+Revises: 8c1e4f2a9b37
+Create Date: 2026-10-19 14:20:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = '3f6d2b8e41c5'
+down_revision: Union[str, Sequence[str], None] = '8c1e4f2a9b37'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+    # CONCURRENTLY so the users table stays writable while the indexes build
+    with op.get_context().autocommit_block():
+        op.create_index(
+            'ix_users_email_trgm', 'users', ['email'],
+            postgresql_using='gin', postgresql_ops={'email': 'gin_trgm_ops'},
+            postgresql_concurrently=True, if_not_exists=True,
+        )
+        op.create_index(
+            'ix_users_full_name_trgm', 'users', ['full_name'],
+            postgresql_using='gin', postgresql_ops={'full_name': 'gin_trgm_ops'},
+            postgresql_concurrently=True, if_not_exists=True,
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        op.drop_index('ix_users_full_name_trgm', table_name='users', postgresql_concurrently=True, if_exists=True)
+        op.drop_index('ix_users_email_trgm', table_name='users', postgresql_concurrently=True, if_exists=True)
@@ -0,0 +1,50 @@
+"""add user stats
+
+Revision ID: b52e7c1d9a04
+Revises: 3f6d2b8e41c5
+Create Date: 2026-10-19 16:40:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b52e7c1d9a04'
+down_revision: Union[str, Sequence[str], None] = '3f6d2b8e41c5'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        'user_stats',
+        sa.Column('metric', sa.String(), nullable=False),
+        sa.Column('key', sa.String(), nullable=False),
+        sa.Column('value', sa.BigInteger(), nullable=False),
+        sa.PrimaryKeyConstraint('metric', 'key'),
+    )
+    # Backfill from the existing users; the reconciler keeps it honest after
+    op.execute("""
+        INSERT INTO user_stats (metric, key, value)
+        SELECT 'users', '', count(*) FROM users
+        UNION ALL
+        SELECT CASE WHEN is_active THEN 'active' ELSE 'inactive' END, '', count(*)
+        FROM users GROUP BY 1
+        UNION ALL
+        SELECT CASE WHEN email_verified THEN 'verified' ELSE 'unverified' END, '', count(*)
+        FROM users GROUP BY 1
+        UNION ALL
+        SELECT 'tier', tier, count(*) FROM users GROUP BY tier
+        UNION ALL
+        SELECT 'signups', to_char(created_at AT TIME ZONE 'UTC', 'YYYY-MM-DD'), count(*)
+        FROM users WHERE created_at IS NOT NULL GROUP BY 2
+    """)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table('user_stats')
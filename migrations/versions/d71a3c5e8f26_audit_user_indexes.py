@@ -0,0 +1,61 @@
+"""audit user indexes
+
+Revision ID: d71a3c5e8f26
+Revises: b52e7c1d9a04
+Create Date: 2026-10-19 18:10:00.000000
+
+Replaces the exact-case unique index on users.email with a unique index on
+lower(email), adds a partial covering index over active users, and drops
+indexes nothing uses: ix_users_id duplicates the primary key and
+ix_users_email_verified indexes a boolean no query filters on.
+
+The upgrade fails if two emails differ only in case; merge or rename those
+accounts first:
+
+    SELECT lower(email) FROM users GROUP BY 1 HAVING count(*) > 1;
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd71a3c5e8f26'
+down_revision: Union[str, Sequence[str], None] = 'b52e7c1d9a04'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # New indexes first, so email lookups never run without one
+    with op.get_context().autocommit_block():
+        op.create_index(
+            'ix_users_email_lower', 'users', [sa.text('lower(email)')],
+            unique=True, postgresql_concurrently=True, if_not_exists=True,
+        )
+        op.create_index(
+            'ix_users_active_id', 'users', ['id'],
+            postgresql_include=['email'], postgresql_where=sa.text('is_active'),
+            postgresql_concurrently=True, if_not_exists=True,
+        )
+        op.drop_index('ix_users_email', table_name='users', postgresql_concurrently=True, if_exists=True)
+        op.drop_index('ix_users_id', table_name='users', postgresql_concurrently=True, if_exists=True)
+        op.drop_index('ix_users_email_verified', table_name='users', postgresql_concurrently=True, if_exists=True)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        op.create_index(
+            'ix_users_email_verified', 'users', ['email_verified'],
+            postgresql_concurrently=True, if_not_exists=True,
+        )
+        op.create_index('ix_users_id', 'users', ['id'], postgresql_concurrently=True, if_not_exists=True)
+        op.create_index(
+            'ix_users_email', 'users', ['email'],
+            unique=True, postgresql_concurrently=True, if_not_exists=True,
+        )
+        op.drop_index('ix_users_active_id', table_name='users', postgresql_concurrently=True, if_exists=True)
+        op.drop_index('ix_users_email_lower', table_name='users', postgresql_concurrently=True, if_exists=True)
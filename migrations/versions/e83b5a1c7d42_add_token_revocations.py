@@ -0,0 +1,35 @@
+"""add token revocations
+
+Revision ID: e83b5a1c7d42
+Revises: d71a3c5e8f26
+Create Date: 2026-10-19 20:30:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e83b5a1c7d42'
+down_revision: Union[str, Sequence[str], None] = 'd71a3c5e8f26'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        'token_revocations',
+        sa.Column('sub', sa.String(), nullable=False),
+        sa.Column('issued_before', sa.BigInteger(), nullable=False),
+        sa.PrimaryKeyConstraint('sub'),
+    )
+    op.create_index(op.f('ix_token_revocations_issued_before'), 'token_revocations', ['issued_before'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(op.f('ix_token_revocations_issued_before'), table_name='token_revocations')
+    op.drop_table('token_revocations')
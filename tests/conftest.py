@@ -7,12 +7,16 @@ from sqlalchemy.pool import StaticPool
 
 from app.main import app
 from app.database.base import Base
-from app.api.deps import get_db
+from app.api.deps import get_db, get_read_db
+from app.core.config import settings
 from app.core.limiter import limiter
 
 # Disable rate limiter for tests
 limiter.enabled = False
 
+# Service accounts need a dedicated HMAC key
+settings.CLIENT_SECRET_KEY = "test-client-secret-key"
+
 # Use in-memory SQLite for testing
 # Note: We need to handle the PostgreSQL UUID type if we use SQLite. 
 # For this test setup, we will try to use SQLite. If it fails due to UUID, 
@@ -54,6 +58,7 @@ async def client(db_session: AsyncSession) -> AsyncGenerator[AsyncClient, None]:
         yield db_session
 
     app.dependency_overrides[get_db] = override_get_db
+    app.dependency_overrides[get_read_db] = override_get_db
     
     async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as c:
         yield c
@@ -0,0 +1,247 @@
+import asyncio
+import logging
+import re
+import socketserver
+import threading
+import time
+from email import message_from_bytes
+
+import pytest
+from httpx import AsyncClient
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.mailer import MailQueue, SMTPPool, mail_queue, verification_email
+from app.core.security import create_email_verification_token
+
+
+class _SMTPHandler(socketserver.StreamRequestHandler):
+    """
+    Just enough SMTP for smtplib: EHLO, MAIL, RCPT, DATA, RSET, NOOP, QUIT.
+    """
+
+    def reply(self, line: str) -> None:
+        self.wfile.write(f"{line}\r\n".encode())
+
+    def handle(self) -> None:
+        server = self.server
+        server.connections += 1
+        self.reply("220 stub ESMTP")
+        while True:
+            line = self.rfile.readline()
+            if not line:
+                return
+            command = line.decode().strip().upper()
+            if command.startswith(("EHLO", "HELO")):
+                self.reply("250 stub")
+            elif command == "DATA":
+                self.reply("354 end with .")
+                data = b""
+                while True:
+                    chunk = self.rfile.readline()
+                    if chunk in (b".\r\n", b""):
+                        break
+                    data += chunk
+                server.messages.append(message_from_bytes(data))
+                self.reply("250 queued")
+            elif command == "QUIT":
+                self.reply("221 bye")
+                return
+            else:
+                self.reply("250 OK")
+
+
+class _SMTPServer(socketserver.ThreadingTCPServer):
+    daemon_threads = True
+    allow_reuse_address = True
+
+    def __init__(self) -> None:
+        super().__init__(("127.0.0.1", 0), _SMTPHandler)
+        self.connections = 0
+        self.messages: list = []
+
+
+@pytest.fixture
+def smtp_server():
+    server = _SMTPServer()
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+@pytest.fixture
+async def running_mail_queue(smtp_server):
+    """
+    The app's mail queue, pointed at the local SMTP stand-in.
+    """
+    mail_queue.pool = SMTPPool("127.0.0.1", smtp_server.server_address[1], size=mail_queue.workers)
+    mail_queue.start()
+    yield mail_queue
+    await mail_queue.stop(timeout=5)
+    mail_queue.pool = None
+
+
+async def _wait_for(condition, timeout: float = 5.0) -> None:
+    deadline = time.monotonic() + timeout
+    while not condition():
+        assert time.monotonic() < deadline, "timed out"
+        await asyncio.sleep(0.01)
+
+
+def _token_from(message) -> str:
+    body = message.get_payload(decode=True).decode()
+    return re.search(r"[\w-]+\.[\w-]+\.[\w-]+", body).group()
+
+
+async def _register(client: AsyncClient, email: str) -> None:
+    response = await client.post(
+        "/auth/register",
+        json={
+            "email": email,
+            "password": "password123",
+            "full_name": "Mail User"
+        }
+    )
+    assert response.status_code == 201
+
+
+@pytest.mark.anyio
+async def test_register_sends_verification_mail(client: AsyncClient, smtp_server, running_mail_queue):
+    await _register(client, "verify@example.com")
+    await _wait_for(lambda: smtp_server.messages)
+
+    message = smtp_server.messages[0]
+    assert message["To"] == "verify@example.com"
+
+    response = await client.post("/auth/verify-email", json={"token": _token_from(message)})
+    assert response.status_code == 200
+
+    login_res = await client.post(
+        "/auth/login",
+        json={
+            "email": "verify@example.com",
+            "password": "password123"
+        }
+    )
+    headers = {"Authorization": f"Bearer {login_res.json()['access_token']}"}
+    assert (await client.get("/users/me", headers=headers)).json()["email_verified"] is True
+
+    # Verifying again is harmless; resending is refused
+    response = await client.post("/auth/verify-email", json={"token": _token_from(message)})
+    assert response.status_code == 200
+    response = await client.post("/auth/resend-verification", headers=headers)
+    assert response.status_code == 400
+
+
+@pytest.mark.anyio
+async def test_registration_does_not_wait_for_smtp(client: AsyncClient):
+    # Nothing listens on this port; sends fail in the background only
+    queue = MailQueue(SMTPPool("127.0.0.1", 9, timeout=1), maxsize=10, batch_size=5, batch_wait=0, workers=1)
+    saved = mail_queue.pool
+    mail_queue.pool = queue.pool
+    mail_queue.start()
+    try:
+        start = time.perf_counter()
+        await _register(client, "slowmail@example.com")
+        assert time.perf_counter() - start < 1.0
+    finally:
+        await mail_queue.stop(timeout=0)
+        mail_queue.pool = saved
+
+
+@pytest.mark.anyio
+async def test_disabled_mail_is_reported_once(caplog):
+    queue = MailQueue(None, maxsize=10, batch_size=5, batch_wait=0, workers=1)
+    with caplog.at_level(logging.DEBUG, logger="app.core.mailer"):
+        queue.start()
+        for _ in range(3):
+            assert queue.enqueue(verification_email("private@example.com", "token")) is False
+
+    assert queue.dropped == 3
+    assert len([r for r in caplog.records if r.levelno >= logging.WARNING]) == 1
+    assert "private@example.com" not in caplog.text
+    assert all("private@example.com" not in str(r.__dict__) for r in caplog.records)
+
+
+@pytest.mark.anyio
+async def test_rejects_wrong_or_stale_tokens(client: AsyncClient, db_session: AsyncSession):
+    await _register(client, "stale@example.com")
+    login_res = await client.post(
+        "/auth/login",
+        json={
+            "email": "stale@example.com",
+            "password": "password123"
+        }
+    )
+    access_token = login_res.json()["access_token"]
+    headers = {"Authorization": f"Bearer {access_token}"}
+    user_id = (await client.get("/users/me", headers=headers)).json()["id"]
+
+    # An access token is not a verification token
+    response = await client.post("/auth/verify-email", json={"token": access_token})
+    assert response.status_code == 400
+    response = await client.post("/auth/verify-email", json={"token": "garbage"})
+    assert response.status_code == 400
+
+    # A verification token is not an access token
+    verification = create_email_verification_token(user_id, "stale@example.com")
+    response = await client.get("/users/me", headers={"Authorization": f"Bearer {verification}"})
+    assert response.status_code == 403
+
+    # Changing the email invalidates tokens for the old address
+    response = await client.put("/users/me", json={"email": "fresh@example.com"}, headers=headers)
+    assert response.status_code == 200
+    response = await client.post("/auth/verify-email", json={"token": verification})
+    assert response.status_code == 400
+
+    fresh = create_email_verification_token(user_id, "fresh@example.com")
+    response = await client.post("/auth/verify-email", json={"token": fresh})
+    assert response.status_code == 200
+
+
+@pytest.mark.anyio
+async def test_email_change_resets_verification(client: AsyncClient):
+    await _register(client, "changer@example.com")
+    login_res = await client.post(
+        "/auth/login",
+        json={
+            "email": "changer@example.com",
+            "password": "password123"
+        }
+    )
+    headers = {"Authorization": f"Bearer {login_res.json()['access_token']}"}
+    user_id = (await client.get("/users/me", headers=headers)).json()["id"]
+    token = create_email_verification_token(user_id, "changer@example.com")
+    assert (await client.post("/auth/verify-email", json={"token": token})).status_code == 200
+
+    response = await client.put("/users/me", json={"email": "changed@example.com"}, headers=headers)
+    assert response.json()["email_verified"] is False
+
+
+@pytest.mark.anyio
+async def test_queue_batches_over_pooled_connections(smtp_server):
+    queue = MailQueue(
+        SMTPPool("127.0.0.1", smtp_server.server_address[1], size=1),
+        maxsize=100, batch_size=20, batch_wait=0.05, workers=1,
+    )
+    queue.start()
+    for i in range(30):
+        assert queue.enqueue(verification_email(f"user{i}@example.com", "token"))
+    await queue.stop(timeout=5)
+
+    assert len(smtp_server.messages) == 30
+    assert queue.sent == 30
+    # Two batches, one reused connection
+    assert smtp_server.connections == 1
+
+
+@pytest.mark.anyio
+async def test_full_queue_drops_instead_of_blocking():
+    queue = MailQueue(SMTPPool("127.0.0.1", 9), maxsize=2, batch_size=1, batch_wait=0, workers=0)
+    queue.start()
+    results = [queue.enqueue(verification_email("a@example.com", "t")) for _ in range(3)]
+    assert results == [True, True, False]
+    assert queue.dropped == 1
+    await queue.stop(timeout=0)
+
@@ -0,0 +1,154 @@
+import time
+from types import SimpleNamespace
+
+import pytest
+from httpx import AsyncClient
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.future import select
+
+from app.core.security import create_access_token
+from app.models.user import User
+from app.repositories import token_revocations
+
+
+async def _login(client: AsyncClient, email: str) -> dict:
+    await client.post(
+        "/auth/register",
+        json={
+            "email": email,
+            "password": "password123",
+            "full_name": "Introspected User"
+        }
+    )
+    login_res = await client.post(
+        "/auth/login",
+        json={
+            "email": email,
+            "password": "password123"
+        }
+    )
+    return login_res.json()
+
+
+async def _superuser_headers(client: AsyncClient, db_session: AsyncSession) -> dict:
+    tokens = await _login(client, "introspector@example.com")
+    result = await db_session.execute(select(User).where(User.email == "introspector@example.com"))
+    result.scalars().one().is_superuser = True
+    await db_session.commit()
+    return {"Authorization": f"Bearer {tokens['access_token']}"}
+
+
+@pytest.mark.anyio
+async def test_introspect_batch(client: AsyncClient, db_session: AsyncSession):
+    headers = await _superuser_headers(client, db_session)
+    alice = await _login(client, "alice@example.com")
+    bob = await _login(client, "bob@example.com")
+
+    # Deactivate bob; his token stays cryptographically valid
+    result = await db_session.execute(select(User).where(User.email == "bob@example.com"))
+    result.scalars().one().is_active = False
+    await db_session.commit()
+
+    response = await client.post(
+        "/auth/introspect",
+        json={
+            "tokens": [
+                alice["access_token"],
+                bob["access_token"],
+                alice["refresh_token"],
+                "not-a-jwt",
+                alice["access_token"],
+            ]
+        },
+        headers=headers,
+    )
+    assert response.status_code == 200
+    results = response.json()["results"]
+    assert len(results) == 5
+
+    assert results[0]["active"] is True
+    assert results[0]["username"] == "alice@example.com"
+    assert results[0]["tier"] == "free"
+    assert results[0]["token_type"] == "bearer"
+    assert results[0]["exp"] > results[0]["iat"]
+    assert results[4] == results[0]
+
+    for inactive in results[1:4]:
+        assert inactive == {"active": False}
+
+
+@pytest.mark.anyio
+async def test_introspect_unknown_user(client: AsyncClient, db_session: AsyncSession):
+    headers = await _superuser_headers(client, db_session)
+    token = create_access_token(subject="00000000-0000-0000-0000-000000000000")
+    response = await client.post("/auth/introspect", json={"tokens": [token]}, headers=headers)
+    assert response.status_code == 200
+    assert response.json()["results"] == [{"active": False}]
+
+
+@pytest.mark.anyio
+async def test_introspect_batch_limits(client: AsyncClient, db_session: AsyncSession):
+    headers = await _superuser_headers(client, db_session)
+    response = await client.post("/auth/introspect", json={"tokens": []}, headers=headers)
+    assert response.status_code == 422
+
+    response = await client.post("/auth/introspect", json={"tokens": ["x"] * 101}, headers=headers)
+    assert response.status_code == 422
+
+
+@pytest.mark.anyio
+async def test_introspect_requires_authenticated_caller(client: AsyncClient):
+    alice = await _login(client, "alice@example.com")
+    body = {"tokens": [alice["access_token"]]}
+
+    response = await client.post("/auth/introspect", json=body)
+    assert response.status_code == 401
+
+    response = await client.post("/auth/introspect", json=body, headers={"Authorization": "Bearer not-a-jwt"})
+    assert response.status_code == 401
+
+    # A token holder cannot introspect with their own token
+    response = await client.post(
+        "/auth/introspect", json=body, headers={"Authorization": f"Bearer {alice['access_token']}"}
+    )
+    assert response.status_code == 403
+
+
+@pytest.mark.anyio
+async def test_introspect_as_service_account(client: AsyncClient, db_session: AsyncSession):
+    admin_headers = await _superuser_headers(client, db_session)
+    account = (await client.post("/admin/service-accounts", json={"name": "gateway"}, headers=admin_headers)).json()
+    grant = await client.post(
+        "/auth/token",
+        data={
+            "grant_type": "client_credentials",
+            "client_id": account["client_id"],
+            "client_secret": account["client_secret"],
+        }
+    )
+    headers = {"Authorization": f"Bearer {grant.json()['access_token']}"}
+    alice = await _login(client, "alice@example.com")
+
+    response = await client.post("/auth/introspect", json={"tokens": [alice["access_token"]]}, headers=headers)
+    assert response.status_code == 200
+    assert response.json()["results"][0]["username"] == "alice@example.com"
+
+
+@pytest.mark.anyio
+async def test_introspect_after_password_change(client: AsyncClient, db_session: AsyncSession, monkeypatch):
+    headers = await _superuser_headers(client, db_session)
+    alice = await _login(client, "alice@example.com")
+    old_token = alice["access_token"]
+
+    # Tokens from the same second as the change stay valid; move the revocation past them
+    monkeypatch.setattr(token_revocations, "time", SimpleNamespace(time=lambda: time.time() + 1))
+    response = await client.post(
+        "/users/me/password",
+        json={"current_password": "password123", "new_password": "password456"},
+        headers={"Authorization": f"Bearer {old_token}"},
+    )
+    assert response.status_code == 200
+
+    response = await client.post("/auth/introspect", json={"tokens": [old_token]}, headers=headers)
+    assert response.status_code == 200
+    assert response.json()["results"] == [{"active": False}]
@@ -0,0 +1,171 @@
+import uuid
+
+import pytest
+from httpx import AsyncClient, ASGITransport
+from sqlalchemy import func, insert, literal, select
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+
+from app.api.deps import get_db, get_read_db
+from app.database.base import Base
+from app.database.lazy_session import LazySession
+from app.main import app
+from app.models.user import User
+
+
+@pytest.fixture
+async def file_engine(tmp_path):
+    # File-backed so the engine uses a real connection pool
+    engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'lazy.db'}")
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    yield engine
+    await engine.dispose()
+
+
+@pytest.fixture
+def sessionmaker(file_engine) -> async_sessionmaker[AsyncSession]:
+    return async_sessionmaker(bind=file_engine, expire_on_commit=False)
+
+
+@pytest.mark.anyio
+async def test_no_session_until_first_use(sessionmaker):
+    session = LazySession([sessionmaker])
+    assert session.started is False
+    await session.close()
+    assert session.started is False
+
+
+@pytest.mark.anyio
+async def test_read_releases_connection(file_engine, sessionmaker):
+    session = LazySession([sessionmaker])
+    result = await session.execute(select(literal(1)))
+    assert result.scalar() == 1
+    assert file_engine.pool.checkedout() == 0
+    assert not session.in_transaction()
+    await session.close()
+
+
+@pytest.mark.anyio
+async def test_pending_writes_are_not_committed_by_reads(file_engine, sessionmaker):
+    session = LazySession([sessionmaker])
+    session.add(User(email="pending@example.com", hashed_password="x"))
+    await session.execute(select(literal(1)))
+    # Autoflushed insert is still uncommitted and holds its connection
+    assert session.in_transaction()
+    assert file_engine.pool.checkedout() == 1
+
+    await session.rollback()
+    check = LazySession([sessionmaker])
+    assert (await check.scalar(select(func.count()).select_from(User))) == 0
+    await session.close()
+    await check.close()
+
+
+@pytest.mark.anyio
+async def test_core_writes_are_left_to_the_caller(file_engine, sessionmaker):
+    session = LazySession([sessionmaker])
+    await session.execute(insert(User).values(id=uuid.uuid4(), email="core@example.com", hashed_password="x"))
+    assert session.in_transaction()
+
+    await session.rollback()
+    assert (await session.scalar(select(func.count()).select_from(User))) == 0
+    await session.close()
+
+
+@pytest.mark.anyio
+async def test_refresh_after_commit_releases_connection(file_engine, sessionmaker):
+    session = LazySession([sessionmaker])
+    user = User(email="refresh@example.com", hashed_password="x")
+    session.add(user)
+    await session.commit()
+    await session.refresh(user)
+    assert user.tier == "free"
+    assert file_engine.pool.checkedout() == 0
+    await session.close()
+
+
+@pytest.mark.anyio
+async def test_fails_over_to_next_sessionmaker(sessionmaker):
+    broken = async_sessionmaker(bind=create_async_engine("sqlite+aiosqlite:////nonexistent-dir/x.db"))
+    failed = []
+    session = LazySession([broken, sessionmaker], on_connect_error=failed.append)
+
+    assert (await session.scalar(select(literal(1)))) == 1
+    assert failed == [0]
+    assert session.index == 1
+    await session.close()
+
+
+@pytest.mark.anyio
+async def test_endpoints_with_lazy_sessions(sessionmaker):
+    async def lazy_db():
+        session = LazySession([sessionmaker])
+        try:
+            yield session
+        finally:
+            await session.close()
+
+    app.dependency_overrides[get_db] = lazy_db
+    app.dependency_overrides[get_read_db] = lazy_db
+    try:
+        async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as c:
+            response = await c.post(
+                "/auth/register",
+                json={
+                    "email": "lazy@example.com",
+                    "password": "password123",
+                    "full_name": "Lazy User"
+                }
+            )
+            assert response.status_code == 201
+
+            login_res = await c.post(
+                "/auth/login",
+                json={
+                    "email": "lazy@example.com",
+                    "password": "password123"
+                }
+            )
+            headers = {"Authorization": f"Bearer {login_res.json()['access_token']}"}
+
+            response = await c.put("/users/me", json={"full_name": "Renamed"}, headers=headers)
+            assert response.status_code == 200
+
+            response = await c.get("/users/me", headers=headers)
+            assert response.status_code == 200
+            assert response.json()["email"] == "lazy@example.com"
+    finally:
+        app.dependency_overrides.clear()
+    assert sessionmaker.kw["bind"].pool.checkedout() == 0
+
+
+@pytest.mark.anyio
+async def test_writes_fail_over_like_reads(sessionmaker):
+    broken = async_sessionmaker(bind=create_async_engine("sqlite+aiosqlite:////nonexistent-dir/x.db"))
+    failed = []
+    session = LazySession([broken], on_connect_error=failed.append, fallback=lambda: sessionmaker)
+
+    user = await session.merge(User(id=uuid.uuid4(), email="merged@example.com", hashed_password="x"))
+    await session.flush()
+    await session.delete(user)
+    await session.commit()
+    assert failed == [0]
+    assert session.index == 1
+    await session.close()
+
+
+def test_unproxied_session_methods_are_refused(sessionmaker):
+    session = LazySession([sessionmaker])
+    with pytest.raises(AttributeError):
+        session.begin_nested
+    assert session.started is False
+
+
+@pytest.mark.anyio
+async def test_read_after_failover_probe_releases_connection(file_engine, sessionmaker):
+    # With a replica configured the first statement is preceded by a connect probe
+    session = LazySession([sessionmaker], fallback=lambda: sessionmaker)
+    assert (await session.scalar(select(literal(1)))) == 1
+    assert not session.in_transaction()
+    assert file_engine.pool.checkedout() == 0
+    await session.close()
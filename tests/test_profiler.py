@@ -0,0 +1,157 @@
+import asyncio
+import time
+
+import pytest
+from fastapi import FastAPI
+from httpx import AsyncClient, ASGITransport
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.future import select
+
+from app.core.profiler import ProfilerMiddleware, SamplingProfiler, profiler
+from app.models.user import User
+
+
+async def _superuser_token(client: AsyncClient, db_session: AsyncSession) -> str:
+    await client.post(
+        "/auth/register",
+        json={
+            "email": "admin@example.com",
+            "password": "password123",
+            "full_name": "Admin"
+        }
+    )
+    result = await db_session.execute(select(User).where(User.email == "admin@example.com"))
+    user = result.scalars().one()
+    user.is_superuser = True
+    await db_session.commit()
+
+    login_res = await client.post(
+        "/auth/login",
+        json={
+            "email": "admin@example.com",
+            "password": "password123"
+        }
+    )
+    return login_res.json()["access_token"]
+
+
+def _busy(seconds: float) -> None:
+    deadline = time.perf_counter() + seconds
+    while time.perf_counter() < deadline:
+        pass
+
+
+@pytest.mark.anyio
+async def test_profiler_collects_stacks_per_route():
+    test_profiler = SamplingProfiler(interval=0.001, enabled=True)
+    test_app = FastAPI()
+    test_app.add_middleware(ProfilerMiddleware, profiler=test_profiler)
+
+    @test_app.get("/work/{item}")
+    async def work(item: str):
+        _busy(0.05)
+        await asyncio.sleep(0.05)
+        return {"item": item}
+
+    test_profiler.capture(60)
+    async with AsyncClient(transport=ASGITransport(app=test_app), base_url="http://test") as c:
+        response = await c.get("/work/a")
+    assert response.status_code == 200
+
+    assert test_profiler.routes() == ["GET /work/{item}"]
+    collapsed = test_profiler.collapsed("GET /work/{item}")
+    assert "_busy" in collapsed
+    assert "[await]" in collapsed
+    for line in collapsed.splitlines():
+        stack, count = line.rsplit(" ", 1)
+        assert stack.startswith("GET /work/{item};")
+        assert int(count) > 0
+
+
+@pytest.mark.anyio
+async def test_profiler_skips_unsampled_requests():
+    test_profiler = SamplingProfiler(sample_rate=0.0, enabled=True)
+    test_app = FastAPI()
+    test_app.add_middleware(ProfilerMiddleware, profiler=test_profiler)
+
+    @test_app.get("/")
+    async def root():
+        return {}
+
+    async with AsyncClient(transport=ASGITransport(app=test_app), base_url="http://test") as c:
+        await c.get("/")
+    assert test_profiler.routes() == []
+    assert test_profiler.collapsed() == ""
+
+
+@pytest.mark.anyio
+async def test_sampler_sleeps_when_nothing_is_profiled():
+    test_profiler = SamplingProfiler(interval=0.001, enabled=True)
+    task = asyncio.current_task()
+    assert task is not None
+
+    test_profiler.begin(task)
+    assert test_profiler._wakeup.is_set()
+    test_profiler.end(task, "GET /")
+    assert not test_profiler._wakeup.is_set()
+
+    # A wakeup that raced with end() finds nothing to sample and goes back to sleep
+    test_profiler._wakeup.set()
+    assert test_profiler._sample() is False
+    assert not test_profiler._wakeup.is_set()
+
+
+@pytest.mark.anyio
+async def test_profiler_endpoints_require_superuser(client: AsyncClient):
+    await client.post(
+        "/auth/register",
+        json={
+            "email": "plain@example.com",
+            "password": "password123",
+            "full_name": "Plain User"
+        }
+    )
+    login_res = await client.post(
+        "/auth/login",
+        json={
+            "email": "plain@example.com",
+            "password": "password123"
+        }
+    )
+    token = login_res.json()["access_token"]
+
+    response = await client.get(
+        "/admin/profiler/flamegraph",
+        headers={"Authorization": f"Bearer {token}"}
+    )
+    assert response.status_code == 403
+
+
+@pytest.mark.anyio
+async def test_profiler_endpoints_when_disabled(client: AsyncClient, db_session: AsyncSession, monkeypatch):
+    token = await _superuser_token(client, db_session)
+    monkeypatch.setattr(profiler, "enabled", False)
+
+    response = await client.post(
+        "/admin/profiler/capture",
+        headers={"Authorization": f"Bearer {token}"}
+    )
+    assert response.status_code == 404
+
+
+@pytest.mark.anyio
+async def test_profiler_capture_and_flamegraph(client: AsyncClient, db_session: AsyncSession, monkeypatch):
+    token = await _superuser_token(client, db_session)
+    monkeypatch.setattr(profiler, "enabled", True)
+    monkeypatch.setattr(profiler, "capture_until", 0.0)
+    headers = {"Authorization": f"Bearer {token}"}
+
+    response = await client.post("/admin/profiler/capture?seconds=5", headers=headers)
+    assert response.status_code == 200
+
+    response = await client.get("/admin/profiler/flamegraph", headers=headers)
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/plain")
+
+    response = await client.delete("/admin/profiler", headers=headers)
+    assert response.status_code == 200
@@ -0,0 +1,74 @@
+import pytest
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.user import User
+from app.repositories.user import get_active_user_emails, get_user_by_email, get_user_by_id
+
+# The test database is SQLite, whose planner reports "SEARCH ... USING INDEX"
+# for index lookups and "SCAN" for full table scans. The same indexes exist
+# on PostgreSQL (see migration d71a3c5e8f26).
+
+
+async def _plan(db_session: AsyncSession, lookup) -> str:
+    executed = []
+
+    def record(conn, cursor, statement, parameters, context, executemany):
+        executed.append((statement, parameters))
+
+    engine = db_session.bind.sync_engine
+    event.listen(engine, "before_cursor_execute", record)
+    try:
+        await lookup()
+    finally:
+        event.remove(engine, "before_cursor_execute", record)
+
+    statement, parameters = executed[-1]
+    connection = await db_session.connection()
+    result = await connection.exec_driver_sql(f"EXPLAIN QUERY PLAN {statement}", parameters)
+    return "\n".join(row[-1] for row in result.all())
+
+
+@pytest.fixture
+async def users(db_session: AsyncSession) -> list[User]:
+    users = [
+        User(email=f"Plan{i}@Example.com", hashed_password="x", is_active=i % 2 == 0)
+        for i in range(50)
+    ]
+    db_session.add_all(users)
+    await db_session.commit()
+    # Planner statistics, as autovacuum keeps them on PostgreSQL
+    connection = await db_session.connection()
+    await connection.exec_driver_sql("ANALYZE")
+    await db_session.commit()
+    return users
+
+
+@pytest.mark.anyio
+async def test_email_lookup_uses_lower_email_index(db_session: AsyncSession, users: list[User]):
+    plan = await _plan(db_session, lambda: get_user_by_email(db_session, "plan7@example.com"))
+    assert "USING INDEX ix_users_email_lower" in plan
+    assert "SCAN" not in plan
+
+
+@pytest.mark.anyio
+async def test_id_lookup_uses_primary_key(db_session: AsyncSession, users: list[User]):
+    plan = await _plan(db_session, lambda: get_user_by_id(db_session, users[3].id))
+    assert plan.startswith("SEARCH users USING")
+    assert "SCAN" not in plan
+
+
+@pytest.mark.anyio
+async def test_active_lookup_uses_partial_index(db_session: AsyncSession, users: list[User]):
+    ids = [user.id for user in users[:10]]
+    plan = await _plan(db_session, lambda: get_active_user_emails(db_session, ids))
+    assert "USING INDEX ix_users_active_id" in plan
+    assert "SCAN" not in plan
+
+
+@pytest.mark.anyio
+async def test_email_uniqueness_ignores_case(db_session: AsyncSession, users: list[User]):
+    db_session.add(User(email="PLAN1@example.COM", hashed_password="x"))
+    with pytest.raises(Exception, match="UNIQUE"):
+        await db_session.commit()
+    await db_session.rollback()
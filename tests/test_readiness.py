@@ -0,0 +1,88 @@
+import logging
+
+import pytest
+from httpx import AsyncClient
+from sqlalchemy.ext.asyncio import create_async_engine
+
+from app.core import readiness as readiness_module
+from app.core.readiness import ReadinessChecker, readiness
+
+
+@pytest.fixture
+async def sqlite_engine(monkeypatch):
+    test_engine = create_async_engine("sqlite+aiosqlite:///:memory:")
+    monkeypatch.setattr(readiness_module, "get_engine", lambda: test_engine)
+    yield test_engine
+    await test_engine.dispose()
+
+
+@pytest.mark.anyio
+async def test_ready_before_warm_up(client: AsyncClient, monkeypatch):
+    monkeypatch.setattr(readiness, "warmed_up", False)
+    response = await client.get("/ready")
+    assert response.status_code == 503
+    assert response.json()["status"] == "starting"
+
+    # Liveness is independent of readiness
+    response = await client.get("/health")
+    assert response.status_code == 200
+
+
+@pytest.mark.anyio
+async def test_all_checks_pass(sqlite_engine):
+    checker = ReadinessChecker(interval=10, timeout=5)
+    checker.warmed_up = True
+    await checker.check_once()
+
+    assert checker.checks == {"database": "ok", "keys": "ok", "hash_pool": "ok"}
+    assert checker.ready is True
+    assert checker.report()["status"] == "ready"
+
+
+@pytest.mark.anyio
+async def test_failing_database_check(monkeypatch, caplog):
+    async def broken_database():
+        raise ConnectionError("connection refused")
+
+    monkeypatch.setattr(readiness_module, "check_database", broken_database)
+    checker = ReadinessChecker(interval=10, timeout=5)
+    checker.warmed_up = True
+    with caplog.at_level(logging.WARNING, logger="app.core.readiness"):
+        await checker.check_once()
+
+    # The reason is logged, never served on the unauthenticated /ready
+    assert checker.checks["database"] == "error"
+    assert "connection refused" in caplog.text
+    assert checker.checks["keys"] == "ok"
+    assert checker.ready is False
+    assert checker.report()["status"] == "unavailable"
+
+
+@pytest.mark.anyio
+async def test_stale_result_is_not_ready(sqlite_engine):
+    checker = ReadinessChecker(interval=10, timeout=5)
+    checker.warmed_up = True
+    await checker.check_once()
+    checker.checked_at -= 31
+    assert checker.ready is False
+
+
+@pytest.mark.anyio
+async def test_ready_endpoint_serves_cached_result(client: AsyncClient, sqlite_engine, monkeypatch):
+    monkeypatch.setattr(readiness, "warmed_up", True)
+    monkeypatch.setattr(readiness, "checks", {})
+    monkeypatch.setattr(readiness, "checked_at", None)
+    await readiness.check_once()
+
+    calls = 0
+
+    async def counting_database():
+        nonlocal calls
+        calls += 1
+
+    monkeypatch.setattr(readiness_module, "check_database", counting_database)
+    for _ in range(5):
+        response = await client.get("/ready")
+        assert response.status_code == 200
+        assert response.json()["checks"]["database"] == "ok"
+    assert calls == 0
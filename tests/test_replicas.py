@@ -0,0 +1,106 @@
+import pytest
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+from sqlalchemy.pool import StaticPool
+
+from app.api import deps
+from app.api.deps import get_read_db
+from app.core.config import settings
+from app.database import session as session_module
+from app.database.session import ReplicaRouter, _create_engine
+
+
+def _sessionmaker(url: str) -> async_sessionmaker[AsyncSession]:
+    return async_sessionmaker(bind=create_async_engine(url), expire_on_commit=False)
+
+
+def _healthy() -> async_sessionmaker[AsyncSession]:
+    return _sessionmaker("sqlite+aiosqlite:///:memory:")
+
+
+def _unreachable() -> async_sessionmaker[AsyncSession]:
+    return _sessionmaker("sqlite+aiosqlite:////nonexistent-dir/replica.db")
+
+
+def test_round_robin():
+    router = ReplicaRouter([_healthy(), _healthy(), _healthy()], eject_seconds=30)
+    assert [router.candidates()[0] for _ in range(6)] == [0, 1, 2, 0, 1, 2]
+    assert router.candidates() == [0, 1, 2]
+
+
+def test_ejected_replica_is_skipped_until_cooldown():
+    router = ReplicaRouter([_healthy(), _healthy()], eject_seconds=30)
+    router.eject(0)
+    assert [router.candidates() for _ in range(2)] == [[1], [1]]
+
+    router._ejected_until[0] = 0.0
+    assert sorted(router.candidates()) == [0, 1]
+
+
+def test_no_replicas_configured():
+    assert ReplicaRouter([], eject_seconds=30).candidates() == []
+
+
+async def _bound_engine_url() -> str:
+    gen = get_read_db()
+    session = await anext(gen)
+    assert (await session.execute(text("SELECT 1"))).scalar() == 1
+    url = str(session.bind.url)
+    await gen.aclose()
+    return url
+
+
+@pytest.mark.anyio
+async def test_read_db_ejects_unreachable_replica(monkeypatch):
+    router = ReplicaRouter([_unreachable(), _healthy()], eject_seconds=30)
+    monkeypatch.setattr(deps, "get_replica_router", lambda: router)
+
+    assert await _bound_engine_url() == "sqlite+aiosqlite:///:memory:"
+    assert router.candidates() == [1]
+
+
+@pytest.mark.anyio
+async def test_read_db_falls_back_to_primary(monkeypatch):
+    primary = _healthy()
+    router = ReplicaRouter([_unreachable()], eject_seconds=30)
+    monkeypatch.setattr(deps, "get_replica_router", lambda: router)
+    monkeypatch.setattr(deps, "get_sessionmaker", lambda: primary)
+
+    gen = get_read_db()
+    session = await anext(gen)
+    assert (await session.execute(text("SELECT 1"))).scalar() == 1
+    assert session.bind is primary.kw["bind"]
+    await gen.aclose()
+    assert router.candidates() == []
+
+
+@pytest.mark.anyio
+async def test_read_db_leaves_primary_alone_when_replica_serves(monkeypatch):
+    router = ReplicaRouter([_unreachable(), _healthy()], eject_seconds=30)
+    monkeypatch.setattr(deps, "get_replica_router", lambda: router)
+    primary_calls = []
+    monkeypatch.setattr(deps, "get_sessionmaker", lambda: primary_calls.append(1) or _healthy())
+
+    await _bound_engine_url()
+    assert primary_calls == []
+
+
+def test_engine_pool_options_follow_the_pool_class():
+    # StaticPool (in-memory SQLite) takes no sizing; queue pools do
+    assert isinstance(_create_engine("sqlite+aiosqlite:///:memory:").pool, StaticPool)
+    engine = _create_engine("sqlite+aiosqlite:////tmp/pool-options.db")
+    assert engine.pool.size() == settings.DATABASE_POOL_SIZE
+
+
+
+def test_pgbouncer_mode_avoids_prepared_statement_collisions(monkeypatch):
+    captured = {}
+    monkeypatch.setattr(session_module, "create_async_engine", lambda url, **kwargs: captured.update(kwargs))
+    monkeypatch.setattr(settings, "DATABASE_PGBOUNCER", True)
+
+    _create_engine("postgresql+asyncpg://u:p@localhost/db")
+    connect_args = captured["connect_args"]
+    assert connect_args["prepared_statement_cache_size"] == 0
+    assert connect_args["statement_cache_size"] == 0
+    name = connect_args["prepared_statement_name_func"]
+    assert name() != name()
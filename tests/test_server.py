@@ -0,0 +1,66 @@
+import logging
+import queue
+import threading
+from logging.handlers import QueueHandler, QueueListener
+
+import pytest
+
+from app import server
+from app.core import logging_config
+from app.database.session import _create_engine, get_engine
+
+
+def test_default_workers_one_per_core():
+    assert server.default_workers(cores=4, argon2_memory_bytes=64 * 2**20, memory_bytes=None) == 4
+
+
+def test_default_workers_capped_by_memory():
+    per_worker = server._WORKER_OVERHEAD_BYTES + 64 * 2**20
+    assert server.default_workers(cores=8, argon2_memory_bytes=64 * 2**20, memory_bytes=3 * per_worker) == 3
+    # Never fewer than one, even under a tiny limit
+    assert server.default_workers(cores=8, argon2_memory_bytes=64 * 2**20, memory_bytes=2**20) == 1
+
+
+def test_preload_leaves_fork_unsafe_state_alone():
+    get_engine.cache_clear()
+    threads = {thread.ident for thread in threading.enumerate()}
+
+    server.preload()
+
+    # Engines, pools and background threads must be created per worker, after the fork
+    assert get_engine.cache_info().currsize == 0
+    assert {thread.ident for thread in threading.enumerate()} == threads
+
+
+@pytest.mark.parametrize("url", [
+    "sqlite+aiosqlite:///:memory:",
+    "sqlite+aiosqlite:////tmp/launcher.db",
+    "postgresql+asyncpg://u:p@localhost/db",
+])
+def test_worker_engines_build_for_every_driver(url):
+    # Each worker creates its engine from DATABASE_URL; none of these may be rejected
+    engine = _create_engine(url)
+    assert engine.url.render_as_string(hide_password=False) == url
+
+
+def test_stop_logging_flushes_queued_records(monkeypatch):
+    # Workers leave through os._exit(), so queued records must be written first
+    records: list[logging.LogRecord] = []
+    capture = logging.Handler()
+    capture.emit = records.append
+    log_queue: queue.SimpleQueue = queue.SimpleQueue()
+    monkeypatch.setattr(logging_config, "_listener", QueueListener(log_queue, capture))
+    logging_config._listener.start()
+
+    worker_logger = logging.getLogger("test.worker")
+    worker_logger.addHandler(QueueHandler(log_queue))
+    worker_logger.propagate = False
+    try:
+        worker_logger.error("Worker crashed")
+        logging_config.stop_logging()
+    finally:
+        worker_logger.handlers.clear()
+        worker_logger.propagate = True
+
+    assert [record.getMessage() for record in records] == ["Worker crashed"]
+    assert logging_config._listener is None
@@ -0,0 +1,180 @@
+import pytest
+from httpx import AsyncClient
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.future import select
+
+from app.api.deps import get_read_db
+from app.core.client_tokens import client_token_cache
+from app.core.config import settings
+from app.main import app
+from app.core.security import decode_token
+from app.models.service_account import ServiceAccount
+from app.models.user import User
+
+
+@pytest.fixture(autouse=True)
+def clear_token_cache():
+    client_token_cache.clear()
+    yield
+    client_token_cache.clear()
+
+
+async def _admin_headers(client: AsyncClient, db_session: AsyncSession) -> dict:
+    await client.post(
+        "/auth/register",
+        json={
+            "email": "svc-admin@example.com",
+            "password": "password123",
+            "full_name": "Admin"
+        }
+    )
+    result = await db_session.execute(select(User).where(User.email == "svc-admin@example.com"))
+    result.scalars().one().is_superuser = True
+    await db_session.commit()
+
+    login_res = await client.post(
+        "/auth/login",
+        json={
+            "email": "svc-admin@example.com",
+            "password": "password123"
+        }
+    )
+    return {"Authorization": f"Bearer {login_res.json()['access_token']}"}
+
+
+async def _create_account(client: AsyncClient, headers: dict) -> dict:
+    response = await client.post("/admin/service-accounts", json={"name": "billing"}, headers=headers)
+    assert response.status_code == 201
+    return response.json()
+
+
+@pytest.mark.anyio
+async def test_client_credentials_grant(client: AsyncClient, db_session: AsyncSession):
+    account = await _create_account(client, await _admin_headers(client, db_session))
+
+    response = await client.post(
+        "/auth/token",
+        data={
+            "grant_type": "client_credentials",
+            "client_id": account["client_id"],
+            "client_secret": account["client_secret"],
+        }
+    )
+    assert response.status_code == 200
+    data = response.json()
+    assert data["token_type"] == "bearer"
+    assert data["expires_in"] > 0
+    assert "refresh_token" not in data
+
+    claims = decode_token(data["access_token"])
+    assert claims["client_id"] == account["client_id"]
+
+    # Service tokens are not user tokens
+    response = await client.get(
+        "/users/me",
+        headers={"Authorization": f"Bearer {data['access_token']}"}
+    )
+    assert response.status_code == 403
+
+
+@pytest.mark.anyio
+async def test_token_reused_within_lifetime(client: AsyncClient, db_session: AsyncSession):
+    account = await _create_account(client, await _admin_headers(client, db_session))
+    auth = (account["client_id"], account["client_secret"])
+
+    first = await client.post("/auth/token", data={"grant_type": "client_credentials"}, auth=auth)
+    second = await client.post("/auth/token", data={"grant_type": "client_credentials"}, auth=auth)
+    assert first.status_code == second.status_code == 200
+    assert first.json()["access_token"] == second.json()["access_token"]
+
+    # The cache never short-circuits a wrong secret
+    response = await client.post(
+        "/auth/token",
+        data={"grant_type": "client_credentials"},
+        auth=(account["client_id"], "wrong-secret"),
+    )
+    assert response.status_code == 401
+
+
+@pytest.mark.anyio
+async def test_invalid_client_and_grant(client: AsyncClient):
+    response = await client.post(
+        "/auth/token",
+        data={"grant_type": "client_credentials", "client_id": "svc_missing", "client_secret": "x"},
+    )
+    assert response.status_code == 401
+
+    response = await client.post("/auth/token", data={"grant_type": "password"})
+    assert response.status_code == 400
+
+
+@pytest.mark.anyio
+async def test_deactivated_account(client: AsyncClient, db_session: AsyncSession):
+    headers = await _admin_headers(client, db_session)
+    account = await _create_account(client, headers)
+    auth = (account["client_id"], account["client_secret"])
+
+    response = await client.post("/auth/token", data={"grant_type": "client_credentials"}, auth=auth)
+    assert response.status_code == 200
+
+    response = await client.delete(f"/admin/service-accounts/{account['id']}", headers=headers)
+    assert response.status_code == 200
+    assert response.json()["is_active"] is False
+
+    response = await client.post("/auth/token", data={"grant_type": "client_credentials"}, auth=auth)
+    assert response.status_code == 401
+
+    response = await client.get("/admin/service-accounts", headers=headers)
+    assert [a["client_id"] for a in response.json()] == [account["client_id"]]
+    assert "client_secret" not in response.json()[0]
+
+
+@pytest.mark.anyio
+async def test_deactivated_in_another_worker(client: AsyncClient, db_session: AsyncSession):
+    account = await _create_account(client, await _admin_headers(client, db_session))
+    auth = (account["client_id"], account["client_secret"])
+
+    response = await client.post("/auth/token", data={"grant_type": "client_credentials"}, auth=auth)
+    assert response.status_code == 200
+
+    # Another worker deactivates the account; this worker's cache is not evicted
+    result = await db_session.execute(select(ServiceAccount).where(ServiceAccount.client_id == account["client_id"]))
+    result.scalars().one().is_active = False
+    await db_session.commit()
+
+    response = await client.post("/auth/token", data={"grant_type": "client_credentials"}, auth=auth)
+    assert response.status_code == 401
+
+
+@pytest.mark.anyio
+async def test_grant_reads_the_primary(client: AsyncClient, db_session: AsyncSession):
+    account = await _create_account(client, await _admin_headers(client, db_session))
+
+    async def lagging_replica():
+        raise AssertionError("client credentials must not be checked on a replica")
+        yield
+
+    app.dependency_overrides[get_read_db] = lagging_replica
+    response = await client.post(
+        "/auth/token",
+        data={
+            "grant_type": "client_credentials",
+            "client_id": account["client_id"],
+            "client_secret": account["client_secret"],
+        }
+    )
+    assert response.status_code == 200
+
+
+@pytest.mark.anyio
+async def test_service_accounts_need_a_secret_key(client: AsyncClient, db_session: AsyncSession, monkeypatch):
+    headers = await _admin_headers(client, db_session)
+    monkeypatch.setattr(settings, "CLIENT_SECRET_KEY", "")
+
+    response = await client.post("/admin/service-accounts", json={"name": "billing"}, headers=headers)
+    assert response.status_code == 503
+    response = await client.post(
+        "/auth/token",
+        data={"grant_type": "client_credentials", "client_id": "svc_x", "client_secret": "x"}
+    )
+    assert response.status_code == 503
@@ -0,0 +1,145 @@
+import asyncio
+
+import pytest
+from httpx import AsyncClient
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.api.deps import _get_user_from_token
+from app.api.endpoints.auth import refresh_rotations
+from app.core.singleflight import SingleFlight
+
+
+@pytest.mark.anyio
+async def test_concurrent_calls_share_one_computation():
+    flight = SingleFlight()
+    calls = 0
+
+    async def compute():
+        nonlocal calls
+        calls += 1
+        await asyncio.sleep(0.01)
+        return "value"
+
+    results = await asyncio.gather(*(flight.do("key", compute) for _ in range(5)))
+    assert calls == 1
+    assert [value for value, _ in results] == ["value"] * 5
+    assert sorted(shared for _, shared in results) == [False, True, True, True, True]
+
+    # Nothing is kept without a grace window
+    await flight.do("key", compute)
+    assert calls == 2
+
+
+@pytest.mark.anyio
+async def test_exceptions_reach_every_caller():
+    flight = SingleFlight()
+
+    async def fail():
+        await asyncio.sleep(0.01)
+        raise ValueError("boom")
+
+    results = await asyncio.gather(*(flight.do("key", fail) for _ in range(3)), return_exceptions=True)
+    assert all(isinstance(r, ValueError) for r in results)
+
+
+@pytest.mark.anyio
+async def test_follower_takes_over_when_leader_is_cancelled():
+    flight = SingleFlight()
+    started = asyncio.Event()
+
+    async def compute():
+        started.set()
+        await asyncio.sleep(0.01)
+        return "value"
+
+    leader = asyncio.create_task(flight.do("key", compute))
+    await started.wait()
+    follower = asyncio.create_task(flight.do("key", compute))
+    await asyncio.sleep(0)
+    leader.cancel()
+
+    assert await follower == ("value", False)
+
+
+@pytest.mark.anyio
+async def test_grace_window_reuses_result():
+    flight = SingleFlight(grace=60)
+    calls = 0
+
+    async def compute():
+        nonlocal calls
+        calls += 1
+        return calls
+
+    assert await flight.do("key", compute) == (1, False)
+    assert await flight.do("key", compute) == (1, True)
+    assert await flight.do("other", compute) == (2, False)
+
+
+async def _login(client: AsyncClient) -> dict:
+    await client.post(
+        "/auth/register",
+        json={
+            "email": "flight@example.com",
+            "password": "password123",
+            "full_name": "Flight User"
+        }
+    )
+    login_res = await client.post(
+        "/auth/login",
+        json={
+            "email": "flight@example.com",
+            "password": "password123"
+        }
+    )
+    return login_res.json()
+
+
+@pytest.mark.anyio
+async def test_duplicate_refreshes_get_same_tokens(client: AsyncClient, monkeypatch):
+    monkeypatch.setattr(refresh_rotations, "_recent", {})
+    tokens = await _login(client)
+    body = {"refresh_token": tokens["refresh_token"]}
+
+    concurrent = await asyncio.gather(*(client.post("/auth/refresh", json=body) for _ in range(3)))
+    assert [r.status_code for r in concurrent] == [200, 200, 200]
+    assert len({r.json()["refresh_token"] for r in concurrent}) == 1
+
+    # A late retry inside the grace window gets the same pair, not a 401
+    retry = await client.post("/auth/refresh", json=body)
+    assert retry.status_code == 200
+    assert retry.json() == concurrent[0].json()
+
+    # The rotated token works as usual
+    response = await client.post("/auth/refresh", json={"refresh_token": retry.json()["refresh_token"]})
+    assert response.status_code == 200
+
+
+@pytest.mark.anyio
+async def test_concurrent_user_loads_share_one_select(client: AsyncClient, db_session: AsyncSession):
+    token = (await _login(client))["access_token"]
+
+    statements = []
+    sync_engine = db_session.bind.sync_engine
+
+    def count(conn, cursor, statement, *args):
+        if statement.lstrip().upper().startswith("SELECT"):
+            statements.append(statement)
+
+    event.listen(sync_engine, "before_cursor_execute", count)
+    other_session = AsyncSession(bind=db_session.bind, expire_on_commit=False)
+    try:
+        users = await asyncio.gather(
+            _get_user_from_token(token, db_session),
+            _get_user_from_token(token, other_session),
+        )
+    finally:
+        event.remove(sync_engine, "before_cursor_execute", count)
+
+    assert len(statements) == 1
+    assert users[0].email == users[1].email == "flight@example.com"
+    # Each request gets an instance bound to its own session
+    assert users[0] in db_session
+    assert users[1] in other_session
+    await other_session.close()
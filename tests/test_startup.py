@@ -0,0 +1,67 @@
+import asyncio
+import json
+import subprocess
+import sys
+
+import pytest
+from fastapi import FastAPI
+from sqlalchemy.ext.asyncio import create_async_engine
+
+from app.core import lifespan
+from app.core.lifespan import readiness, warm_up
+
+
+def test_import_defers_heavy_modules():
+    probe = (
+        "import json, sys\n"
+        "import app.main\n"
+        "from app.database.session import get_engine\n"
+        "print(json.dumps({\n"
+        "    'modules': [m for m in ('asyncpg', 'passlib.context', 'argon2', 'httpx') if m in sys.modules],\n"
+        "    'engine_created': bool(get_engine.cache_info().currsize),\n"
+        "}))\n"
+    )
+    out = subprocess.run(
+        [sys.executable, "-c", probe], check=True, capture_output=True, text=True
+    ).stdout
+    result = json.loads(out.strip().splitlines()[-1])
+    assert result["modules"] == []
+    assert result["engine_created"] is False
+
+
+@pytest.mark.anyio
+async def test_warm_up_marks_checker(monkeypatch):
+    monkeypatch.setattr(readiness, "warmed_up", False)
+    test_engine = create_async_engine("sqlite+aiosqlite:///:memory:")
+    monkeypatch.setattr(lifespan, "get_engine", lambda: test_engine)
+
+    await warm_up()
+    await test_engine.dispose()
+
+    assert readiness.warmed_up is True
+    assert readiness.warmup_ms > 0
+
+
+@pytest.mark.anyio
+async def test_shutdown_during_warm_up_waits_for_it(monkeypatch):
+    events = []
+
+    async def slow_warm_up():
+        try:
+            await asyncio.sleep(60)
+        except asyncio.CancelledError:
+            # Unwinding takes a moment, e.g. returning a pooled connection
+            await asyncio.sleep(0.01)
+            events.append("warm-up cancelled")
+            raise
+
+    async def dispose():
+        events.append("engines disposed")
+
+    monkeypatch.setattr(lifespan, "_warm_up_then_check", slow_warm_up)
+    monkeypatch.setattr(lifespan, "dispose_engine", dispose)
+
+    async with lifespan.lifespan(FastAPI()):
+        await asyncio.sleep(0)
+
+    assert events == ["warm-up cancelled", "engines disposed"]
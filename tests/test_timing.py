@@ -0,0 +1,83 @@
+import json
+import logging
+
+import pytest
+from httpx import AsyncClient
+
+from app.core.config import settings
+from app.core.logging_config import JsonFormatter
+
+
+def _phases(header: str) -> dict[str, float]:
+    phases = {}
+    for metric in header.split(", "):
+        name, dur = metric.split(";dur=")
+        phases[name] = float(dur)
+    return phases
+
+
+@pytest.fixture
+def server_timing(monkeypatch):
+    monkeypatch.setattr(settings, "SERVER_TIMING_ENABLED", True)
+
+
+@pytest.mark.anyio
+async def test_server_timing_off_by_default(client: AsyncClient):
+    response = await client.get("/health")
+    assert response.status_code == 200
+    assert "server-timing" not in response.headers
+
+
+@pytest.mark.anyio
+async def test_server_timing_header(client: AsyncClient, server_timing):
+    response = await client.get("/health")
+    assert response.status_code == 200
+    assert "total" in _phases(response.headers["server-timing"])
+
+
+@pytest.mark.anyio
+async def test_server_timing_phases(client: AsyncClient, server_timing):
+    await client.post(
+        "/auth/register",
+        json={
+            "email": "timing@example.com",
+            "password": "password123",
+            "full_name": "Timing User"
+        }
+    )
+    login_res = await client.post(
+        "/auth/login",
+        json={
+            "email": "timing@example.com",
+            "password": "password123"
+        }
+    )
+    login_phases = _phases(login_res.headers["server-timing"])
+    for phase in ("user_fetch", "kdf", "db_commit", "serialize", "total"):
+        assert phase in login_phases
+
+    token = login_res.json()["access_token"]
+    response = await client.get(
+        "/users/me",
+        headers={"Authorization": f"Bearer {token}"}
+    )
+    me_phases = _phases(response.headers["server-timing"])
+    assert "auth" in me_phases
+    assert "user_fetch" in me_phases
+    assert "kdf" not in me_phases
+
+
+@pytest.mark.anyio
+async def test_access_log_line(client: AsyncClient, caplog):
+    with caplog.at_level(logging.INFO, logger="app.access"):
+        await client.get("/health")
+
+    records = [r for r in caplog.records if r.name == "app.access"]
+    assert len(records) == 1
+    entry = json.loads(JsonFormatter().format(records[0]))
+    assert entry["message"] == "request"
+    assert entry["method"] == "GET"
+    assert entry["route"] == "/health"
+    assert entry["status"] == 200
+    assert entry["duration_ms"] >= 0
+    assert "serialize" in entry["phases_ms"]
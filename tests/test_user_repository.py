@@ -0,0 +1,60 @@
+import uuid
+
+import pytest
+from sqlalchemy import event
+from sqlalchemy.engine.default import CACHE_HIT
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.user import User
+from app.repositories.user import get_active_user_emails, get_user_by_email, get_user_by_id, list_users
+
+
+async def _add_users(db: AsyncSession, count: int) -> list[User]:
+    users = [User(email=f"repo{i}@example.com", hashed_password="x") for i in range(count)]
+    db.add_all(users)
+    await db.commit()
+    return users
+
+
+@pytest.mark.anyio
+async def test_lookups_bind_fresh_parameters(db_session: AsyncSession):
+    first, second, third = await _add_users(db_session, 3)
+
+    # Same cached statement, different closure values each call
+    assert (await get_user_by_id(db_session, first.id)) is first
+    assert (await get_user_by_id(db_session, second.id)) is second
+    assert (await get_user_by_id(db_session, uuid.uuid4())) is None
+    assert (await get_user_by_email(db_session, "repo2@example.com")) is third
+    assert (await get_user_by_email(db_session, "Repo2@Example.COM")) is third
+    assert (await get_user_by_email(db_session, "missing@example.com")) is None
+
+    second.is_active = False
+    await db_session.commit()
+    found = await get_active_user_emails(db_session, {first.id, second.id, third.id})
+    assert found == {first.id: first.email, third.id: third.email}
+    assert await get_active_user_emails(db_session, [second.id]) == {}
+
+    assert len(await list_users(db_session, skip=0, limit=2)) == 2
+    assert len(await list_users(db_session, skip=2, limit=2)) == 1
+
+
+@pytest.mark.anyio
+async def test_repeated_lookups_hit_the_compiled_cache(db_session: AsyncSession):
+    first, second = await _add_users(db_session, 2)
+    cache_hits = []
+
+    def record(conn, cursor, statement, parameters, context, executemany):
+        cache_hits.append(context.cache_hit == CACHE_HIT)
+
+    engine = db_session.bind.sync_engine
+    event.listen(engine, "before_cursor_execute", record)
+    try:
+        await get_user_by_email(db_session, first.email)
+        await get_user_by_email(db_session, second.email)
+        await get_user_by_id(db_session, first.id)
+        await get_user_by_id(db_session, second.id)
+    finally:
+        event.remove(engine, "before_cursor_execute", record)
+
+    # Only the very first run of each statement in the process may compile
+    assert cache_hits[1] and cache_hits[3]
@@ -0,0 +1,132 @@
+import pytest
+from httpx import AsyncClient
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.future import select
+
+from app.models.user import User
+
+
+async def _admin_headers(client: AsyncClient, db_session: AsyncSession) -> dict:
+    await client.post(
+        "/auth/register",
+        json={
+            "email": "search-admin@example.com",
+            "password": "password123",
+            "full_name": "Admin"
+        }
+    )
+    result = await db_session.execute(select(User).where(User.email == "search-admin@example.com"))
+    result.scalars().one().is_superuser = True
+    await db_session.commit()
+
+    login_res = await client.post(
+        "/auth/login",
+        json={
+            "email": "search-admin@example.com",
+            "password": "password123"
+        }
+    )
+    return {"Authorization": f"Bearer {login_res.json()['access_token']}"}
+
+
+async def _add_users(db_session: AsyncSession, users: list[tuple[str, str | None]]) -> None:
+    db_session.add_all(
+        User(email=email, full_name=full_name, hashed_password="x") for email, full_name in users
+    )
+    await db_session.commit()
+
+
+@pytest.mark.anyio
+async def test_search_ranks_matches(client: AsyncClient, db_session: AsyncSession):
+    headers = await _admin_headers(client, db_session)
+    await _add_users(db_session, [
+        ("mary.jones@example.com", "Mary Jones"),
+        ("jones@example.com", None),
+        ("bob@jones.org", "Bob"),
+        ("carol@example.com", "Carol Jonesworth"),
+        ("dave@example.com", "Dave"),
+    ])
+
+    response = await client.get("/admin/users/search", params={"q": "JONES"}, headers=headers)
+    assert response.status_code == 200
+    emails = [user["email"] for user in response.json()["items"]]
+    # Email prefix first, then the rest; no non-matching users
+    assert emails[0] == "jones@example.com"
+    assert set(emails) == {
+        "mary.jones@example.com", "jones@example.com", "bob@jones.org", "carol@example.com"
+    }
+    assert response.json()["next_cursor"] is None
+
+    response = await client.get("/admin/users/search", params={"q": "jones@example.com"}, headers=headers)
+    emails = [user["email"] for user in response.json()["items"]]
+    assert emails == ["jones@example.com", "mary.jones@example.com"]
+
+
+@pytest.mark.anyio
+async def test_search_keyset_pagination(client: AsyncClient, db_session: AsyncSession):
+    headers = await _admin_headers(client, db_session)
+    await _add_users(db_session, [(f"page{i:02d}@example.com", f"Paged User {i}") for i in range(25)])
+
+    seen = []
+    cursor = None
+    pages = 0
+    while True:
+        params = {"q": "paged", "limit": 10}
+        if cursor:
+            params["cursor"] = cursor
+        response = await client.get("/admin/users/search", params=params, headers=headers)
+        assert response.status_code == 200
+        body = response.json()
+        seen.extend(user["email"] for user in body["items"])
+        pages += 1
+        cursor = body["next_cursor"]
+        if cursor is None:
+            break
+
+    assert pages == 3
+    assert len(seen) == len(set(seen)) == 25
+
+
+@pytest.mark.anyio
+async def test_search_escapes_wildcards(client: AsyncClient, db_session: AsyncSession):
+    headers = await _admin_headers(client, db_session)
+    await _add_users(db_session, [("percent_100@example.com", None), ("percentx100@example.com", None)])
+
+    response = await client.get("/admin/users/search", params={"q": "t_1"}, headers=headers)
+    assert [user["email"] for user in response.json()["items"]] == ["percent_100@example.com"]
+
+
+@pytest.mark.anyio
+async def test_search_validation(client: AsyncClient, db_session: AsyncSession):
+    headers = await _admin_headers(client, db_session)
+
+    response = await client.get("/admin/users/search", params={"q": "ab"}, headers=headers)
+    assert response.status_code == 422
+
+    response = await client.get(
+        "/admin/users/search", params={"q": "abc", "cursor": "not-a-cursor"}, headers=headers
+    )
+    assert response.status_code == 400
+
+
+@pytest.mark.anyio
+async def test_search_requires_superuser(client: AsyncClient):
+    await client.post(
+        "/auth/register",
+        json={
+            "email": "plain@example.com",
+            "password": "password123",
+            "full_name": "Plain"
+        }
+    )
+    login_res = await client.post(
+        "/auth/login",
+        json={
+            "email": "plain@example.com",
+            "password": "password123"
+        }
+    )
+    headers = {"Authorization": f"Bearer {login_res.json()['access_token']}"}
+
+    response = await client.get("/admin/users/search", params={"q": "plain"}, headers=headers)
+    assert response.status_code == 403
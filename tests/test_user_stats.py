@@ -0,0 +1,140 @@
+from datetime import datetime, timezone
+
+import pytest
+from httpx import AsyncClient
+from sqlalchemy import event, update
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.future import select
+
+from app.core import user_stats
+from app.core.user_stats import StatsReconciler
+from app.models.user import User
+from app.models.user_stat import UserStat
+from app.repositories.user_stats import reconcile_user_stats
+
+
+async def _register(client: AsyncClient, email: str, tier: str = "free") -> dict:
+    await client.post(
+        "/auth/register",
+        json={
+            "email": email,
+            "password": "password123",
+            "full_name": "Stats User",
+            "tier": tier
+        }
+    )
+    login_res = await client.post(
+        "/auth/login",
+        json={
+            "email": email,
+            "password": "password123"
+        }
+    )
+    return {"Authorization": f"Bearer {login_res.json()['access_token']}"}
+
+
+async def _admin_headers(client: AsyncClient, db_session: AsyncSession) -> dict:
+    headers = await _register(client, "stats-admin@example.com")
+    result = await db_session.execute(select(User).where(User.email == "stats-admin@example.com"))
+    result.scalars().one().is_superuser = True
+    await db_session.commit()
+    return headers
+
+
+@pytest.mark.anyio
+async def test_counters_follow_user_changes(client: AsyncClient, db_session: AsyncSession):
+    admin = await _admin_headers(client, db_session)
+    alice = await _register(client, "alice@example.com", tier="pro")
+    await _register(client, "bob@example.com")
+    await _register(client, "carol@example.com")
+    today = datetime.now(timezone.utc).date().isoformat()
+
+    stats = (await client.get("/admin/stats", headers=admin)).json()
+    assert stats["total"] == 4
+    assert stats["active"] == 4 and stats["inactive"] == 0
+    assert stats["unverified"] == 4
+    assert stats["by_tier"] == {"free": 3, "pro": 1}
+    assert stats["signups_per_day"] == {today: 4}
+
+    # Self-deactivation
+    response = await client.delete("/users/me", headers=alice)
+    assert response.status_code == 200
+
+    # Admin tier change and hard delete
+    bob = (await db_session.execute(select(User).where(User.email == "bob@example.com"))).scalars().one()
+    carol = (await db_session.execute(select(User).where(User.email == "carol@example.com"))).scalars().one()
+    response = await client.put(f"/admin/users/{bob.id}", json={"tier": "enterprise"}, headers=admin)
+    assert response.status_code == 200
+    response = await client.delete(f"/admin/users/{carol.id}", headers=admin)
+    assert response.status_code == 200
+
+    stats = (await client.get("/admin/stats", headers=admin)).json()
+    assert stats["total"] == 3
+    assert stats["active"] == 2 and stats["inactive"] == 1
+    assert stats["by_tier"] == {"free": 1, "pro": 1, "enterprise": 1}
+    assert stats["signups_per_day"] == {today: 3}
+
+    # Incremental counters agree with a full recount
+    assert await reconcile_user_stats(db_session) == 0
+
+
+@pytest.mark.anyio
+async def test_stats_do_not_scan_users(client: AsyncClient, db_session: AsyncSession):
+    admin = await _admin_headers(client, db_session)
+    statements = []
+
+    def record(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement.lower())
+
+    engine = db_session.bind.sync_engine
+    event.listen(engine, "before_cursor_execute", record)
+    try:
+        response = await client.get("/admin/stats", headers=admin)
+    finally:
+        event.remove(engine, "before_cursor_execute", record)
+
+    assert response.status_code == 200
+    assert not any("count(" in statement for statement in statements)
+
+
+@pytest.mark.anyio
+async def test_reconcile_repairs_drift(client: AsyncClient, db_session: AsyncSession):
+    admin = await _admin_headers(client, db_session)
+    await _register(client, "drift@example.com")
+
+    # Out-of-band change the counters never saw
+    await db_session.execute(update(User).values(tier="pro"))
+    await db_session.commit()
+
+    response = await client.post("/admin/stats/reconcile", headers=admin)
+    assert response.status_code == 200
+    assert response.json()["drifted"] == 2
+
+    stats = (await client.get("/admin/stats", headers=admin)).json()
+    assert stats["by_tier"] == {"pro": 2}
+    assert stats["total"] == 2
+
+    rows = (await db_session.execute(select(UserStat).where(UserStat.metric == "tier"))).scalars().all()
+    assert {(row.key, row.value) for row in rows} == {("pro", 2)}
+
+
+@pytest.mark.anyio
+async def test_stats_require_superuser(client: AsyncClient):
+    headers = await _register(client, "nosy@example.com")
+    assert (await client.get("/admin/stats", headers=headers)).status_code == 403
+    assert (await client.post("/admin/stats/reconcile", headers=headers)).status_code == 403
+
+
+@pytest.mark.anyio
+async def test_reconciler_skips_when_another_worker_runs(monkeypatch):
+    async def claimed_elsewhere(db):
+        return False
+
+    async def recount(db):
+        raise AssertionError("only the worker holding the lock recounts")
+
+    monkeypatch.setattr(user_stats, "try_claim_reconcile", claimed_elsewhere)
+    monkeypatch.setattr(user_stats, "reconcile_user_stats", recount)
+    reconciler = StatsReconciler(interval=60)
+    assert await reconciler.reconcile_once() is None
+    assert reconciler.reconciled_at is None
@@ -0,0 +1,219 @@
+import time
+
+import jwt
+import pytest
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.future import select
+from fastapi import Depends, FastAPI
+from httpx import AsyncClient, ASGITransport
+
+from app.core.security import create_access_token, create_refresh_token, get_private_key, get_public_jwk
+from app.main import app
+from app.models.user import User
+from app.verifier import (
+    JWKSCache,
+    RevocationFeed,
+    RevocationList,
+    StaticKeys,
+    TokenVerificationError,
+    TokenVerifier,
+    VerifiedToken,
+)
+
+
+@pytest.fixture
+async def jwks_cache():
+    async with AsyncClient(transport=ASGITransport(app=app), base_url="http://auth") as c:
+        cache = JWKSCache("http://auth/.well-known/jwks.json", client=c)
+        await cache.refresh()
+        yield cache
+
+
+def _token_issued(subject: str, seconds_ago: int) -> str:
+    now = int(time.time())
+    return jwt.encode(
+        {"sub": subject, "iat": now - seconds_ago, "exp": now + 600},
+        get_private_key(),
+        algorithm="EdDSA",
+        headers={"kid": get_public_jwk()["kid"]},
+    )
+
+
+def _expired_token(seconds_ago: int) -> str:
+    now = int(time.time())
+    return jwt.encode(
+        {"sub": "user-1", "iat": now - 3600, "exp": now - seconds_ago},
+        get_private_key(),
+        algorithm="EdDSA",
+        headers={"kid": get_public_jwk()["kid"]},
+    )
+
+
+@pytest.mark.anyio
+async def test_jwks_endpoint(client: AsyncClient):
+    response = await client.get("/.well-known/jwks.json")
+    assert response.status_code == 200
+    (key,) = response.json()["keys"]
+    assert key["kty"] == "OKP"
+    assert key["crv"] == "Ed25519"
+    assert key["kid"] == get_public_jwk()["kid"]
+    assert "d" not in key
+
+
+@pytest.mark.anyio
+async def test_verify_with_fetched_jwks(jwks_cache):
+    verifier = TokenVerifier(jwks_cache)
+    token = create_access_token(subject="user-1", claims={"tier": "pro"})
+
+    claims = verifier.verify(token)
+    assert claims["sub"] == "user-1"
+    assert claims["tier"] == "pro"
+
+
+@pytest.mark.anyio
+async def test_unknown_kid_requests_refresh(jwks_cache):
+    verifier = TokenVerifier(jwks_cache)
+    token = jwt.encode(
+        {"sub": "user-1", "exp": int(time.time()) + 60},
+        get_private_key(),
+        algorithm="EdDSA",
+        headers={"kid": "rotated-key"},
+    )
+    with pytest.raises(TokenVerificationError):
+        verifier.verify(token)
+    assert jwks_cache._refresh_requested.is_set()
+
+
+def test_verified_tokens_are_cached(monkeypatch):
+    verifier = TokenVerifier(StaticKeys({get_public_jwk()["kid"]: get_private_key().public_key()}))
+    token = create_access_token(subject="user-1")
+
+    calls = 0
+    real_decode = jwt.decode
+
+    def counting_decode(*args, **kwargs):
+        nonlocal calls
+        calls += 1
+        return real_decode(*args, **kwargs)
+
+    monkeypatch.setattr(jwt, "decode", counting_decode)
+    for _ in range(3):
+        assert verifier.verify(token)["sub"] == "user-1"
+    assert calls == 1
+
+
+def test_cached_claims_are_not_shared():
+    verifier = TokenVerifier(StaticKeys({get_public_jwk()["kid"]: get_private_key().public_key()}))
+    token = create_access_token(subject="user-1", claims={"roles": ["reader"]})
+
+    first = verifier.verify(token)
+    first["sub"] = "someone-else"
+    first["roles"].append("admin")
+
+    again = verifier.verify(token)
+    assert again["sub"] == "user-1"
+    assert again["roles"] == ["reader"]
+
+
+def test_cache_is_bounded():
+    verifier = TokenVerifier(StaticKeys({get_public_jwk()["kid"]: get_private_key().public_key()}), cache_size=2)
+    for subject in ("a", "b", "c"):
+        verifier.verify(create_access_token(subject=subject))
+    assert len(verifier._cache) == 2
+
+
+def test_clock_skew_leeway():
+    keys = StaticKeys({get_public_jwk()["kid"]: get_private_key().public_key()})
+    token = _expired_token(seconds_ago=5)
+
+    with pytest.raises(TokenVerificationError):
+        TokenVerifier(keys, leeway=0).verify(token)
+    assert TokenVerifier(keys, leeway=30).verify(token)["sub"] == "user-1"
+
+
+def test_revocation():
+    revocation = RevocationList()
+    verifier = TokenVerifier(
+        StaticKeys({get_public_jwk()["kid"]: get_private_key().public_key()}),
+        revocation=revocation,
+    )
+    token = create_access_token(subject="user-1")
+    verifier.verify(token)
+
+    # Also applies to tokens already in the LRU
+    revocation.revoke("user-1", issued_before=time.time() + 1)
+    with pytest.raises(TokenVerificationError):
+        verifier.verify(token)
+
+
+@pytest.mark.anyio
+async def test_verified_token_dependency():
+    verifier = TokenVerifier(StaticKeys({get_public_jwk()["kid"]: get_private_key().public_key()}))
+    downstream = FastAPI()
+
+    @downstream.get("/orders")
+    async def orders(claims: dict = Depends(VerifiedToken(verifier))):
+        return {"sub": claims["sub"]}
+
+    async with AsyncClient(transport=ASGITransport(app=downstream), base_url="http://svc") as c:
+        token = create_access_token(subject="user-1")
+        response = await c.get("/orders", headers={"Authorization": f"Bearer {token}"})
+        assert response.json() == {"sub": "user-1"}
+
+        refresh, _ = create_refresh_token(subject="user-1")
+        response = await c.get("/orders", headers={"Authorization": f"Bearer {refresh}"})
+        assert response.status_code == 403
+
+        response = await c.get("/orders", headers={"Authorization": "Bearer garbage"})
+        assert response.status_code == 403
+
+
+async def _register(client: AsyncClient, email: str) -> dict:
+    await client.post(
+        "/auth/register",
+        json={"email": email, "password": "password123", "full_name": "Feed User"}
+    )
+    login_res = await client.post("/auth/login", json={"email": email, "password": "password123"})
+    return {"Authorization": f"Bearer {login_res.json()['access_token']}"}
+
+
+@pytest.mark.anyio
+async def test_revocation_feed_follows_password_changes(client: AsyncClient, db_session: AsyncSession):
+    admin = await _register(client, "feed-admin@example.com")
+    result = await db_session.execute(select(User).where(User.email == "feed-admin@example.com"))
+    result.scalars().one().is_superuser = True
+    await db_session.commit()
+    account = (await client.post("/admin/service-accounts", json={"name": "orders"}, headers=admin)).json()
+
+    headers = await _register(client, "feed-user@example.com")
+    user_id = (await client.get("/users/me", headers=headers)).json()["id"]
+    response = await client.post(
+        "/users/me/password",
+        json={"current_password": "password123", "new_password": "password456"},
+        headers=headers,
+    )
+    assert response.status_code == 200
+
+    feed = RevocationFeed(
+        "http://test/auth/revocations",
+        client=client,
+        client_id=account["client_id"],
+        client_secret=account["client_secret"],
+        token_url="http://test/auth/token",
+    )
+    await feed.refresh()
+    assert user_id in feed.revoked
+
+    verifier = TokenVerifier(
+        StaticKeys({get_public_jwk()["kid"]: get_private_key().public_key()}),
+        revocation=feed,
+    )
+    with pytest.raises(TokenVerificationError):
+        verifier.verify(_token_issued(user_id, seconds_ago=60))
+
+
+@pytest.mark.anyio
+async def test_revocations_require_authenticated_caller(client: AsyncClient):
+    headers = await _register(client, "feed-reader@example.com")
+    assert (await client.get("/auth/revocations")).status_code == 401
+    assert (await client.get("/auth/revocations", headers=headers)).status_code == 403